@@ -6,13 +6,16 @@ from ui_components import DatabaseViewer, ProgressDialog, SearchProfessorDialog,
 from crud_dialogs import open_create_dialog
 from csv_processor import CSVProcessor
 from utils import FileHelpers, UIHelpers, Constants
+from task_runner import get_task_runner
 
 class RECOPSimulator:
     def __init__(self, root):
         self.root = root
         self.csv_file_path = None
-        self.db_manager = DatabaseManager()
+        self.db_manager = DatabaseManager(persist_cache=True)
         self.csv_processor = CSVProcessor(self.db_manager)
+        # Long actions run on a worker thread so the window never freezes
+        self.task_runner = get_task_runner(self.root)
         self.style = setup_ttk_styles(self.root)
         self.setup_ui()
         self.apply_dark_mode_to_widgets()
@@ -50,6 +53,9 @@ class RECOPSimulator:
         menubar.add_cascade(label="Base de Datos", menu=db_menu)
         db_menu.add_command(label="Ver Tablas", command=self.view_database_tables)
         db_menu.add_command(label="Estadísticas", command=self.show_database_stats)
+        db_menu.add_command(label="Revisar Nombres Ambiguos", command=self.review_ambiguous_names)
+        db_menu.add_command(label="Exportar Conocimiento de Nombres...", command=self.export_name_knowledge)
+        db_menu.add_command(label="Importar Conocimiento de Nombres...", command=self.import_name_knowledge)
         db_menu.add_separator()
         db_menu.add_command(label="Respaldar BD", command=self.backup_database)
         db_menu.add_command(label="Recrear BD", command=self.reset_database)
@@ -584,7 +590,9 @@ class RECOPSimulator:
         file_path = filedialog.askopenfilename(
             title="Seleccionar archivo de cartelera",
             filetypes=[
+                ("CSV / Excel files", "*.csv *.xlsx"),
                 ("CSV files", "*.csv"),
+                ("Excel files", "*.xlsx"),
                 ("All files", "*.*")
             ],
             initialdir=os.path.expanduser("~")
@@ -596,7 +604,7 @@ class RECOPSimulator:
                 UIHelpers.show_error(
                     self.root,
                     "Archivo inválido",
-                    "El archivo seleccionado no es un CSV válido."
+                    "El archivo seleccionado no es un CSV o XLSX válido."
                 )
                 return
             
@@ -622,38 +630,21 @@ class RECOPSimulator:
             UIHelpers.show_error(self.root, "Error", "Por favor seleccione un archivo CSV primero")
             return
         
-        # Validate file first
-        validation_result = self.csv_processor.validate_csv_file(self.csv_file_path)
-        
-        if not validation_result['valid']:
-            error_msg = "Errores en el archivo CSV:\n" + "\n".join(validation_result['errors'])
-            UIHelpers.show_error(self.root, "Archivo CSV inválido", error_msg)
-            return
-        
-        if validation_result['warnings']:
-            warning_msg = "Advertencias:\n" + "\n".join(validation_result['warnings'])
-            if not UIHelpers.confirm_action(
-                self.root, 
-                "Advertencias encontradas", 
-                f"{warning_msg}\n\n¿Desea continuar con el procesamiento?"
-            ):
+        # A database that already holds a cartelera can take only the changes
+        delta = False
+        if self.db_manager.get_database_stats().get('seccion', 0) > 0:
+            answer = messagebox.askyesnocancel(
+                "Importación incremental",
+                "La base de datos ya contiene secciones.\n\n"
+                "¿Desea aplicar solo los cambios respecto a la cartelera anterior?\n\n"
+                "• Sí: se insertan, actualizan y eliminan solo las secciones y sesiones "
+                "modificadas, conservando dedicaciones y PER. Las secciones que ya no "
+                "aparecen en el archivo se eliminan.\n"
+                "• No: se cargan de nuevo todas las filas del archivo."
+            )
+            if answer is None:
                 return
-        
-        # Show information about interactive disambiguation
-        info_msg = (
-            "Durante el procesamiento, es posible que aparezcan diálogos para "
-            "disambiguar nombres de profesores con tres partes.\n\n"
-            "Estos diálogos le permitirán decidir cómo dividir nombres como:\n"
-            "• 'Ana María González' (¿nombres compuestos o apellidos compuestos?)\n\n"
-            "El procesamiento puede tomar más tiempo debido a esta interacción."
-        )
-        
-        if not UIHelpers.confirm_action(
-            self.root,
-            "Procesamiento Interactivo",
-            f"{info_msg}\n\n¿Desea continuar?"
-        ):
-            return
+            delta = answer
         
         # Show progress bar
         self.progress_bar.pack(fill=tk.X, pady=(10, 0))
@@ -663,22 +654,66 @@ class RECOPSimulator:
         self.select_csv_btn.config(state="disabled")
         self.process_csv_btn.config(state="disabled")
         
-        # Create progress dialog - Modified to allow user interaction
-        progress = ProgressDialog(self.root, "Procesando archivo CSV", 
-                                 "Iniciando procesamiento...\n(Pueden aparecer diálogos de confirmación)")
+        # Create progress dialog
+        progress = ProgressDialog(self.root, "Procesando archivo CSV", "Iniciando procesamiento...")
+        
+        def confirm_validation(validation_result):
+            # The file is validated while it is read, before anything is written
+            if validation_result['warnings']:
+                warning_msg = "Advertencias:\n" + "\n".join(validation_result['warnings'])
+                return UIHelpers.confirm_action(
+                    self.root, 
+                    "Advertencias encontradas", 
+                    f"{warning_msg}\n\n¿Desea continuar con el procesamiento?"
+                )
+            return True
+        
+        csv_file_path = self.csv_file_path
         
+        def import_file(task):
+            # Runs on the worker thread; the confirmation is asked on the Tk thread
+            # (ambiguous names are queued for review, not asked)
+            return self.csv_processor.process_csv_file(
+                csv_file_path, task.message, delta=delta,
+                validation_callback=lambda validation: task.call_in_ui(confirm_validation, validation),
+                count_callback=task.progress
+            )
+        
+        def show_progress(done, total, message):
+            if total:
+                self.progress_var.set(100 * done / total)
+        
+        def on_error(error):
+            self.finish_csv_processing()
+            UIHelpers.show_error(self.root, "Error", f"Error inesperado: {str(error)}")
+        
+        def on_cancel():
+            self.finish_csv_processing()
+            self.status_var.set("Procesamiento cancelado")
+        
+        self.status_var.set("Procesando archivo CSV...")
+        self.task_runner.run(
+            import_file, on_done=self.show_csv_result, on_error=on_error, on_cancel=on_cancel,
+            on_progress=show_progress, progress_dialog=progress
+        )
+    
+    def finish_csv_processing(self):
+        """Re-enable the upload buttons and hide the progress bar after an import"""
+        self.select_csv_btn.config(state="normal")
+        if hasattr(self, 'csv_file_path') and self.csv_file_path:
+            self.process_csv_btn.config(state="normal")
+        self.progress_bar.pack_forget()
+    
+    def show_csv_result(self, result):
+        """Report the result of process_csv_file (on the Tk thread)"""
         try:
-            def update_progress(message):
-                if not progress.is_cancelled():
-                    progress.update_message(message)
-                    self.root.update()
-            
-            # Process file - This may now include user interaction
-            result = self.csv_processor.process_csv_file(self.csv_file_path, update_progress)
-            
-            progress.close()
-            
-            if result['success']:
+            validation_result = result.get('validation')
+            if result.get('cancelled'):
+                self.status_var.set("Procesamiento cancelado")
+            elif validation_result and not validation_result['valid']:
+                error_msg = "Errores en el archivo CSV:\n" + "\n".join(validation_result['errors'])
+                UIHelpers.show_error(self.root, "Archivo CSV inválido", error_msg)
+            elif result['success']:
                 stats = result['statistics']
                 
                 # Show disambiguation summary if any occurred
@@ -693,6 +728,24 @@ class RECOPSimulator:
                 if disambiguation_count > 0:
                     success_msg += f"Nombres disambiguados: {disambiguation_count}\n"
                 
+                pending_reviews = result.get('pending_name_reviews', 0)
+                if pending_reviews > 0:
+                    success_msg += f"Nombres pendientes de revisión: {pending_reviews}\n"
+                
+                changes = result.get('changes')
+                if changes:
+                    success_msg += (
+                        f"\nCambios aplicados:\n"
+                        f"• Secciones: {changes['sections_inserted']} nuevas, "
+                        f"{changes['sections_updated']} actualizadas, {changes['sections_deleted']} eliminadas\n"
+                        f"• Sesiones: {changes['sessions_inserted']} nuevas, "
+                        f"{changes['sessions_updated']} actualizadas, {changes['sessions_deleted']} eliminadas, "
+                        f"{changes['sessions_unchanged']} sin cambios\n"
+                        f"• Profesores nuevos: {changes['professors_inserted']}\n"
+                        f"• Asignaciones: {changes['assignments_added']} agregadas, "
+                        f"{changes['assignments_removed']} retiradas\n"
+                    )
+                
                 success_msg += (
                     f"\nEstadísticas de la base de datos:\n"
                     f"• Departamentos: {stats.get('departamento', 0)}\n"
@@ -702,7 +755,15 @@ class RECOPSimulator:
                     f"• Sesiones: {stats.get('sesion', 0)}"
                 )
                 
-                UIHelpers.show_info(self.root, "Procesamiento completado", success_msg)
+                if pending_reviews > 0:
+                    if UIHelpers.confirm_action(
+                        self.root,
+                        "Procesamiento completado",
+                        f"{success_msg}\n\n¿Desea revisar ahora los nombres ambiguos?"
+                    ):
+                        self.review_ambiguous_names()
+                else:
+                    UIHelpers.show_info(self.root, "Procesamiento completado", success_msg)
                 
                 self.enable_database_buttons()
                 self.status_var.set("Archivo procesado exitosamente")
@@ -722,16 +783,8 @@ class RECOPSimulator:
                     f"Error al procesar el archivo:\n{result['error_message']}"
                 )
                 
-        except Exception as e:
-            progress.close()
-            UIHelpers.show_error(self.root, "Error", f"Error inesperado: {str(e)}")
-        
         finally:
-            # Re-enable buttons and hide progress bar
-            self.select_csv_btn.config(state="normal")
-            if hasattr(self, 'csv_file_path') and self.csv_file_path:
-                self.process_csv_btn.config(state="normal")
-            self.progress_bar.pack_forget()
+            self.finish_csv_processing()
     
     def view_database_tables(self):
         """Open database viewer window"""
@@ -740,6 +793,60 @@ class RECOPSimulator:
         except Exception as e:
             UIHelpers.show_error(self.root, "Error", f"Error al abrir el visor: {str(e)}")
     
+    def review_ambiguous_names(self):
+        """Open the batch review of three-part names split by default during imports"""
+        try:
+            from ui_components import NameReviewDialog
+            NameReviewDialog(self.root, self.db_manager)
+        except Exception as e:
+            messagebox.showerror("Error", f"Error al abrir la revisión de nombres: {str(e)}")
+    
+    def export_name_knowledge(self):
+        """Save the name-split knowledge base to a JSON file to share with other databases"""
+        file_path = filedialog.asksaveasfilename(
+            title="Exportar conocimiento de nombres",
+            defaultextension=".json",
+            initialfile="conocimiento_nombres.json",
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("All files", "*.*")
+            ]
+        )
+        if not file_path:
+            return
+        
+        if self.db_manager.export_name_split_knowledge(file_path):
+            knowledge = self.db_manager.name_split_knowledge
+            UIHelpers.show_info(
+                self.root,
+                "Conocimiento exportado",
+                f"Archivo creado:\n{file_path}\n\n"
+                f"• Nombres resueltos: {len(knowledge.full_names)}\n"
+                f"• Nombres compuestos: {len(knowledge.compound_first_names)}\n"
+                f"• Partículas de apellido: {len(knowledge.surname_particles)}"
+            )
+        else:
+            UIHelpers.show_error(self.root, "Error", "No se pudo exportar el conocimiento de nombres")
+    
+    def import_name_knowledge(self):
+        """Merge a name-split knowledge base exported from another database"""
+        file_path = filedialog.askopenfilename(
+            title="Importar conocimiento de nombres",
+            filetypes=[
+                ("JSON files", "*.json"),
+                ("All files", "*.*")
+            ]
+        )
+        if not file_path:
+            return
+        
+        added = self.db_manager.import_name_split_knowledge(file_path)
+        UIHelpers.show_info(
+            self.root,
+            "Conocimiento importado",
+            f"Entradas nuevas agregadas: {added}"
+        )
+    
     def show_database_stats(self):
         """Show database statistics"""
         try:
@@ -760,6 +867,7 @@ class RECOPSimulator:
     def backup_database(self):
         """Create database backup"""
         try:
+            self.db_manager.checkpoint()
             backup_path = FileHelpers.backup_database(self.db_manager.db_path)
             UIHelpers.show_info(
                 self.root, 
@@ -782,14 +890,19 @@ class RECOPSimulator:
         
         try:
             # Create backup first
+            self.db_manager.checkpoint()
             backup_path = FileHelpers.backup_database(self.db_manager.db_path)
             
-            # Remove existing database
-            if os.path.exists(self.db_manager.db_path):
-                os.remove(self.db_manager.db_path)
+            # Release pooled connections and remove existing database (and WAL files)
+            self.db_manager.close()
+            for path in (self.db_manager.db_path,
+                         self.db_manager.db_path + '-wal',
+                         self.db_manager.db_path + '-shm'):
+                if os.path.exists(path):
+                    os.remove(path)
             
             # Create new database
-            self.db_manager = DatabaseManager()
+            self.db_manager = DatabaseManager(persist_cache=True)
             self.csv_processor = CSVProcessor(self.db_manager)
             
             # Update UI
@@ -886,21 +999,23 @@ class RECOPSimulator:
         
     def calculate_per_automatic(self):
         """Calculate PER values automatically for nivel 1 and 2 materias"""
-        try:
+        def find_updates(task):
             # Get sessions that need PER calculation
+            task.message("Cargando sesiones de nivel 1 y 2...")
             sessions = self.db_manager.get_sessions_for_per_calculation()
             
-            if not sessions:
-                messagebox.showinfo("Sin datos", "No se encontraron sesiones de nivel 1 o 2 para calcular PER.")
-                return
-            
             # Calculate new PER values
             updates = []
             grouped_count = 0
             individual_count = 0
             
-            for session in sessions:
-                new_per = self.calculate_per_formula(session['tipo_horario'], session['inscritos'])
+            task.message(f"Calculando PER de {len(sessions)} sesiones...")
+            new_pers = self.db_manager.per_engine.per_levels_1_2(
+                [session['tipo_horario'] for session in sessions],
+                [session['inscritos'] for session in sessions]
+            )
+            
+            for session, new_per in zip(sessions, new_pers):
                 
                 # Track grouping statistics
                 if 'grouped_with' in session:
@@ -922,36 +1037,49 @@ class RECOPSimulator:
                         'group_size': session.get('group_size', 1)
                     })
             
-            if not updates:
-                messagebox.showinfo("Sin cambios", "Todos los valores PER ya están actualizados según la fórmula.")
-                return
-            
-            # Show confirmation with summary including grouping info
-            confirm_msg = (
-                f"¿Aplicar cálculo automático de PER con agrupación por Lista Cruzada?\n\n"
-                f"Se actualizarán {len(updates)} sesiones de {len(sessions)} totales.\n"
-                f"• Sesiones agrupadas: {grouped_count}\n"
-                f"• Sesiones individuales: {individual_count}\n\n"
-                f"Ejemplo de cambios:\n"
-            )
-            
-            # Show first 3 examples with grouping info
-            for i, update in enumerate(updates[:3]):
-                if update.get('grouped_with'):
-                    confirm_msg += (f"• {update['materia']}: {update['old_per']} → {update['new_per']} "
-                                  f"(Agrupado: {update['grouped_with']}, PE combinado: {update['inscritos']})\n")
-                else:
-                    confirm_msg += f"• {update['materia']}: {update['old_per']} → {update['new_per']}\n"
-            
-            if len(updates) > 3:
-                confirm_msg += f"  ... y {len(updates) - 3} más"
-            
-            if not messagebox.askyesno("Confirmar Cálculo", confirm_msg):
-                return
-            
-            # Apply updates
-            updated_count = self.db_manager.bulk_update_per_values(updates)
-            
+            return sessions, updates, grouped_count, individual_count
+        
+        self.task_runner.run(
+            find_updates,
+            on_done=lambda found: self.confirm_per_updates(*found),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al calcular PER: {str(e)}"),
+            progress_dialog=ProgressDialog(self.root, "Calculando PER", "Cargando sesiones...")
+        )
+    
+    def confirm_per_updates(self, sessions, updates, grouped_count, individual_count):
+        """Confirm the PER changes found by calculate_per_automatic and apply them in the background"""
+        if not sessions:
+            messagebox.showinfo("Sin datos", "No se encontraron sesiones de nivel 1 o 2 para calcular PER.")
+            return
+        
+        if not updates:
+            messagebox.showinfo("Sin cambios", "Todos los valores PER ya están actualizados según la fórmula.")
+            return
+        
+        # Show confirmation with summary including grouping info
+        confirm_msg = (
+            f"¿Aplicar cálculo automático de PER con agrupación por Lista Cruzada?\n\n"
+            f"Se actualizarán {len(updates)} sesiones de {len(sessions)} totales.\n"
+            f"• Sesiones agrupadas: {grouped_count}\n"
+            f"• Sesiones individuales: {individual_count}\n\n"
+            f"Ejemplo de cambios:\n"
+        )
+        
+        # Show first 3 examples with grouping info
+        for i, update in enumerate(updates[:3]):
+            if update.get('grouped_with'):
+                confirm_msg += (f"• {update['materia']}: {update['old_per']} → {update['new_per']} "
+                              f"(Agrupado: {update['grouped_with']}, PE combinado: {update['inscritos']})\n")
+            else:
+                confirm_msg += f"• {update['materia']}: {update['old_per']} → {update['new_per']}\n"
+        
+        if len(updates) > 3:
+            confirm_msg += f"  ... y {len(updates) - 3} más"
+        
+        if not messagebox.askyesno("Confirmar Cálculo", confirm_msg):
+            return
+        
+        def show_result(updated_count):
             if updated_count > 0:
                 messagebox.showinfo("Cálculo Completado", 
                                    f"Se actualizaron {updated_count} valores PER exitosamente.\n"
@@ -959,9 +1087,13 @@ class RECOPSimulator:
                 self.status_var.set(f"PER calculado con agrupación - {updated_count} sesiones actualizadas")
             else:
                 messagebox.showerror("Error", "No se pudieron actualizar los valores PER.")
-            
-        except Exception as e:
-            messagebox.showerror("Error", f"Error al calcular PER: {str(e)}")
+        
+        self.task_runner.run(
+            lambda task: self.db_manager.bulk_update_per_values(updates),
+            on_done=show_result,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al calcular PER: {str(e)}"),
+            progress_dialog=ProgressDialog(self.root, "Calculando PER", f"Actualizando {len(updates)} sesiones...")
+        )
     
     def calculate_per_formula(self, tipo_horario: str, inscritos: int) -> int:
         """
@@ -1080,17 +1212,31 @@ class RECOPSimulator:
     
     def calculate_tamano_estandar_automatic(self):
         """Calculate Tamaño Estándar automatically for nivel 3 and 4 materias"""
-        try:
+        def calculate(task):
             # Get sessions for calculation
+            task.message("Cargando sesiones de nivel 3 y 4...")
             sessions = self.db_manager.get_sessions_for_tamano_estandar_calculation()
+            if not sessions:
+                return sessions, None
             
+            # Calculate Tamaño Estándar
+            task.message(f"Calculando Tamaño Estándar de {len(sessions)} sesiones...")
+            return sessions, self.db_manager.calculate_tamano_estandar_by_department()
+        
+        self.task_runner.run(
+            calculate,
+            on_done=lambda calculated: self.confirm_tamano_estandar_results(*calculated),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al calcular Tamaño Estándar: {str(e)}"),
+            progress_dialog=ProgressDialog(self.root, "Calculando Tamaño Estándar", "Cargando sesiones...")
+        )
+    
+    def confirm_tamano_estandar_results(self, sessions, results):
+        """Confirm and show the results computed by calculate_tamano_estandar_automatic"""
+        try:
             if not sessions:
                 messagebox.showinfo("Sin datos", "No se encontraron sesiones de nivel 3 o 4 para calcular Tamaño Estándar.")
                 return
             
-            # Calculate Tamaño Estándar
-            results = self.db_manager.calculate_tamano_estandar_by_department()
-            
             if not results:
                 messagebox.showinfo("Sin resultados", "No se pudieron calcular valores de Tamaño Estándar.")
                 return
@@ -1560,47 +1706,44 @@ class RECOPSimulator:
             if not messagebox.askyesno("Cálculo Unificado RECOP", info_msg):
                 return
             
-            # Show progress dialog
-            progress = ProgressDialog(self.root, "Calculando Métricas RECOP", 
-                                     "Procesando estructura unificada...")
-            
-            try:
-                # Get unified statistics
-                stats = self.db_manager.get_unified_recop_statistics()
-                
-                progress.close()
-                
-                if not stats or stats['total_secciones'] == 0:
-                    messagebox.showinfo("Sin datos", "No se encontraron datos para el cálculo unificado.")
-                    return
-                
-                # Show confirmation with summary
-                confirm_msg = (
-                    f"✅ Cálculo Unificado RECOP completado.\n\n"
-                    f"📈 ESTADÍSTICAS PROCESADAS:\n"
-                    f"• Dependencias: {stats['total_dependencias']}\n"
-                    f"• Niveles académicos: {stats['total_niveles']}\n"
-                    f"• Tipos de profesor: {stats['total_tipos_profesor']}\n"
-                    f"• Tipos de sesión: {stats['total_tipos_sesion']}\n"
-                    f"• Secciones procesadas: {stats['total_secciones']}\n\n"
-                    f"🎯 NIVELES: {', '.join(stats['niveles_found'])}\n"
-                    f"👥 PROFESORES: {', '.join(stats['tipos_profesor_found'])}\n"
-                    f"📚 SESIONES: {', '.join(stats['tipos_sesion_found'])}\n\n"
-                    f"¿Desea ver el dashboard unificado con ambas métricas?"
-                )
-                
-                if messagebox.askyesno("Cálculo Completado", confirm_msg):
-                    self.show_unified_recop_dashboard(stats)
-                
-                self.status_var.set(f"RECOP Unificado calculado - {stats['total_secciones']} secciones procesadas")
-                
-            except Exception as e:
-                progress.close()
-                raise e
+            # Get unified statistics in the background
+            self.task_runner.run(
+                lambda task: self.db_manager.get_unified_recop_statistics(),
+                on_done=self.show_unified_recop_summary,
+                on_error=lambda e: messagebox.showerror("Error", f"Error en cálculo unificado: {str(e)}"),
+                progress_dialog=ProgressDialog(self.root, "Calculando Métricas RECOP", 
+                                               "Procesando estructura unificada...")
+            )
                 
         except Exception as e:
             messagebox.showerror("Error", f"Error en cálculo unificado: {str(e)}")
     
+    def show_unified_recop_summary(self, stats):
+        """Summarize the unified statistics and offer the dashboard"""
+        if not stats or stats['total_secciones'] == 0:
+            messagebox.showinfo("Sin datos", "No se encontraron datos para el cálculo unificado.")
+            return
+        
+        # Show confirmation with summary
+        confirm_msg = (
+            f"✅ Cálculo Unificado RECOP completado.\n\n"
+            f"📈 ESTADÍSTICAS PROCESADAS:\n"
+            f"• Dependencias: {stats['total_dependencias']}\n"
+            f"• Niveles académicos: {stats['total_niveles']}\n"
+            f"• Tipos de profesor: {stats['total_tipos_profesor']}\n"
+            f"• Tipos de sesión: {stats['total_tipos_sesion']}\n"
+            f"• Secciones procesadas: {stats['total_secciones']}\n\n"
+            f"🎯 NIVELES: {', '.join(stats['niveles_found'])}\n"
+            f"👥 PROFESORES: {', '.join(stats['tipos_profesor_found'])}\n"
+            f"📚 SESIONES: {', '.join(stats['tipos_sesion_found'])}\n\n"
+            f"¿Desea ver el dashboard unificado con ambas métricas?"
+        )
+        
+        if messagebox.askyesno("Cálculo Completado", confirm_msg):
+            self.show_unified_recop_dashboard(stats)
+        
+        self.status_var.set(f"RECOP Unificado calculado - {stats['total_secciones']} secciones procesadas")
+    
     def show_unified_recop_dashboard(self, stats):
         """Show unified dashboard with both Horas Promedio and Secciones a Tamaño Estándar"""
         # Create dashboard window
@@ -2071,6 +2214,12 @@ def main():
     
     # Run main loop
     root.mainloop()
+    
+    # Stop any background task before closing the database
+    app.task_runner.shutdown()
+    
+    # Release pooled database connections (checkpoints the WAL)
+    app.db_manager.close()
 
 if __name__ == "__main__":
     main()
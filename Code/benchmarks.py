@@ -0,0 +1,1344 @@
+"""
+Benchmarks for the RECOP simulator data pipelines.
+
+Every benchmark works on throwaway copies inside a temporary directory, so
+the databases under 'Bases de Datos' are never modified.
+
+Usage (from the Code directory):
+    python benchmarks.py import "../Archivos Externos/Cartelera20251.csv"
+    python benchmarks.py plans "../Bases de Datos/university_schedule.db"
+    python benchmarks.py unified "../Bases de Datos"
+    python benchmarks.py per "../Bases de Datos/university_schedule.db"
+    python benchmarks.py match "../Bases de Datos/university_schedule.db"
+    python benchmarks.py scoring "../Bases de Datos/university_schedule.db"
+    python benchmarks.py crosswalk "../Bases de Datos/university_schedule.db"
+    python benchmarks.py dedication "../Bases de Datos/university_schedule.db"
+    python benchmarks.py raw "../Programa Auxiliar Dedicacion/cartelera_dedicaciones.csv"
+    python benchmarks.py delta "../Archivos Externos/Cartelera20251.csv"
+    python benchmarks.py stream "../Archivos Externos/Cartelera20251.csv"
+    python benchmarks.py xlsx "../Archivos Externos/Cartelera vertical 2025-10.xlsx"
+    python benchmarks.py scroll "../Bases de Datos/university_schedule.db"
+    python benchmarks.py keyset "../Bases de Datos/university_schedule.db"
+    python benchmarks.py search "../Bases de Datos/university_schedule.db"
+    python benchmarks.py typeahead "../Bases de Datos/university_schedule.db"
+"""
+
+import os
+import sys
+import shutil
+import tempfile
+import time
+import contextlib
+import glob
+import io
+import random
+import re
+import tracemalloc
+from typing import Dict, List
+
+from database import DatabaseManager, TableCursor
+from csv_processor import CSVProcessor
+from per_engine import PEREngine
+from personal_data_processor import PersonalDataProcessor
+from name_matching import NameScoringBackend
+from spreadsheet_reader import SpreadsheetReader
+from row_provider import PagedRowProvider
+from search_index import TextSearchIndex, fold_text
+
+
+def _silent_progress(message):
+    pass
+
+
+def benchmark_csv_import(csv_file_path: str, pooled: bool = True, bulk: bool = True) -> Dict:
+    """
+    Import a cartelera CSV into a fresh temporary database and time it
+
+    Args:
+        csv_file_path: Path to the cartelera CSV file
+        pooled: Use the pooled connection manager (False = one connection per query)
+        bulk: Single-transaction batched import (False = commit row by row)
+
+    Returns:
+        Dictionary with elapsed seconds, SQL statements and statements per second
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_bench_')
+    try:
+        db_manager = DatabaseManager(os.path.join(temp_dir, 'benchmark.db'), pooled=pooled)
+        db_manager.connections.enable_statement_tracing()
+
+        processor = CSVProcessor(db_manager)
+
+        start = time.perf_counter()
+        result = processor.process_csv_file(csv_file_path, _silent_progress, bulk=bulk)
+        elapsed = time.perf_counter() - start
+
+        db_manager.close()
+
+        statements = db_manager.connections.statements_executed
+        return {
+            'pooled': pooled,
+            'bulk': bulk,
+            'success': result['success'],
+            'processed_rows': result['processed_rows'],
+            'pending_name_reviews': result['pending_name_reviews'],
+            'elapsed_seconds': elapsed,
+            'statements': statements,
+            'connections_opened': db_manager.connections.connections_opened,
+            'statements_per_second': statements / elapsed if elapsed > 0 else 0
+        }
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+
+def print_import_benchmark(csv_file_path: str):
+    """Compare the import modes: per-query connections, connection pool, bulk transaction"""
+    print(f"Import benchmark: {csv_file_path}")
+    print(f"{'Mode':<10} {'Rows':>6} {'Seconds':>9} {'Statements':>11} {'Conns':>7} {'Stmt/s':>10}")
+
+    modes = [
+        ('legacy', False, False),
+        ('pooled', True, False),
+        ('bulk', True, True),
+    ]
+    for mode, pooled, bulk in modes:
+        stats = benchmark_csv_import(csv_file_path, pooled=pooled, bulk=bulk)
+        print(f"{mode:<10} {stats['processed_rows']:>6} {stats['elapsed_seconds']:>9.2f} "
+              f"{stats['statements']:>11} {stats['connections_opened']:>7} "
+              f"{stats['statements_per_second']:>10.0f}")
+
+
+def _cartelera_content(db_manager: DatabaseManager) -> tuple:
+    """Sections and sessions (with professor names) of a database, independent of ids"""
+    secciones = db_manager.execute_query(
+        "SELECT NRC, indicador, cupo, inscritos, cupoDisponible, lista_cruzada, materia_codigo FROM Seccion"
+    )
+    sesiones = db_manager.execute_query("""
+        SELECT se.seccion_NRC, se.tipoHorario, se.horaInicio, se.horaFin, se.duracion, se.edificio,
+               se.salon, se.atributoSalon, se.dias,
+               (SELECT GROUP_CONCAT(name, ';') FROM (
+                    SELECT p.nombres || ' ' || p.apellidos AS name
+                    FROM SesionProfesor sp JOIN Profesor p ON p.id = sp.profesor_id
+                    WHERE sp.sesion_id = se.id ORDER BY name))
+        FROM Sesion se
+    """)
+    return sorted(secciones), sorted(sesiones, key=repr)
+
+
+def benchmark_delta_import(csv_file_path: str, changed_fraction: float = 0.05, seed: int = 0) -> Dict:
+    """
+    Re-import an enrollment refresh of a cartelera (Inscritos changed for a
+    fraction of the NRCs): delta import into the loaded database against a
+    full import into an empty one
+
+    Returns:
+        Dictionary with both timings, the change set and whether the delta
+        result matches the full import
+    """
+    import pandas as pd
+
+    temp_dir = tempfile.mkdtemp(prefix='recop_delta_')
+    try:
+        df = pd.read_csv(csv_file_path)
+        nrcs = sorted(df['NRC'].dropna().unique())
+        changed = set(random.Random(seed).sample(nrcs, max(1, int(len(nrcs) * changed_fraction))))
+        df.loc[df['NRC'].isin(changed), 'Inscritos'] += 1
+        refresh_path = os.path.join(temp_dir, 'refresh.csv')
+        df.to_csv(refresh_path, index=False)
+
+        loaded = DatabaseManager(os.path.join(temp_dir, 'loaded.db'))
+        fresh = DatabaseManager(os.path.join(temp_dir, 'fresh.db'))
+        with contextlib.redirect_stdout(io.StringIO()):
+            CSVProcessor(loaded).process_csv_file(csv_file_path)
+
+            start = time.perf_counter()
+            delta = CSVProcessor(loaded).process_csv_file(refresh_path, delta=True)
+            delta_seconds = time.perf_counter() - start
+
+            start = time.perf_counter()
+            CSVProcessor(fresh).process_csv_file(refresh_path)
+            full_seconds = time.perf_counter() - start
+
+        same = _cartelera_content(loaded) == _cartelera_content(fresh)
+        loaded.close()
+        fresh.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'changed_nrcs': len(changed),
+        'delta_seconds': delta_seconds,
+        'full_seconds': full_seconds,
+        'changes': delta['changes'],
+        'same_as_full_import': same,
+    }
+
+
+def print_delta_import_benchmark(csv_file_path: str):
+    """Benchmark a delta re-import of an enrollment refresh"""
+    result = benchmark_delta_import(csv_file_path)
+    changes = result['changes']
+    print(f"Enrollment refresh of {result['changed_nrcs']} NRCs")
+    print(f"  delta import: {result['delta_seconds']:.2f} s, "
+          f"{changes['sections_updated']} sections updated, {changes['sessions_updated']} sessions updated, "
+          f"{changes['sessions_unchanged']} sessions unchanged")
+    print(f"  full import into an empty database: {result['full_seconds']:.2f} s")
+    print(f"  same sections and sessions as the full import: {result['same_as_full_import']}")
+    if not result['same_as_full_import']:
+        sys.exit(1)
+
+
+def _peak_memory(call) -> tuple:
+    """Run call() and return (its result, peak traced memory in MB)"""
+    tracemalloc.start()
+    try:
+        value = call()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return value, peak / (1024 * 1024)
+
+
+def benchmark_streaming_reader(csv_file_path: str, copies: int = 20, chunk_rows: int = 500) -> Dict:
+    """
+    Read a large cartelera (the file repeated copies times) whole against
+    the chunked reader, and import the original file with small chunks
+
+    Returns:
+        Dictionary with the peak memory of both reads, whether the chunked
+        validation matches the whole-file one and whether the chunked import
+        matches a single-chunk import
+    """
+    import pandas as pd
+
+    processor = CSVProcessor(None)
+    temp_dir = tempfile.mkdtemp(prefix='recop_stream_')
+    try:
+        df = pd.read_csv(csv_file_path)
+        large_path = os.path.join(temp_dir, 'large.csv')
+        pd.concat([df] * copies).to_csv(large_path, index=False)
+
+        def read_whole():
+            return len(pd.read_csv(large_path).dropna(how='all'))
+
+        def read_chunked():
+            scan = processor.new_cartelera_scan(processor.read_cartelera_header(large_path))
+            for chunk in processor.read_cartelera_chunks(large_path, chunk_rows=chunk_rows):
+                processor.scan_cartelera_chunk(scan, chunk)
+            return processor.finish_cartelera_scan(scan)
+
+        whole_rows, whole_mb = _peak_memory(read_whole)
+        validation, chunked_mb = _peak_memory(read_chunked)
+
+        contents = []
+        for rows in (chunk_rows, None):
+            db_manager = DatabaseManager(os.path.join(temp_dir, f'import_{rows}.db'))
+            with contextlib.redirect_stdout(io.StringIO()):
+                importer = CSVProcessor(db_manager)
+                if rows:
+                    importer.READ_CHUNK_ROWS = rows
+                importer.process_csv_file(csv_file_path)
+            contents.append(_cartelera_content(db_manager))
+            db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': validation['row_count'],
+        'whole_rows': whole_rows,
+        'whole_mb': whole_mb,
+        'chunked_mb': chunked_mb,
+        'validation': validation,
+        'same_import': contents[0] == contents[1],
+    }
+
+
+def print_streaming_reader_benchmark(csv_file_path: str):
+    """Benchmark the chunked cartelera reader against a whole-file read"""
+    result = benchmark_streaming_reader(csv_file_path)
+    print(f"Cartelera repeated to {result['rows']} rows")
+    print(f"  whole-file read ({result['whole_rows']} non-empty rows): peak {result['whole_mb']:.1f} MB")
+    print(f"  chunked read with validation and preview: peak {result['chunked_mb']:.1f} MB")
+    for warning in result['validation']['warnings']:
+        print(f"    {warning}")
+    print(f"  chunked import same as single-chunk import: {result['same_import']}")
+    if not result['same_import']:
+        sys.exit(1)
+
+
+def benchmark_xlsx_cache(xlsx_file_path: str) -> Dict:
+    """
+    Read a Cartelera workbook cold (openpyxl parse), from the on-disk sheet
+    cache in a new reader and again from the same reader
+
+    Returns:
+        Dictionary with the three timings and whether the cached frame
+        equals the parsed one
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_xlsx_')
+    try:
+        cached_reader = SpreadsheetReader(cache_dir=temp_dir)
+        readers = [
+            ('parse', SpreadsheetReader(cache_dir=temp_dir)),
+            ('disk_cache', cached_reader),
+            ('memory', cached_reader),
+        ]
+        timings = {}
+        frames = {}
+        for label, reader in readers:
+            start = time.perf_counter()
+            frames[label] = reader.read_sheet(xlsx_file_path, CSVProcessor.CARTELERA_COLUMNS)
+            timings[label] = time.perf_counter() - start
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': len(frames['parse']),
+        'timings': timings,
+        'same_frame': frames['parse'].equals(frames['disk_cache']) and frames['parse'].equals(frames['memory']),
+    }
+
+
+def print_xlsx_cache_benchmark(xlsx_file_path: str):
+    """Benchmark the XLSX sheet cache"""
+    result = benchmark_xlsx_cache(xlsx_file_path)
+    timings = result['timings']
+    print(f"Workbook with {result['rows']} data rows")
+    print(f"  openpyxl read-only parse: {timings['parse']:.3f} s")
+    print(f"  on-disk CSV cache: {timings['disk_cache']:.3f} s")
+    print(f"  same reader again: {timings['memory']:.4f} s")
+    print(f"  cached frame same as parsed: {result['same_frame']}")
+    if not result['same_frame']:
+        sys.exit(1)
+
+
+def _copy_database(db_path: str, temp_dir: str) -> str:
+    """Copy a database into temp_dir so benchmarks never touch the original"""
+    copy_path = os.path.join(temp_dir, os.path.basename(db_path))
+    shutil.copy2(db_path, copy_path)
+    return copy_path
+
+
+def _grow_sessions(db_manager: DatabaseManager, target_rows: int) -> int:
+    """Duplicate the Sesion rows of a database copy until it has target_rows"""
+    columns = [row[1] for row in db_manager.execute_query("PRAGMA table_info(Sesion)") if row[1] != 'id']
+    column_list = ', '.join(columns)
+    while True:
+        count = db_manager.execute_query("SELECT COUNT(*) FROM Sesion", fetch_one=True)[0]
+        if count == 0 or count >= target_rows:
+            return count
+        db_manager.execute_query(f"INSERT INTO Sesion ({column_list}) SELECT {column_list} FROM Sesion")
+
+
+def benchmark_table_scrolling(db_path: str, target_rows: int = 12000, window_rows: int = 25,
+                              wheel_rows: int = 3) -> Dict:
+    """
+    Browse the Sesion table of the database viewer from top to bottom: load
+    it whole against scrolling a PagedRowProvider window (over a keyset
+    TableCursor) by mouse-wheel steps
+
+    Returns:
+        Dictionary with the timings and peak memory of both, the number of
+        page queries, the slowest scroll step and whether every window
+        matches the whole table
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_scroll_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        rows = _grow_sessions(db_manager, target_rows)
+
+        start = time.perf_counter()
+        full, full_mb = _peak_memory(lambda: db_manager.get_table_data('Sesion'))
+        full_seconds = time.perf_counter() - start
+
+        fetches = []
+        cursor = TableCursor(db_manager, 'Sesion')
+
+        def fetch(limit, offset):
+            fetches.append(offset)
+            return cursor.fetch(limit, offset)
+
+        def scroll():
+            provider = PagedRowProvider(fetch, lambda: len(full))
+            same = True
+            slowest = 0.0
+            for top in range(0, max(len(full) - window_rows, 0) + 1, wheel_rows):
+                step_start = time.perf_counter()
+                window = provider.rows(top, top + window_rows)
+                slowest = max(slowest, time.perf_counter() - step_start)
+                same = same and window == full[top:top + window_rows]
+            return same, slowest
+
+        start = time.perf_counter()
+        (same_rows, slowest_step), scroll_mb = _peak_memory(scroll)
+        scroll_seconds = time.perf_counter() - start
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': rows,
+        'full_seconds': full_seconds,
+        'full_mb': full_mb,
+        'scroll_seconds': scroll_seconds,
+        'scroll_mb': scroll_mb,
+        'page_queries': len(fetches),
+        'slowest_step': slowest_step,
+        'same_rows': same_rows,
+    }
+
+
+def print_table_scrolling_benchmark(db_path: str):
+    """Benchmark the virtual treeview's row provider on a large Sesion table"""
+    result = benchmark_table_scrolling(db_path)
+    print(f"Sesion table grown to {result['rows']} rows")
+    print(f"  whole table load: {result['full_seconds']:.2f} s, peak {result['full_mb']:.1f} MB")
+    print(f"  scroll top to bottom: {result['scroll_seconds']:.2f} s, peak {result['scroll_mb']:.1f} MB, "
+          f"{result['page_queries']} page queries, slowest step {result['slowest_step'] * 1000:.1f} ms")
+    print(f"  every window matches the table: {result['same_rows']}")
+    if not result['same_rows']:
+        sys.exit(1)
+
+
+def benchmark_keyset_pages(db_path: str, target_rows: int = 12000, page_rows: int = 100,
+                           samples: int = 5) -> Dict:
+    """
+    Page through the grown Sesion table of the database viewer: time a page
+    flip near the start and near the end with LIMIT/OFFSET (plus the count
+    query the viewer used to run per page) against a TableCursor
+
+    Returns:
+        Dictionary with the per-flip timings, the cursor's count queries and
+        whether every cursor page matches its OFFSET page
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_keyset_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        rows = _grow_sessions(db_manager, target_rows)
+        last_page = (rows - 1) // page_rows
+
+        def offset_flip(page):
+            db_manager.count_table_rows('Sesion')
+            return db_manager.get_table_data('Sesion', None, page_rows, page * page_rows)
+
+        def best_time(call) -> float:
+            best = None
+            for _ in range(samples):
+                start = time.perf_counter()
+                call()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+
+        cursor = TableCursor(db_manager, 'Sesion')
+        count_queries = []
+        count_rows = db_manager.count_table_rows
+
+        def counted(*args, **kwargs):
+            count_queries.append(args)
+            return count_rows(*args, **kwargs)
+
+        db_manager.count_table_rows = counted
+
+        # Walk every page as the viewer's next button does, checking each one
+        same_pages = True
+        for page in range(last_page + 1):
+            page_data = cursor.fetch(page_rows, page * page_rows)
+            same_pages = same_pages and page_data == db_manager.get_table_data('Sesion', None, page_rows, page * page_rows)
+        del db_manager.count_table_rows
+
+        timings = {
+            'offset_first': best_time(lambda: offset_flip(1)),
+            'offset_last': best_time(lambda: offset_flip(last_page)),
+            'cursor_first': best_time(lambda: cursor.fetch(page_rows, page_rows)),
+            'cursor_last': best_time(lambda: cursor.fetch(page_rows, last_page * page_rows)),
+            'cursor_before_last': best_time(lambda: cursor.fetch(page_rows, (last_page - 1) * page_rows)),
+        }
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': rows,
+        'pages': last_page + 1,
+        'timings': timings,
+        'count_queries': len(count_queries),
+        'same_pages': same_pages,
+    }
+
+
+def print_keyset_benchmark(db_path: str):
+    """Benchmark keyset pagination of the database viewer"""
+    result = benchmark_keyset_pages(db_path)
+    timings = result['timings']
+    print(f"Sesion table grown to {result['rows']} rows ({result['pages']} pages)")
+    print(f"  OFFSET + COUNT per flip: page 2 {timings['offset_first'] * 1000:.1f} ms, "
+          f"last page {timings['offset_last'] * 1000:.1f} ms")
+    print(f"  keyset cursor per flip: page 2 {timings['cursor_first'] * 1000:.1f} ms, "
+          f"last page {timings['cursor_last'] * 1000:.1f} ms, "
+          f"page before last {timings['cursor_before_last'] * 1000:.1f} ms")
+    print(f"  count queries for the whole walk: {result['count_queries']}")
+    print(f"  every cursor page matches its OFFSET page: {result['same_pages']}")
+    if not result['same_pages']:
+        sys.exit(1)
+
+
+SEARCH_BENCHMARK_TERMS = [
+    ('Profesor', 'garcia'),
+    ('Profesor', 'marino'),
+    ('Materia', 'sistemas'),
+    ('Seccion', '10'),
+    ('Sesion', 'isis'),
+    ('Sesion', 'ml 5'),
+]
+
+
+def benchmark_search_indexes(db_path: str, target_rows: int = 12000, page_rows: int = 100,
+                             samples: int = 5) -> Dict:
+    """
+    Time the database viewer's searches (count plus first page) served from
+    the FTS indexes against the LIKE scans they replace, on the grown Sesion
+    table, and check the indexes stayed in sync with their tables
+
+    Returns:
+        Dictionary with per-term timings and match counts, and the tables whose
+        index row count differs from the table's
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_search_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        rows = _grow_sessions(db_manager, target_rows)
+        search_indexes = db_manager.search_indexes
+
+        def best_time(call) -> float:
+            best = None
+            for _ in range(samples):
+                start = time.perf_counter()
+                call()
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            return best
+
+        def search(table, term):
+            return (db_manager.count_table_rows(table, term),
+                    db_manager.get_table_data(table, term, page_rows, 0))
+
+        terms = []
+        for table, term in SEARCH_BENCHMARK_TERMS:
+            db_manager.search_indexes = search_indexes
+            fts_count, fts_page = search(table, term)
+            fts_time = best_time(lambda: search(table, term))
+
+            db_manager.search_indexes = set()
+            like_count, _ = search(table, term)
+            like_time = best_time(lambda: search(table, term))
+
+            terms.append({
+                'table': table,
+                'term': term,
+                'fts_count': fts_count,
+                'like_count': like_count,
+                'fts_time': fts_time,
+                'like_time': like_time,
+                'page_consistent': len(fts_page) == min(fts_count, page_rows),
+            })
+        db_manager.search_indexes = search_indexes
+
+        out_of_sync = []
+        for table, (fts_table, _, _) in DatabaseManager.SEARCH_INDEXES.items():
+            if table not in search_indexes:
+                continue
+            table_rows = db_manager.execute_query(f"SELECT COUNT(*) FROM {table}", fetch_one=True)[0]
+            index_rows = db_manager.execute_query(f"SELECT COUNT(*) FROM {fts_table}", fetch_one=True)[0]
+            if table_rows != index_rows:
+                out_of_sync.append(f"{table}: {table_rows} rows, {index_rows} indexed")
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': rows,
+        'indexed_tables': sorted(search_indexes),
+        'terms': terms,
+        'out_of_sync': out_of_sync,
+    }
+
+
+def print_search_benchmark(db_path: str):
+    """Benchmark the FTS-backed searches of the database viewer"""
+    result = benchmark_search_indexes(db_path)
+    print(f"Sesion table grown to {result['rows']} rows; "
+          f"indexed tables: {', '.join(result['indexed_tables']) or 'none (no FTS5)'}")
+    for term in result['terms']:
+        print(f"  {term['table']} '{term['term']}': FTS {term['fts_time'] * 1000:.1f} ms "
+              f"({term['fts_count']} rows), LIKE {term['like_time'] * 1000:.1f} ms ({term['like_count']} rows)")
+    consistent = all(term['page_consistent'] for term in result['terms'])
+    print(f"  first pages consistent with the counts: {consistent}")
+    for problem in result['out_of_sync']:
+        print(f"  index out of sync: {problem}")
+    if not consistent or result['out_of_sync']:
+        sys.exit(1)
+
+
+def benchmark_search_as_you_type(db_path: str, copies: int = 50, typed_names: int = 20,
+                                 seed: int = 0) -> Dict:
+    """
+    Type professor names keystroke by keystroke into the query dialogs'
+    search, on the professor directory repeated copies times: the substring
+    scan the dialogs ran per keystroke against the TextSearchIndex lookup
+    narrowed from the previous keystroke's matches (as SearchController does)
+
+    Returns:
+        Dictionary with the directory size, index build time, mean and worst
+        per-keystroke timings, and whether every lookup matches a plain scan
+        with the index's rules (every word in a field, accents folded)
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_typeahead_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        professors = [dict(prof) for prof in db_manager.professor_directory.get_professors() for _ in range(copies)]
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    fields = lambda prof: (prof['full_name'], prof['departamentos'])
+    folded = [[fold_text(text) for text in fields(prof)] for prof in professors]
+
+    def reference(term):
+        words = fold_text(term).split()
+        return {position for position, texts in enumerate(folded)
+                if all(any(word in text for text in texts) for word in words)}
+
+    def scan(term):
+        term = term.lower()
+        return [prof for prof in professors
+                if term in prof['full_name'].lower() or term in prof['departamentos'].lower()]
+
+    start = time.perf_counter()
+    index = TextSearchIndex(professors, fields)
+    build_seconds = time.perf_counter() - start
+
+    names = [prof['full_name'] for prof in random.Random(seed).sample(professors, typed_names)]
+    scan_times = []
+    index_times = []
+    same_matches = True
+    for name in names:
+        previous = None
+        for length in range(1, len(name) + 1):
+            term = name[:length]
+            start = time.perf_counter()
+            scan(term)
+            scan_times.append(time.perf_counter() - start)
+
+            start = time.perf_counter()
+            previous = index.match(term, within=previous)
+            index.rows_at(previous)
+            index_times.append(time.perf_counter() - start)
+
+            same_matches = same_matches and previous == reference(term)
+
+    return {
+        'rows': len(professors),
+        'keystrokes': len(scan_times),
+        'build_seconds': build_seconds,
+        'scan_mean': sum(scan_times) / len(scan_times),
+        'scan_worst': max(scan_times),
+        'index_mean': sum(index_times) / len(index_times),
+        'index_worst': max(index_times),
+        'same_matches': same_matches,
+    }
+
+
+def print_search_as_you_type_benchmark(db_path: str):
+    """Benchmark the query dialogs' search-as-you-type"""
+    result = benchmark_search_as_you_type(db_path)
+    print(f"Professor directory repeated to {result['rows']} rows, "
+          f"{result['keystrokes']} keystrokes (index built in {result['build_seconds']:.2f} s)")
+    print(f"  substring scan per keystroke: mean {result['scan_mean'] * 1000:.2f} ms, "
+          f"worst {result['scan_worst'] * 1000:.2f} ms")
+    print(f"  trigram index, narrowed: mean {result['index_mean'] * 1000:.2f} ms, "
+          f"worst {result['index_worst'] * 1000:.2f} ms")
+    print(f"  same matches as a plain scan: {result['same_matches']}")
+    if not result['same_matches']:
+        sys.exit(1)
+
+
+def _capture_queries(db_manager: DatabaseManager, calls) -> List[str]:
+    """Run calls and return every distinct SELECT they executed (parameters expanded)"""
+    statements = []
+    conn = db_manager.get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            for call in calls:
+                call()
+    finally:
+        conn.set_trace_callback(None)
+        conn.close()
+
+    return list(dict.fromkeys(
+        statement for statement in statements
+        if statement.lstrip().upper().startswith(('SELECT', 'WITH'))
+    ))
+
+
+# Hot queries whose plans must stay index-driven. A driving full pass is only
+# allowed where the method reads every session anyway.
+QUERY_PLAN_CHECKS = [
+    ('get_profesor_sessions', lambda db: db.get_profesor_sessions(1), False),
+    ('get_sessions_for_per_calculation', lambda db: db.get_sessions_for_per_calculation(), False),
+    ('calculate_horas_promedio_and_tamano_estandar_unified',
+     lambda db: db.calculate_horas_promedio_and_tamano_estandar_unified(), True),
+    ("get_table_data('Sesion')", lambda db: db.get_table_data('Sesion', limit=100, offset=0), True),
+    ("get_table_data('Sesion', after_key)", lambda db: db.get_table_data('Sesion', limit=100, after_key=(1,)), False),
+    ("get_table_data('Profesor', after_key)",
+     lambda db: db.get_table_data('Profesor', limit=100, after_key=('A', 'A', 1)), False),
+    ("get_table_data('Materia', after_key)",
+     lambda db: db.get_table_data('Materia', limit=100, after_key=('A', 1, 'A')), False),
+    ("get_table_data('Profesor', search)", lambda db: db.get_table_data('Profesor', 'garcia', limit=100), False),
+    ("count_table_rows('Seccion', search)", lambda db: db.count_table_rows('Seccion', '10'), False),
+    ("get_table_data('Sesion', search)", lambda db: db.get_table_data('Sesion', 'isis ml', limit=100), True),
+]
+
+
+def check_query_plans(db_path: str) -> List[str]:
+    """
+    Query-plan regression check for the hot queries
+
+    Every joined table must be reached through an index (SEARCH); only the
+    outermost loop of a whole-table method may be a SCAN, and SQLite must
+    never have to build an automatic index on a table. Scans of CTE results
+    and subqueries are intermediate steps and are not checked, nor are FTS
+    lookups (a virtual table SCAN that queries the full-text index).
+
+    Returns:
+        List of failure messages (empty when every plan is index-driven)
+    """
+    failures = []
+    temp_dir = tempfile.mkdtemp(prefix='recop_plans_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        conn = db_manager.get_connection()
+
+        for name, call, driving_scan_allowed in QUERY_PLAN_CHECKS:
+            queries = _capture_queries(db_manager, [lambda: call(db_manager)])
+            if not queries:
+                failures.append(f"{name}: no queries captured")
+
+            for query in queries:
+                cte_names = set(re.findall(r'(\w+)(?:\([\w\s,]*\))?\s+AS\s+(?:MATERIALIZED\s+)?\(', query, re.IGNORECASE))
+                cte_names.update(
+                    alias for table, alias in re.findall(r'\b(?:FROM|JOIN)\s+(\w+)\s+(\w+)', query, re.IGNORECASE)
+                    if table in cte_names
+                )
+                driving_loops = {}
+                for node_id, parent_id, _, detail in conn.execute("EXPLAIN QUERY PLAN " + query):
+                    if not detail.startswith(('SCAN', 'SEARCH')):
+                        continue
+                    is_driving = driving_loops.setdefault(parent_id, node_id) == node_id
+                    table = detail.split()[1]
+                    if table in cte_names or table.startswith('(') or 'VIRTUAL TABLE' in detail:
+                        continue
+
+                    if 'AUTOMATIC' in detail:
+                        failures.append(f"{name}: {detail}")
+                    elif detail.startswith('SCAN') and not (driving_scan_allowed and is_driving):
+                        failures.append(f"{name}: {detail}")
+
+        conn.close()
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return failures
+
+
+def print_query_plan_check(db_path: str):
+    """Print the result of check_query_plans and exit non-zero on failures"""
+    failures = check_query_plans(db_path)
+    if failures:
+        print("Query plans using full scans:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+    print(f"All {len(QUERY_PLAN_CHECKS)} hot queries use indexes.")
+
+
+def unified_row_by_row(db_manager: DatabaseManager) -> Dict:
+    """
+    Row-by-row reference of the unified RECOP calculation (the implementation
+    the SQL engine replaced): every session-professor row is classified and
+    weighted in Python, in NRC and session order
+
+    Returns:
+        Same structure as DatabaseManager.calculate_horas_promedio_and_tamano_estandar_unified
+    """
+    rows = db_manager.execute_query("""
+        SELECT
+            ses.tipoHorario, ses.duracion, ses.dias, ses.PER, ses.seccion_NRC,
+            COALESCE(pd.dedicacion, 0), m.creditos, m.codigo, m.semanas, m.nivel_numerico,
+            m.departamento_nombre, p.id, p.dependencia, p.tipo
+        FROM Sesion ses
+        JOIN Seccion sec ON ses.seccion_NRC = sec.NRC
+        JOIN Materia m ON sec.materia_codigo = m.codigo
+        JOIN SesionProfesor sp ON ses.id = sp.sesion_id
+        JOIN Profesor p ON sp.profesor_id = p.id
+        LEFT JOIN ProfesorDedicacion pd
+             ON pd.seccion_NRC = ses.seccion_NRC AND pd.profesor_id = p.id
+        WHERE m.nivel_numerico IN (1, 2, 3, 4)
+        AND UPPER(ses.tipoHorario) IN ('MAGISTRAL', 'TEORICA', 'LABORATORIO', 'TALLER Y PBL')
+        ORDER BY ses.seccion_NRC, ses.id
+    """)
+
+    structure = {}
+    for (tipo_horario, duracion, dias, session_per, nrc, dedicacion, creditos, materia_codigo, semanas,
+         nivel_numerico, departamento_nombre, profesor_id, profesor_dependencia, profesor_tipo) in rows:
+        tipo_horario = tipo_horario or 'No especificado'
+        creditos = creditos or 0
+
+        if profesor_dependencia and 'DEPARTAMENTO' in profesor_dependencia.upper():
+            dependencia = db_manager.get_dependency_for_department(departamento_nombre, profesor_dependencia)
+        else:
+            dependencia = db_manager.get_dependency_for_department(departamento_nombre, None)
+
+        nivel = 'Basico e intermedio' if (nivel_numerico or 1) in (1, 2) else 'Avanzado'
+        clasificacion = db_manager.classify_session_type(tipo_horario)
+        tipo = db_manager.normalize_profesor_tipo_for_calculation(profesor_tipo)
+        if clasificacion is None or dedicacion == 0 or tipo in ('AGD', 'AGM'):
+            continue
+
+        horas = db_manager.calculate_horas_reconocidas_formula(
+            duracion=duracion or 0, dias=dias or '', creditos=creditos, semanas=semanas or 16,
+            tipo_horario=tipo_horario, tipo_profesor=tipo, materia_codigo=materia_codigo
+        ) * (dedicacion / 100.0)
+        per = (session_per or 0) * (dedicacion / 100.0)
+
+        profesores = (structure.setdefault(dependencia, {}).setdefault(nivel, {}).setdefault(tipo, {})
+                      .setdefault(clasificacion, {}).setdefault(nrc, {}))
+        if profesor_id not in profesores:
+            profesores[profesor_id] = {'horas': horas, 'per': per}
+        elif materia_codigo != 'ISIS-1221':
+            profesores[profesor_id]['horas'] = min(profesores[profesor_id]['horas'] + horas, creditos)
+        else:
+            profesores[profesor_id]['horas'] += horas
+
+    return structure
+
+
+def check_unified_engine(db_path: str, repeats: int = 5) -> List[str]:
+    """
+    Golden-output check: the engine of the unified RECOP calculation must
+    reproduce the row-by-row reference exactly (structure, hours and PER).
+    Both run repeats times, alternating, and the best time of each is shown
+
+    Returns:
+        List of mismatch messages (empty when both engines agree)
+    """
+    failures = []
+    temp_dir = tempfile.mkdtemp(prefix='recop_unified_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+
+        reference_seconds = engine_seconds = float('inf')
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(repeats):
+                start = time.perf_counter()
+                reference = unified_row_by_row(db_manager)
+                reference_seconds = min(reference_seconds, time.perf_counter() - start)
+
+                start = time.perf_counter()
+                engine = db_manager.calculate_horas_promedio_and_tamano_estandar_unified()
+                engine_seconds = min(engine_seconds, time.perf_counter() - start)
+
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    def flatten(structure):
+        return [
+            (dependencia, nivel, tipo, clase, nrc, profesor_id, values['horas'], values['per'])
+            for dependencia, niveles in structure.items()
+            for nivel, tipos in niveles.items()
+            for tipo, clases in tipos.items()
+            for clase, secciones in clases.items()
+            for nrc, profesores in secciones.items()
+            for profesor_id, values in profesores.items()
+        ]
+
+    # Insertion order matters too: the summaries add floats in dictionary order
+    reference_rows = flatten(reference)
+    engine_rows = flatten(engine)
+    if reference_rows != engine_rows:
+        missing = set(reference_rows) - set(engine_rows)
+        extra = set(engine_rows) - set(reference_rows)
+        if not missing and not extra:
+            failures.append(f"{db_path}: same entries in a different order")
+        for row in sorted(missing, key=str)[:10]:
+            failures.append(f"{db_path}: missing {row}")
+        for row in sorted(extra, key=str)[:10]:
+            failures.append(f"{db_path}: unexpected {row}")
+
+    print(f"{os.path.basename(db_path)}: {len(reference_rows)} entries, "
+          f"row-by-row {reference_seconds * 1000:.1f} ms, engine {engine_seconds * 1000:.1f} ms")
+    return failures
+
+
+def print_unified_engine_check(path: str):
+    """Run check_unified_engine on a database, or on every database in a directory"""
+    db_paths = sorted(glob.glob(os.path.join(path, '*.db'))) if os.path.isdir(path) else [path]
+    failures = []
+    for db_path in db_paths:
+        failures.extend(check_unified_engine(db_path))
+
+    if failures:
+        print("Unified engine differs from the row-by-row reference:")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+
+    print(f"Unified engine matches the reference on {len(db_paths)} database(s).")
+
+
+def check_per_engine(seed: int = 0, random_cases: int = 20000) -> List[str]:
+    """
+    Equivalence check of PEREngine against the scalar PER functions
+
+    Runs an exhaustive grid (every PE from -5 to 200, Tamaño Estándar values on
+    and between every table boundary) plus random cases through both the
+    engine and the scalar rules, and compares value and type.
+
+    Returns:
+        List of mismatch messages (empty when the engines agree)
+    """
+    from app import RECOPSimulator
+    import random
+
+    engine = PEREngine()
+    scalar_3_4 = DatabaseManager.calculate_per_from_table
+    failures = []
+    rng = random.Random(seed)
+
+    # Levels 1-2: (tipo_horario, inscritos)
+    tipos = ['Magistral', 'TEORICA', 'Laboratorio', 'TALLER Y PBL', 'Tesis', '', None]
+    cases = [(tipo, pe) for tipo in tipos for pe in range(-5, 201)]
+    cases += [(rng.choice(tipos), rng.randint(-10, 400)) for _ in range(random_cases)]
+    computed = engine.per_levels_1_2([tipo for tipo, _ in cases], [pe for _, pe in cases])
+    for (tipo, pe), value in zip(cases, computed):
+        expected = RECOPSimulator.calculate_per_formula(None, tipo, pe)
+        if value != expected or type(value) is not type(expected):
+            failures.append(f"levels 1-2 {tipo!r}, {pe}: {value!r} != {expected!r}")
+
+    # Levels 3-4: (course_type, tamano_estandar, pe)
+    boundaries = [0, 5, 9.99, 10, 10.5, 15, 19, 19.5, 20, 20.5, 21, 25.75, 29, 29.5, 30, 45]
+    course_types = ['TEORICO', 'PRACTICO', '']
+    cases = [(course, te, pe) for course in course_types for te in boundaries for pe in range(-5, 201)]
+    cases += [
+        (rng.choice(course_types), round(rng.uniform(0, 40), rng.choice([0, 2])), rng.randint(-10, 400))
+        for _ in range(random_cases)
+    ]
+    computed = engine.per_levels_3_4(*zip(*cases)).tolist()
+    for (course, te, pe), value in zip(cases, computed):
+        expected = scalar_3_4(None, course, te, pe)
+        if value != expected:
+            failures.append(f"levels 3-4 {course!r}, {te}, {pe}: {value!r} != {expected!r}")
+
+    return failures
+
+
+def print_per_engine_check(db_path: str):
+    """Check PEREngine against the scalar rules, then time a full recomputation on a database copy"""
+    failures = check_per_engine()
+    if failures:
+        print(f"PEREngine differs from the scalar rules in {len(failures)} cases:")
+        for failure in failures[:20]:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("PEREngine matches the scalar PER rules.")
+
+    from app import RECOPSimulator
+
+    temp_dir = tempfile.mkdtemp(prefix='recop_per_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        sessions = db_manager.execute_query(
+            """SELECT ses.tipoHorario, sec.inscritos
+               FROM Sesion ses
+               JOIN Seccion sec ON ses.seccion_NRC = sec.NRC"""
+        )
+        tipos = [row[0] if row[0] else 'No especificado' for row in sessions]
+        inscritos = [row[1] if row[1] else 0 for row in sessions]
+
+        start = time.perf_counter()
+        scalar = [RECOPSimulator.calculate_per_formula(None, tipo, pe) for tipo, pe in zip(tipos, inscritos)]
+        scalar_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        engine = db_manager.per_engine.per_levels_1_2(tipos, inscritos)
+        engine_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            levels_3_4 = db_manager.calculate_per_for_levels_3_4_with_tamano_estandar()
+        levels_3_4_seconds = time.perf_counter() - start
+
+        ids = [row[0] for row in db_manager.execute_query("SELECT id FROM Sesion")]
+        start = time.perf_counter()
+        db_manager.bulk_update_per_values([{'sesion_id': i, 'new_per': 1} for i in ids])
+        write_seconds = time.perf_counter() - start
+
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    print(f"{len(sessions)} sessions: scalar {scalar_seconds * 1000:.1f} ms, "
+          f"PEREngine {engine_seconds * 1000:.1f} ms (same results: {scalar == engine})")
+    print(f"Levels 3-4 PER proposal: {levels_3_4_seconds * 1000:.1f} ms, "
+          f"{len(levels_3_4['updates'])} updates")
+    print(f"Write-back of {len(ids)} PER values: {write_seconds * 1000:.1f} ms")
+
+
+PERSONAL_DATA_FILES = [
+    os.path.join('..', 'Archivos Externos', 'Data_personal.csv'),
+    os.path.join('..', 'Archivos Externos', 'Data_personal_abril.csv'),
+]
+
+
+def _load_personal_data(file_path: str):
+    """Read a personal data export, accepting 'Facultad / Unidad' style headers"""
+    import pandas as pd
+
+    df = pd.read_csv(file_path)
+    df.columns = [re.sub(r'\s*/\s*|\s+', '_', str(column).strip()) for column in df.columns]
+    return df
+
+
+def benchmark_name_matching(csv_file_path: str, db_path: str) -> Dict:
+    """
+    Compare the indexed personal data matcher with the brute-force scan
+
+    Recall is the share of brute-force matches that the indexed matcher
+    reproduces exactly (same professor, same record, same score).
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_match_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        processor = PersonalDataProcessor(db_manager)
+        df = _load_personal_data(csv_file_path)
+
+        timings = {}
+        results = {}
+        for label, brute_force in (('brute_force', True), ('indexed', False)):
+            start = time.perf_counter()
+            matches = processor.find_matching_professors(df, brute_force=brute_force, use_crosswalk=False)
+            timings[label] = time.perf_counter() - start
+            results[label] = {
+                match['existing_professor']['id']: (
+                    match['personal_data']['person_id'],
+                    match['personal_data']['full_name_standardized'],
+                    match['match_confidence']
+                )
+                for match in matches
+            }
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    reference = results['brute_force']
+    indexed = results['indexed']
+    recovered = [prof_id for prof_id, match in reference.items() if indexed.get(prof_id) == match]
+    automatic = [prof_id for prof_id, match in reference.items() if match[2] >= 0.95]
+    automatic_recovered = [prof_id for prof_id in automatic if indexed.get(prof_id) == reference[prof_id]]
+
+    return {
+        'brute_force_seconds': timings['brute_force'],
+        'indexed_seconds': timings['indexed'],
+        'matches': len(reference),
+        'recall': len(recovered) / len(reference) if reference else 1.0,
+        'automatic_matches': len(automatic),
+        'automatic_recall': len(automatic_recovered) / len(automatic) if automatic else 1.0,
+        'missed': [(prof_id, reference[prof_id], indexed.get(prof_id))
+                   for prof_id in reference if prof_id not in recovered],
+    }
+
+
+def print_name_matching_benchmark(db_path: str):
+    """Benchmark the personal data matcher on every bundled personal data file"""
+    for csv_file_path in PERSONAL_DATA_FILES:
+        result = benchmark_name_matching(csv_file_path, db_path)
+        print(os.path.basename(csv_file_path))
+        print(f"  brute force: {result['brute_force_seconds']:.2f} s, "
+              f"indexed: {result['indexed_seconds']:.2f} s")
+        print(f"  recall: {result['recall']:.1%} of {result['matches']} matches, "
+              f"{result['automatic_recall']:.1%} of {result['automatic_matches']} automatic (>= 0.95)")
+        for prof_id, reference, indexed in result['missed'][:5]:
+            print(f"    professor {prof_id}: {reference} -> {indexed}")
+
+
+def benchmark_crosswalk_refresh(db_path: str) -> Dict:
+    """
+    Monthly refresh with the person_id crosswalk: link the first personal
+    data file from scratch, apply its automatic matches, then time loading
+    the next file with and without the crosswalk
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_crosswalk_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        db_manager.execute_query("DELETE FROM PersonalDataCrosswalk")
+        processor = PersonalDataProcessor(db_manager)
+        first_file, next_file = PERSONAL_DATA_FILES
+
+        start = time.perf_counter()
+        first_matches = processor.find_matching_professors(
+            _load_personal_data(first_file), source_file=os.path.basename(first_file)
+        )
+        first_seconds = time.perf_counter() - start
+        automatic = [match for match in first_matches if match['match_type'] == 'automatic']
+        processor.apply_approved_matches(automatic)
+
+        df = _load_personal_data(next_file)
+        timings = {}
+        results = {}
+        for label, use_crosswalk in (('full', False), ('crosswalk', True)):
+            start = time.perf_counter()
+            results[label] = processor.find_matching_professors(
+                df, use_crosswalk=use_crosswalk, source_file=os.path.basename(next_file)
+            )
+            timings[label] = time.perf_counter() - start
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    full = {match['existing_professor']['id']: match['personal_data']['person_id'] for match in results['full']}
+    incremental = {match['existing_professor']['id']: match['personal_data']['person_id']
+                   for match in results['crosswalk']}
+    return {
+        'first_seconds': first_seconds,
+        'linked': len(automatic),
+        'full_seconds': timings['full'],
+        'crosswalk_seconds': timings['crosswalk'],
+        'resolved': sum(1 for match in results['crosswalk'] if match['match_source'] == 'crosswalk'),
+        'matches': len(incremental),
+        'same_person': sum(1 for prof_id, person_id in incremental.items() if full.get(prof_id) == person_id),
+    }
+
+
+def print_crosswalk_benchmark(db_path: str):
+    """Benchmark the incremental personal data refresh"""
+    result = benchmark_crosswalk_refresh(db_path)
+    print(f"First file: {result['first_seconds']:.2f} s, {result['linked']} automatic links saved")
+    print(f"Next file: full re-match {result['full_seconds']:.2f} s, "
+          f"with crosswalk {result['crosswalk_seconds']:.2f} s "
+          f"({result['resolved']} of {result['matches']} matches resolved without fuzzy matching)")
+    print(f"  {result['same_person']} of {result['matches']} matches agree with the full re-match")
+
+
+def _write_dedication_file(db_manager: DatabaseManager, file_path: str, seed: int = 0) -> int:
+    """
+    Write a full-faculty dedication file: one row per SeccionProfesor
+    assignment, with some misspelled names, unknown NRCs and unknown people
+    """
+    import pandas as pd
+
+    rng = random.Random(seed)
+    rows = []
+    assignments = db_manager.execute_query(
+        """SELECT sp.seccion_NRC, p.apellidos || ' ' || p.nombres
+           FROM SeccionProfesor sp JOIN Profesor p ON p.id = sp.profesor_id
+           ORDER BY sp.seccion_NRC, p.id"""
+    )
+    for nrc, name in assignments:
+        letters = list(name)
+        if rng.random() < 0.3 and len(letters) > 4:
+            del letters[rng.randrange(len(letters))]
+        roll = rng.random()
+        rows.append((
+            nrc if roll < 0.9 else 999999,
+            ''.join(letters) if roll < 0.95 else 'PEREZ JUAN',
+            rng.choice([25, 50, 100]),
+            '202510'
+        ))
+
+    pd.DataFrame(rows, columns=['seccion', 'profesor', 'dedicacion', 'periodo']).to_csv(file_path, index=False)
+    return len(rows)
+
+
+def benchmark_dedication_pipeline(db_path: str) -> Dict:
+    """Time and count the statements of processing and applying a full-faculty dedication file"""
+    from dedication_data_processor import DedicationDataProcessor
+
+    temp_dir = tempfile.mkdtemp(prefix='recop_dedication_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        csv_path = os.path.join(temp_dir, 'dedicaciones.csv')
+        rows = _write_dedication_file(db_manager, csv_path)
+        processor = DedicationDataProcessor(db_manager)
+        db_manager.professor_directory.invalidate()
+
+        statements = []
+        conn = db_manager.get_connection()
+        # Only the read-only processing step is traced: SQLite re-traces
+        # writes once per row when FOR EACH ROW triggers fire
+        conn.set_trace_callback(statements.append)
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                result = processor.process_dedication_csv(csv_path)
+                process_seconds = time.perf_counter() - start
+        finally:
+            conn.set_trace_callback(None)
+            conn.close()
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            applied = processor.apply_dedication_matches(result['matches'])
+            apply_seconds = time.perf_counter() - start
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    return {
+        'rows': rows,
+        'process_seconds': process_seconds,
+        'process_statements': len(statements),
+        'apply_seconds': apply_seconds,
+        'professor_matches': result['statistics']['professor_matches'],
+        'updated_sections': applied['updated'],
+    }
+
+
+def print_dedication_benchmark(db_path: str):
+    """Benchmark the dedication pipeline on a generated full-faculty file"""
+    result = benchmark_dedication_pipeline(db_path)
+    print(f"{result['rows']} dedication rows, {result['professor_matches']} professors matched")
+    print(f"  process: {result['process_seconds']:.2f} s, {result['process_statements']} statements")
+    print(f"  apply: {result['apply_seconds']:.2f} s, {result['updated_sections']} sections updated "
+          f"in one transaction")
+
+
+def benchmark_raw_dedication_export(raw_file_path: str) -> Dict:
+    """
+    Compare the old two-step ingestion (parse the raw export, write the
+    intermediate CSV, read it again) with streaming records from the export
+    """
+    import csv
+    import pandas as pd
+    from dedication_data_processor import DedicationDataProcessor
+
+    processor = DedicationDataProcessor(None)
+    temp_dir = tempfile.mkdtemp(prefix='recop_raw_')
+    try:
+        intermediate_path = os.path.join(temp_dir, 'dedicaciones.csv')
+
+        start = time.perf_counter()
+        with open(intermediate_path, 'w', newline='', encoding='utf-8') as file:
+            writer = csv.DictWriter(file, fieldnames=['seccion', 'profesor', 'dedicacion', 'periodo'])
+            writer.writeheader()
+            writer.writerows(processor.iter_raw_dedication_export(raw_file_path))
+        two_step = processor.load_dedication_csv(intermediate_path).to_dict('records')
+        two_step_seconds = time.perf_counter() - start
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    start = time.perf_counter()
+    streamed = list(processor.iter_raw_dedication_export(raw_file_path))
+    streaming_seconds = time.perf_counter() - start
+
+    def key(record):
+        return (int(record['seccion']), record['profesor'], float(record['dedicacion']), str(record['periodo']))
+
+    return {
+        'records': len(streamed),
+        'two_step_seconds': two_step_seconds,
+        'streaming_seconds': streaming_seconds,
+        'same_records': [key(r) for r in two_step] == [key(r) for r in streamed],
+    }
+
+
+def print_raw_dedication_benchmark(raw_file_path: str):
+    """Benchmark streaming the raw dedication export"""
+    result = benchmark_raw_dedication_export(raw_file_path)
+    print(f"{result['records']} dedication records")
+    print(f"  intermediate CSV: {result['two_step_seconds'] * 1000:.1f} ms, "
+          f"streaming: {result['streaming_seconds'] * 1000:.1f} ms (same records: {result['same_records']})")
+
+
+def benchmark_name_scoring(db_path: str, workers: int = 2) -> Dict:
+    """
+    Score every professor against every personal data name serially and on
+    a process pool of the given size, checking that both give the same scores
+    """
+    temp_dir = tempfile.mkdtemp(prefix='recop_scoring_')
+    try:
+        db_manager = DatabaseManager(_copy_database(db_path, temp_dir))
+        professors = [prof['full_name'] for prof in db_manager.get_all_profesores()]
+        db_manager.close()
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+    processor = PersonalDataProcessor(None)
+    names = []
+    for value in _load_personal_data(PERSONAL_DATA_FILES[0])['Apellido_y_Nombre']:
+        nombres, apellidos = processor.standardize_name_from_personal_data(value)
+        names.append(processor.create_full_name_standardized(nombres, apellidos))
+
+    timings = {}
+    scores = {}
+    backends = (
+        ('serial', NameScoringBackend(max_workers=1)),
+        ('parallel', NameScoringBackend(max_workers=workers, min_parallel_pairs=0)),
+    )
+    for label, backend in backends:
+        progress = []
+        start = time.perf_counter()
+        scores[label] = backend.score(professors, names,
+                                      progress_callback=lambda done, total: progress.append(done))
+        timings[label] = time.perf_counter() - start
+        timings[f'{label}_progress_updates'] = len(progress)
+
+    return {
+        'pairs': len(professors) * len(names),
+        'workers': workers,
+        'serial_seconds': timings['serial'],
+        'parallel_seconds': timings['parallel'],
+        'progress_updates': timings['parallel_progress_updates'],
+        'same_scores': scores['serial'] == scores['parallel'],
+    }
+
+
+def print_name_scoring_benchmark(db_path: str):
+    """Benchmark serial vs process-pool name scoring"""
+    result = benchmark_name_scoring(db_path, workers=max(os.cpu_count() or 1, 2))
+    print(f"{result['pairs']} name pairs, {os.cpu_count()} CPUs")
+    print(f"  serial: {result['serial_seconds']:.2f} s, "
+          f"{result['workers']} workers: {result['parallel_seconds']:.2f} s "
+          f"({result['progress_updates']} progress updates)")
+    print(f"  same scores: {result['same_scores']}")
+    if not result['same_scores']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    commands = {
+        'import': print_import_benchmark,
+        'plans': print_query_plan_check,
+        'unified': print_unified_engine_check,
+        'per': print_per_engine_check,
+        'match': print_name_matching_benchmark,
+        'scoring': print_name_scoring_benchmark,
+        'crosswalk': print_crosswalk_benchmark,
+        'dedication': print_dedication_benchmark,
+        'raw': print_raw_dedication_benchmark,
+        'delta': print_delta_import_benchmark,
+        'stream': print_streaming_reader_benchmark,
+        'xlsx': print_xlsx_cache_benchmark,
+        'scroll': print_table_scrolling_benchmark,
+        'keyset': print_keyset_benchmark,
+        'search': print_search_benchmark,
+        'typeahead': print_search_as_you_type_benchmark,
+    }
+    if len(sys.argv) < 3 or sys.argv[1] not in commands:
+        print(__doc__)
+        sys.exit(1)
+
+    commands[sys.argv[1]](sys.argv[2])
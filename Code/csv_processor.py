@@ -1,17 +1,32 @@
 import pandas as pd
+import numpy as np
 import tkinter as tk
 from tkinter import ttk, messagebox
 from ui_components import get_theme_colors, apply_dark_mode_to_dialog
+import os
 import re
 import json
-from typing import List, Dict, Tuple, Optional
+from collections import Counter
+from typing import Iterator, List, Dict, Tuple, Optional
 from database import DatabaseManager
+from name_matching import split_three_part_name
+from spreadsheet_reader import SpreadsheetReader, is_spreadsheet
 from utils import DataFormatter
 
 class CSVProcessor:
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, interactive_disambiguation: bool = False):
         self.db_manager = db_manager
         self.disambiguation_cache = {} 
+        # Ask for ambiguous three-part names during the import instead of
+        # splitting them with the default rule and queuing them for review
+        self.interactive_disambiguation = interactive_disambiguation
+        self.pending_name_reviews = []
+        # (full_name, choice, source) resolved in this import, added to the
+        # name-split knowledge base once the import succeeds
+        self.learned_name_splits = []
+        # Parsed XLSX carteleras are cached, so preview, validation and import
+        # of one workbook parse it once
+        self.sheet_reader = SpreadsheetReader()
         
     def is_row_empty(self, row) -> bool:
         """Check if a row is essentially empty (all NaN or empty values)"""
@@ -80,7 +95,10 @@ class CSVProcessor:
 
     def resolve_three_part_ambiguity_interactive(self, name_parts: List[str]) -> Tuple[str, str]:
         """
-        Resolve three-part name ambiguity using automatic heuristics first, then user input
+        Resolve three-part name ambiguity with the name-split knowledge base
+        and automatic heuristics first. Names they can't resolve are asked to
+        the user in interactive mode; otherwise they get the default split (one
+        nombre + two apellidos) and are queued for batch review after the import.
         
         Args:
             name_parts: List of exactly 3 name parts
@@ -88,16 +106,17 @@ class CSVProcessor:
         Returns:
             Tuple of (nombres, apellidos)
         """
-        part1, part2, part3 = name_parts
         full_name = ' '.join(name_parts)
         
-        # Check cache first to avoid asking the same question multiple times
+        # Check cache first to avoid resolving the same name multiple times
         if full_name in self.disambiguation_cache:
-            choice = self.disambiguation_cache[full_name]
-            if choice == 1:
-                return f"{part1} {part2}", part3
-            else:
-                return part1, f"{part2} {part3}"
+            return split_three_part_name(name_parts, self.disambiguation_cache[full_name])
+        
+        # Names resolved by earlier imports or reviews
+        choice = self.db_manager.name_split_knowledge.known_choice(full_name)
+        if choice is not None:
+            self.disambiguation_cache[full_name] = choice
+            return split_three_part_name(name_parts, choice)
         
         # Try automatic heuristics first
         auto_result = self.try_automatic_disambiguation(name_parts)
@@ -106,18 +125,18 @@ class CSVProcessor:
             # Cache the automatic decision
             choice = 1 if ' ' in nombres else 2
             self.disambiguation_cache[full_name] = choice
+            self.learned_name_splits.append((full_name, choice, 'heuristic'))
             return nombres, apellidos
         
-        # If automatic methods don't give a confident result, ask user
-        choice = self.ask_user_for_name_split(name_parts)
+        if self.interactive_disambiguation:
+            choice = self.ask_user_for_name_split(name_parts)
+            self.learned_name_splits.append((full_name, choice, 'user'))
+        else:
+            choice = 2
+            self.pending_name_reviews.append(full_name)
         
-        # Cache the user's decision
         self.disambiguation_cache[full_name] = choice
-        
-        if choice == 1:  # Two nombres + one apellido
-            return f"{part1} {part2}", part3
-        else:  # One nombre + two apellidos
-            return part1, f"{part2} {part3}"
+        return split_three_part_name(name_parts, choice)
 
     def try_automatic_disambiguation(self, name_parts: List[str]) -> Optional[Tuple[str, str]]:
         """
@@ -128,23 +147,11 @@ class CSVProcessor:
         """
         part1, part2, part3 = name_parts
         
-        # Heuristic 1: Common compound first names (high confidence)
-        compound_first_names = {
-            'ANA MARIA', 'MARIA ELENA', 'JOSE LUIS', 'JUAN CARLOS', 'LUIS FERNANDO',
-            'MARIA FERNANDA', 'ANA LUCIA', 'CARLOS ANDRES', 'JUAN PABLO', 'MARIA JOSE',
-            'LUIS MIGUEL', 'JOSE ANTONIO', 'MARIA CRISTINA', 'ANA SOFIA', 'DIEGO ALEJANDRO',
-            'SANDRA PATRICIA', 'CLAUDIA PATRICIA', 'MARTHA LUCIA', 'GLORIA ELENA'
-        }
-        
-        potential_compound = f"{part1} {part2}".upper()
-        if potential_compound in compound_first_names:
-            return f"{part1} {part2}", part3
-        
-        # Heuristic 2: Surname particles/connectors (high confidence)
-        surname_particles = {'DE', 'DEL', 'LA', 'LAS', 'LOS', 'VAN', 'VON', 'MC', 'MAC', 'D'}
-        
-        if part2.upper() in surname_particles:
-            return part1, f"{part2} {part3}"
+        # Heuristics 1 and 2: known compound first names and surname
+        # particles/connectors from the knowledge base (high confidence)
+        choice = self.db_manager.name_split_knowledge.resolve(name_parts)
+        if choice is not None:
+            return split_three_part_name(name_parts, choice)
         
         # Heuristic 3: Very short third part likely indicates compound first name
         if len(part3) <= 3 and len(part2) > 4:
@@ -215,16 +222,213 @@ class CSVProcessor:
         except ValueError:
             return None
 
-    def process_csv_file(self, csv_file_path: str, progress_callback=None) -> Dict:
+    # ==================== VECTORIZED COLUMN HELPERS ====================
+    
+    DAY_COLUMNS = ['Lunes', 'Martes', 'Miercoles', 'Jueves', 'Viernes', 'Sábado', 'Domingo']
+    DAY_ABBREVIATIONS = ['L', 'M', 'I', 'J', 'V', 'S', 'D']
+    
+    def strip_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """safe_strip over a whole column ('' for missing values or a missing column)"""
+        if column not in df.columns:
+            return pd.Series('', index=df.index, dtype=object)
+        
+        values = df[column].astype(object)
+        return values.where(values.notna(), '').astype(str).str.strip().astype(object)
+    
+    def int_column(self, df: pd.DataFrame, column: str, default: int = 0) -> pd.Series:
+        """safe_int_convert over a whole column"""
+        if column not in df.columns:
+            return pd.Series(default, index=df.index, dtype='int64')
+        
+        numeric = pd.to_numeric(df[column], errors='coerce')
+        numeric = numeric.where(np.isfinite(numeric))
+        return np.trunc(numeric).fillna(default).astype('int64')
+    
+    def format_time_column(self, df: pd.DataFrame, column: str) -> pd.Series:
+        """format_time over a whole column: HHMM numbers to 'HH:MM' (None if missing)"""
+        if column not in df.columns:
+            return pd.Series(None, index=df.index, dtype=object)
+        
+        numeric = pd.to_numeric(df[column], errors='coerce')
+        numeric = numeric.where(np.isfinite(numeric))
+        digits = np.trunc(numeric).astype('Int64').astype(str).str.zfill(4)
+        formatted = digits.str[:2] + ':' + digits.str[2:]
+        return formatted.astype(object).where(numeric.notna(), None)
+    
+    def duration_column(self, hora_inicio: pd.Series, hora_fin: pd.Series) -> pd.Series:
+        """calculate_duration over two 'HH:MM' columns (NaN if either is missing)"""
+        def minutes(times):
+            parts = times.str.split(':', n=1, expand=True).reindex(columns=[0, 1])
+            return pd.to_numeric(parts[0], errors='coerce') * 60 + pd.to_numeric(parts[1], errors='coerce')
+        
+        # Add 10 minutes break and convert to hours
+        return (minutes(hora_fin) - minutes(hora_inicio) + 10) / 60
+    
+    def days_bitmask_column(self, df: pd.DataFrame) -> pd.Series:
+        """Bitmask of session days (bit 0 = Lunes ... bit 6 = Domingo)"""
+        bitmask = pd.Series(0, index=df.index, dtype='int64')
+        for bit, day_column in enumerate(self.DAY_COLUMNS):
+            if day_column in df.columns:
+                present = self.strip_column(df, day_column) != ''
+                bitmask += present.astype('int64') * (1 << bit)
+        return bitmask
+    
+    def days_string_column(self, df: pd.DataFrame) -> pd.Series:
+        """get_days_string over a whole frame, via a lookup of all 128 bitmasks"""
+        lookup = {
+            bitmask: ','.join(
+                abbrev for bit, abbrev in enumerate(self.DAY_ABBREVIATIONS) if bitmask & (1 << bit)
+            )
+            for bitmask in range(1 << len(self.DAY_ABBREVIATIONS))
+        }
+        return self.days_bitmask_column(df).map(lookup)
+    
+    def semanas_column(self, df: pd.DataFrame) -> pd.Series:
+        """calculate_semanas_from_parte_pdo over a whole column"""
+        parte_pdo = self.strip_column(df, 'Parte pdo').str.upper()
+        return pd.Series(np.where(parte_pdo.isin(['8A', '8B']), 8, 16), index=df.index)
+
+    # ==================== STREAMING READER ====================
+    
+    # Columns the import consumes; everything else in the export is never parsed
+    CARTELERA_COLUMNS = [
+        'Periodo', 'Campus', 'NRC', 'Facultad ', 'Departamento', 'Parte pdo', 'Lista cruzada',
+        'Materia', 'Secc', 'Nivel materia', 'Modo calificación', 'Créditos', 'Nombre largo curso',
+        'Cupo', 'Inscritos', 'Profesor(es)', 'Tipo horario (franja)', 'Hora inicio', 'Hora fin',
+        'Edificio', 'Salón', 'Descripción atributo salón',
+    ] + DAY_COLUMNS
+    REQUIRED_COLUMNS = [
+        'NRC', 'Materia', 'Departamento', 'Profesor(es)',
+        'Nombre largo curso', 'Créditos', 'Secc', 'Cupo'
+    ]
+    CRITICAL_FIELDS = ['NRC', 'Materia', 'Departamento']
+    READ_CHUNK_ROWS = 5000
+    
+    def read_cartelera_header(self, csv_file_path: str) -> List[str]:
+        """Column names of a cartelera CSV (reads the header line only) or XLSX"""
+        if is_spreadsheet(csv_file_path):
+            return self.sheet_reader.read_header(csv_file_path, self.CARTELERA_COLUMNS)
+        return pd.read_csv(csv_file_path, nrows=0).columns.tolist()
+    
+    def read_cartelera_chunks(self, csv_file_path: str, columns: List[str] = None,
+                              chunk_rows: int = None, count_callback=None) -> Iterator[pd.DataFrame]:
+        """
+        Stream a cartelera CSV in chunks, parsing only the given columns
+        
+        Every column is read as text (the column helpers convert numbers with
+        errors coerced), so the types can't change from one chunk to the next.
+        An XLSX cartelera is parsed once (see SpreadsheetReader) and sliced.
+        
+        Args:
+            csv_file_path: Path to the CSV or XLSX file
+            columns: Columns to read (default: CARTELERA_COLUMNS); absent ones are skipped
+            chunk_rows: Rows per chunk (default: READ_CHUNK_ROWS)
+            count_callback: Optional callable receiving (bytes read, file size)
+                   after each chunk (rows for an XLSX)
+            
+        Yields:
+            DataFrames indexed by row position in the file
+        """
+        wanted = set(columns or self.CARTELERA_COLUMNS)
+        chunk_rows = chunk_rows or self.READ_CHUNK_ROWS
+        if is_spreadsheet(csv_file_path):
+            sheet = self.sheet_reader.read_sheet(csv_file_path, self.CARTELERA_COLUMNS)
+            sheet = sheet[[column for column in sheet.columns if column in wanted]]
+            for start in range(0, len(sheet), chunk_rows):
+                yield sheet.iloc[start:start + chunk_rows]
+                if count_callback:
+                    count_callback(min(start + chunk_rows, len(sheet)), len(sheet))
+            return
+        
+        file_size = os.path.getsize(csv_file_path)
+        with open(csv_file_path, 'rb') as handle, \
+                pd.read_csv(handle, usecols=lambda column: column in wanted,
+                            dtype={column: str for column in wanted},
+                            chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                yield chunk
+                if count_callback:
+                    count_callback(handle.tell(), file_size)
+    
+    def new_cartelera_scan(self, columns: List[str]) -> Dict:
+        """Validation counters for scan_cartelera_chunk, starting from the header"""
+        missing_columns = [column for column in self.REQUIRED_COLUMNS if column not in columns]
+        return {
+            'columns': columns,
+            'missing_columns': missing_columns,
+            'row_count': 0,
+            'empty_counts': dict.fromkeys((f for f in self.CRITICAL_FIELDS if f in columns), 0),
+            'nrc_counts': Counter(),
+            'preview': []
+        }
+    
+    def scan_cartelera_chunk(self, scan: Dict, chunk: pd.DataFrame, preview_rows: int = 5):
+        """Add one chunk to the validation counters and keep the first rows as preview"""
+        scan['row_count'] += len(chunk)
+        for field in scan['empty_counts']:
+            scan['empty_counts'][field] += int(chunk[field].isna().sum())
+        if 'NRC' in chunk.columns:
+            scan['nrc_counts'].update(chunk['NRC'].dropna().tolist())
+        if len(scan['preview']) < preview_rows:
+            head = chunk.head(preview_rows - len(scan['preview']))
+            scan['preview'].extend(head.astype(object).where(head.notna(), None).values.tolist())
+    
+    def finish_cartelera_scan(self, scan: Dict) -> Dict:
+        """Validation result (same shape as validate_csv_file) from the scan counters"""
+        result = {
+            'valid': False,
+            'errors': [],
+            'warnings': [],
+            'row_count': scan['row_count'],
+            'required_columns': []
+        }
+        
+        if scan['missing_columns']:
+            result['errors'].append(f"Faltan columnas requeridas: {', '.join(scan['missing_columns'])}")
+        else:
+            result['valid'] = True
+            result['required_columns'] = self.REQUIRED_COLUMNS
+        
+        for field, empty_count in scan['empty_counts'].items():
+            if empty_count > 0:
+                result['warnings'].append(f"Campo '{field}' tiene {empty_count} valores vacíos")
+        
+        duplicates = sum(1 for count in scan['nrc_counts'].values() if count > 1)
+        if duplicates > 0:
+            result['warnings'].append(f"Se encontraron {duplicates} NRCs duplicados")
+        
+        return result
+    
+    def process_csv_file(self, csv_file_path: str, progress_callback=None,
+                         bulk: bool = True, chunk_size: int = 500, delta: bool = False,
+                         validation_callback=None, count_callback=None) -> Dict:
         """
         Main function to process CSV file and upload to database
         
+        The file is read once, in chunks of READ_CHUNK_ROWS rows and only the
+        consumed columns; each chunk is validated, previewed and normalised
+        before the next one is read, and nothing is written until the whole
+        file has been read.
+        
         Args:
             csv_file_path: Path to the CSV file
             progress_callback: Optional callback function to report progress
+            bulk: Load the whole file in a single transaction with batched
+                  inserts; any error rolls the complete load back.
+                  If False, rows are committed one by one (legacy mode)
+            chunk_size: Rows buffered per executemany flush in bulk mode
+            delta: Apply only what changed since the last imported cartelera
+                   (inserts, updates and deletes of sections, sessions and
+                   their professors); existing dedicaciones and PER are kept
+            validation_callback: Optional callback receiving the validation
+                   result (see validate_csv_file) once the file is read; the
+                   import is cancelled, without writing, if it returns False
+            count_callback: Optional callable receiving (done, total) while the
+                   file is read and again while the sessions are inserted
             
         Returns:
-            Dictionary with processing results and statistics
+            Dictionary with processing results and statistics, the
+            validation result and a preview of the first rows
         """
         
         # Initialize result dictionary
@@ -233,57 +437,81 @@ class CSVProcessor:
             'processed_rows': 0,
             'skipped_rows': 0,
             'error_message': None,
+            'pending_name_reviews': 0,
+            'changes': None,
+            'validation': None,
+            'preview': None,
+            'cancelled': False,
             'statistics': {}
         }
         
         try:
-            # Read CSV file and drop completely empty rows
+            self.pending_name_reviews = []
+            self.learned_name_splits = []
+            
             if progress_callback:
                 progress_callback("Leyendo archivo CSV...")
             
-            df = pd.read_csv(csv_file_path)
-            df = df.dropna(how='all')  # Remove rows where all values are NaN
+            scan = self.new_cartelera_scan(self.read_cartelera_header(csv_file_path))
+            if scan['missing_columns']:
+                result['validation'] = self.finish_cartelera_scan(scan)
+                result['error_message'] = result['validation']['errors'][0]
+                return result
             
-            if progress_callback:
-                progress_callback(f"Archivo cargado: {len(df)} filas encontradas")
-            
-            # Initialize tracking variables
-            inserted_departamentos = set()
-            inserted_profesores = {}  # Key: (nombres, apellidos, departamento), Value: id
-            inserted_materias = set()
-            inserted_secciones = set()
-            seccion_professors = {}  # Key: NRC, Value: set of professor_ids
-            
-            processed_rows = 0
-            skipped_rows = 0
-            
-            # Process each row
-            for index, row in df.iterrows():
-                if progress_callback and index % 100 == 0:
-                    progress_callback(f"Procesando fila {index + 1}/{len(df)}")
+            # One pass over the file: validate, preview and normalise each
+            # chunk (drop completely empty rows); the legacy mode keeps the raw rows
+            parts = []
+            row_count = 0
+            for chunk in self.read_cartelera_chunks(csv_file_path, count_callback=count_callback):
+                self.scan_cartelera_chunk(scan, chunk)
+                chunk = chunk.dropna(how='all')
+                row_count += len(chunk)
+                parts.append(chunk if not (bulk or delta) else self.prepare_cartelera_frame(chunk))
                 
-                # Check if row is empty
-                if self.is_row_empty(row):
-                    print(f"Skipping empty row {index + 1}")
-                    skipped_rows += 1
-                    continue
-                
-                processed_rows += 1
-                
-                # Process this row
-                success = self._process_single_row(
-                    row, index + 1,
-                    inserted_departamentos, inserted_profesores, 
-                    inserted_materias, inserted_secciones, seccion_professors
+                if progress_callback:
+                    progress_callback(f"Leyendo archivo CSV... {scan['row_count']} filas")
+            
+            result['validation'] = self.finish_cartelera_scan(scan)
+            result['preview'] = {
+                'columns': [column for column in scan['columns'] if column in self.CARTELERA_COLUMNS],
+                'data': scan['preview']
+            }
+            
+            if validation_callback and not validation_callback(result['validation']):
+                result['cancelled'] = True
+                result['error_message'] = "Import cancelled"
+                return result
+            
+            if progress_callback:
+                progress_callback(f"Archivo cargado: {row_count} filas encontradas")
+            
+            changes = None
+            if delta:
+                processed_rows, skipped_rows, changes = self._process_rows_delta(
+                    self._concat_frames(parts), row_count, progress_callback
                 )
-                
-                if not success:
-                    skipped_rows += 1
-                    processed_rows -= 1
+            elif bulk:
+                processed_rows, skipped_rows = self._process_rows_bulk(
+                    self._concat_frames(parts), row_count, progress_callback, chunk_size, count_callback
+                )
+            else:
+                processed_rows, skipped_rows = self._process_rows_legacy(
+                    self._concat_frames(parts), progress_callback, count_callback
+                )
+            
+            # Ambiguous names got the default split; queue them for batch review
+            if self.pending_name_reviews:
+                self.db_manager.queue_name_reviews(self.pending_name_reviews)
+            
+            # Remember the resolved names so later imports look them up
+            self.db_manager.learn_name_splits(self.learned_name_splits)
             
             if progress_callback:
                 progress_callback("Generando estadísticas...")
             
+            # Refresh planner statistics for the new data
+            self.db_manager.analyze()
+            
             # Get final statistics
             stats = self.db_manager.get_database_stats()
             
@@ -291,6 +519,8 @@ class CSVProcessor:
                 'success': True,
                 'processed_rows': processed_rows,
                 'skipped_rows': skipped_rows,
+                'pending_name_reviews': len(self.pending_name_reviews),
+                'changes': changes,
                 'statistics': stats
             })
             
@@ -303,6 +533,517 @@ class CSVProcessor:
             result['error_message'] = str(e)
             return result
     
+    def _concat_frames(self, parts: List[pd.DataFrame]) -> pd.DataFrame:
+        """Join the per-chunk frames of one file (keeps the file row index)"""
+        if len(parts) == 1:
+            return parts[0]
+        return pd.concat(parts) if parts else pd.DataFrame()
+    
+    def _process_rows_legacy(self, df, progress_callback=None, count_callback=None) -> Tuple[int, int]:
+        """Process rows one by one, committing each insert separately"""
+        # Initialize tracking variables
+        inserted_departamentos = set()
+        inserted_profesores = {}  # Key: (nombres, apellidos, departamento), Value: id
+        inserted_materias = set()
+        inserted_secciones = set()
+        seccion_professors = {}  # Key: NRC, Value: set of professor_ids
+        
+        processed_rows = 0
+        skipped_rows = 0
+        
+        # Process each row
+        for index, row in df.iterrows():
+            if progress_callback and index % 100 == 0:
+                progress_callback(f"Procesando fila {index + 1}/{len(df)}")
+            if count_callback and index % 100 == 0:
+                count_callback(index + 1, len(df))
+            
+            # Check if row is empty
+            if self.is_row_empty(row):
+                print(f"Skipping empty row {index + 1}")
+                skipped_rows += 1
+                continue
+            
+            processed_rows += 1
+            
+            # Process this row
+            success = self._process_single_row(
+                row, index + 1,
+                inserted_departamentos, inserted_profesores, 
+                inserted_materias, inserted_secciones, seccion_professors
+            )
+            
+            if not success:
+                skipped_rows += 1
+                processed_rows -= 1
+        
+        return processed_rows, skipped_rows
+    
+    def new_import_batch(self) -> Dict:
+        """Empty per-table row buffers for DatabaseManager.insert_import_batch"""
+        return {
+            'departamentos': [],
+            'profesores': [],
+            'profesor_departamentos': [],
+            'materias': [],
+            'secciones': [],
+            'seccion_profesores': [],
+            'seccion_dedicaciones_json': {},  # Key: NRC, Value: dedicaciones JSON after adding professors
+            'sesiones': [],
+            'sesion_profesores': []
+        }
+    
+    def _process_rows_bulk(self, frame: pd.DataFrame, row_count: int, progress_callback=None,
+                           chunk_size: int = 500, count_callback=None) -> Tuple[int, int]:
+        """
+        Columnar import: derive one frame per table from the normalised frame
+        (see prepare_cartelera_frame) and insert them inside one transaction.
+        Sessions are flushed every chunk_size rows. Raises (after rolling
+        back) on any error.
+        """
+        skipped_rows = row_count - int(frame['valid'].sum())
+        
+        with self.db_manager.transaction() as cursor:
+            batch, sesiones, sesion_profesores = self.build_import_frames(frame, cursor)
+            
+            if progress_callback:
+                progress_callback(f"Insertando {len(sesiones)} sesiones...")
+            
+            for start in range(0, max(len(sesiones), 1), chunk_size):
+                chunk = sesiones.iloc[start:start + chunk_size]
+                if len(chunk) > 0:
+                    chunk_profesores = sesion_profesores[
+                        sesion_profesores['sesion_id'].between(chunk['id'].iloc[0], chunk['id'].iloc[-1])
+                    ]
+                    batch['sesiones'] = self._frame_to_rows(chunk)
+                    batch['sesion_profesores'] = self._frame_to_rows(chunk_profesores)
+                
+                self.db_manager.insert_import_batch(cursor, batch)
+                batch = self.new_import_batch()
+                
+                if count_callback:
+                    count_callback(min(start + chunk_size, len(sesiones)), len(sesiones))
+        
+        return len(sesiones), skipped_rows
+    
+    def prepare_cartelera_frame(self, df, progress_callback=None) -> pd.DataFrame:
+        """
+        Normalise every column used by the import in bulk
+        
+        Returns:
+            DataFrame (same index as df) with clean columns, a 'valid' flag for
+            rows that become sessions and the parsed professor list per row
+        """
+        empty = pd.Series(True, index=df.index)
+        for field in ['NRC', 'Materia', 'Departamento', 'Facultad ']:
+            empty &= self.strip_column(df, field) == ''
+        
+        # Normalise each distinct department name once
+        departamento_raw = self.strip_column(df, 'Departamento')
+        departamento_map = {
+            name: DataFormatter.normalize_department_name(name) for name in departamento_raw.unique()
+        }
+        
+        frame = pd.DataFrame({
+            'departamento': departamento_raw.map(departamento_map),
+            'materia': self.strip_column(df, 'Materia'),
+            'nombre_materia': self.strip_column(df, 'Nombre largo curso'),
+            'creditos': self.int_column(df, 'Créditos'),
+            'nivel': self.strip_column(df, 'Nivel materia'),
+            'calificacion': self.strip_column(df, 'Modo calificación'),
+            'campus': self.strip_column(df, 'Campus'),
+            'periodo': self.strip_column(df, 'Periodo'),
+            'semanas': self.semanas_column(df),
+            'nrc': self.int_column(df, 'NRC'),
+            'indicador': self.strip_column(df, 'Secc'),
+            'cupo': self.int_column(df, 'Cupo'),
+            'inscritos': self.int_column(df, 'Inscritos').clip(lower=0),
+            'lista_cruzada': self.strip_column(df, 'Lista cruzada'),
+            'tipo_horario': self.strip_column(df, 'Tipo horario (franja)'),
+            'hora_inicio': self.format_time_column(df, 'Hora inicio'),
+            'hora_fin': self.format_time_column(df, 'Hora fin'),
+            'edificio': self.strip_column(df, 'Edificio'),
+            'salon': self.strip_column(df, 'Salón'),
+            'atributo_salon': self.strip_column(df, 'Descripción atributo salón'),
+            'dias': self.days_string_column(df),
+        }, index=df.index)
+        frame['duracion'] = self.duration_column(frame['hora_inicio'], frame['hora_fin'])
+        
+        for index in frame.index[empty]:
+            print(f"Skipping empty row {index + 1}")
+        
+        frame = frame[~empty & (frame['departamento'] != '')]
+        
+        # Parse each distinct professor string once (in interactive mode it may
+        # ask the user to disambiguate names, so it happens before the
+        # transaction starts)
+        if progress_callback:
+            progress_callback("Procesando profesores...")
+        
+        profesores_raw = df.loc[frame.index, 'Profesor(es)']
+        frame['profesores_key'] = profesores_raw.astype(object).where(profesores_raw.notna(), '')
+        parsed = {key: self.parse_professors(key) for key in frame['profesores_key'].unique()}
+        frame['profesores'] = frame['profesores_key'].map(parsed)
+        
+        frame['valid'] = frame['nrc'] > 0
+        for index in frame.index[~frame['valid']]:
+            print(f"Warning: Row {index + 1} has invalid NRC, skipping")
+        
+        return frame
+    
+    def build_import_frames(self, frame: pd.DataFrame, cursor) -> Tuple[Dict, pd.DataFrame, pd.DataFrame]:
+        """
+        Derive the rows for every table from a prepared frame
+        
+        Args:
+            frame: Output of prepare_cartelera_frame
+            cursor: Cursor inside the import transaction (existing data and next ids)
+            
+        Returns:
+            Tuple of (batch with the entity tables, sesiones frame, sesion_profesores frame)
+        """
+        cursor.execute("SELECT NRC FROM Seccion")
+        existing_secciones = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT codigo FROM Materia")
+        existing_materias = {row[0] for row in cursor.fetchall()}
+        next_profesor_id = self.db_manager.get_next_id(cursor, 'Profesor')
+        next_sesion_id = self.db_manager.get_next_id(cursor, 'Sesion')
+        
+        batch = self.new_import_batch()
+        
+        # Departamentos in order of first appearance
+        batch['departamentos'] = [(nombre,) for nombre in frame['departamento'].unique()]
+        
+        # Profesores: ids follow the first appearance of each (nombres, apellidos)
+        batch['profesores'], profesor_ids_by_key = self.assign_profesor_ids(frame, next_profesor_id)
+        frame = frame.assign(profesor_ids=frame['profesores_key'].map(profesor_ids_by_key))
+        batch['profesor_departamentos'] = self.profesor_departamento_rows(frame, profesor_ids_by_key)
+        
+        # Materias: first row of each new code
+        batch['materias'] = self.materia_rows(frame, existing_materias)
+        
+        # Secciones: first row of each new NRC; later rows only add professors
+        valid = frame[frame['valid']]
+        nuevas = valid[~valid['nrc'].isin(existing_secciones)]
+        
+        for nrc, profesor_id_lists in nuevas.groupby('nrc', sort=False)['profesor_ids']:
+            profesor_id_lists = profesor_id_lists.tolist()
+            first_ids = profesor_id_lists[0]
+            
+            seccion_profesores = set(first_ids)
+            dedicaciones = dict.fromkeys(first_ids, 0)
+            batch['seccion_profesores'].extend((nrc, profesor_id) for profesor_id in dedicaciones)
+            
+            for profesor_ids in profesor_id_lists[1:]:
+                new_professors = set(profesor_ids) - seccion_profesores
+                if new_professors:
+                    print(f"  Adding {len(new_professors)} new professors to section {nrc}")
+                    seccion_profesores.update(profesor_ids)
+                    batch['seccion_profesores'].extend((nrc, profesor_id) for profesor_id in new_professors)
+                    
+                    # New professors join with 0% dedication
+                    for profesor_id in list(seccion_profesores):
+                        dedicaciones.setdefault(profesor_id, 0)
+                    batch['seccion_dedicaciones_json'][nrc] = json.dumps(
+                        {str(profesor_id): dedicacion for profesor_id, dedicacion in dedicaciones.items()}
+                    )
+        
+        secciones = nuevas.drop_duplicates('nrc')
+        dedicaciones = secciones['profesor_ids'].map(
+            lambda ids: json.dumps({str(profesor_id): 0 for profesor_id in ids})
+        )
+        batch['secciones'] = self._frame_to_rows(pd.DataFrame({
+            'nrc': secciones['nrc'],
+            'indicador': secciones['indicador'],
+            'cupo': secciones['cupo'],
+            'inscritos': secciones['inscritos'],
+            'cupo_disponible': secciones['cupo'] - secciones['inscritos'],
+            'lista_cruzada': secciones['lista_cruzada'].replace('', None),
+            'materia': secciones['materia'],
+            'dedicaciones': dedicaciones,
+        }))
+        
+        # Sesiones: one per valid row, with ids assigned up front
+        profesor_json = {key: json.dumps(ids) for key, ids in profesor_ids_by_key.items()}
+        sesiones = pd.DataFrame({
+            'id': range(next_sesion_id, next_sesion_id + len(valid)),
+            'tipo_horario': valid['tipo_horario'],
+            'hora_inicio': valid['hora_inicio'],
+            'hora_fin': valid['hora_fin'],
+            'duracion': valid['duracion'],
+            'edificio': valid['edificio'],
+            'salon': valid['salon'],
+            'atributo_salon': valid['atributo_salon'],
+            'dias': valid['dias'],
+            'per': 0,
+            'nrc': valid['nrc'],
+            'profesor_ids': valid['profesores_key'].map(profesor_json),
+        })
+        
+        sesion_profesores = pd.DataFrame({
+            'sesion_id': sesiones['id'],
+            'profesor_id': valid['profesor_ids'],
+        }).explode('profesor_id').dropna(subset=['profesor_id'])
+        sesion_profesores = sesion_profesores.astype({'profesor_id': 'int64'})
+        
+        return batch, sesiones, sesion_profesores
+    
+    def assign_profesor_ids(self, frame: pd.DataFrame, next_profesor_id: int,
+                            existing_ids: Dict[Tuple[str, str], int] = None) -> Tuple[List[tuple], Dict]:
+        """
+        Professor id of every parsed name, in order of first appearance
+        
+        Args:
+            frame: Prepared frame (see prepare_cartelera_frame)
+            next_profesor_id: First id for new professors
+            existing_ids: {full name: id} of stored professors to reuse, so a
+                name keeps its stored nombres/apellidos split
+            
+        Returns:
+            Tuple of (Profesor rows to insert, {profesores_key: [profesor ids]})
+        """
+        existing_ids = existing_ids or {}
+        profesor_keys = {}
+        rows = []
+        profesor_ids_by_key = {}
+        unique_profesores = frame.drop_duplicates('profesores_key')
+        for key, profesores in zip(unique_profesores['profesores_key'], unique_profesores['profesores']):
+            ids = []
+            for prof in profesores:
+                name_key = (prof['nombres'], prof['apellidos'])
+                full_name = f"{prof['nombres'].strip()} {prof['apellidos'].strip()}"
+                if name_key not in profesor_keys and full_name in existing_ids:
+                    profesor_keys[name_key] = existing_ids[full_name]
+                elif name_key not in profesor_keys:
+                    profesor_keys[name_key] = next_profesor_id
+                    rows.append(
+                        (next_profesor_id, prof['nombres'].strip(), prof['apellidos'].strip(), prof['tipo'].strip())
+                    )
+                    next_profesor_id += 1
+                ids.append(profesor_keys[name_key])
+            profesor_ids_by_key[key] = ids
+        
+        return rows, profesor_ids_by_key
+    
+    def profesor_departamento_rows(self, frame: pd.DataFrame, profesor_ids_by_key: Dict) -> List[tuple]:
+        """Distinct (profesor_id, departamento) pairs of a prepared frame"""
+        rows = []
+        for key, departamento in frame[['profesores_key', 'departamento']].drop_duplicates().itertuples(index=False):
+            for profesor_id in profesor_ids_by_key[key]:
+                rows.append((profesor_id, departamento))
+        return list(dict.fromkeys(rows))
+    
+    def materia_rows(self, frame: pd.DataFrame, existing_materias: set) -> List[tuple]:
+        """Materia rows for the first row of each code not yet stored"""
+        materias = frame[(frame['materia'] != '') & ~frame['materia'].isin(existing_materias)]
+        materias = materias.drop_duplicates('materia')
+        niveles = {codigo: self.db_manager.extract_nivel_numerico(codigo) for codigo in materias['materia']}
+        return self._frame_to_rows(pd.DataFrame({
+            'codigo': materias['materia'],
+            'nombre': materias['nombre_materia'],
+            'creditos': materias['creditos'],
+            'nivel': materias['nivel'],
+            'nivel_numerico': materias['materia'].map(niveles),
+            'calificacion': materias['calificacion'],
+            'campus': materias['campus'],
+            'periodo': materias['periodo'],
+            'semanas': materias['semanas'],
+            'departamento': materias['departamento'],
+        }))
+    
+    def _process_rows_delta(self, frame: pd.DataFrame, row_count: int,
+                            progress_callback=None) -> Tuple[int, int, Dict]:
+        """
+        Delta import: compare every row of the normalised frame (see
+        prepare_cartelera_frame) with the snapshot of the last imported
+        cartelera and apply only the inserts, updates and deletes, in one
+        transaction. Raises (after rolling back) on any error.
+        
+        Returns:
+            Tuple of (valid rows, skipped rows, change set)
+        """
+        skipped_rows = row_count - int(frame['valid'].sum())
+        
+        with self.db_manager.transaction() as cursor:
+            if progress_callback:
+                progress_callback("Comparando con la cartelera anterior...")
+            
+            snapshot = self.db_manager.load_cartelera_snapshot(cursor)
+            delta, changes = self.build_import_delta(frame, snapshot, cursor)
+            
+            if progress_callback:
+                progress_callback(
+                    f"Aplicando cambios: {changes['sessions_inserted']} sesiones nuevas, "
+                    f"{changes['sessions_updated']} actualizadas, {changes['sessions_deleted']} eliminadas..."
+                )
+            
+            changes.update(self.db_manager.apply_import_delta(cursor, delta))
+        
+        return int(frame['valid'].sum()), skipped_rows, changes
+    
+    def build_import_delta(self, frame: pd.DataFrame, snapshot: Dict, cursor) -> Tuple[Dict, Dict]:
+        """
+        Compare a prepared frame with the stored snapshot, keyed by (NRC,
+        session slot), and derive the rows to insert, update and delete
+        
+        Args:
+            frame: Prepared frame (see prepare_cartelera_frame)
+            snapshot: {(nrc, slot): (sesion_id, seccion_hash, sesion_hash)}
+            cursor: Cursor inside an open transaction
+            
+        Returns:
+            Tuple of (delta for DatabaseManager.apply_import_delta, change set)
+        """
+        db = self.db_manager
+        
+        cursor.execute("SELECT NRC, indicador, cupo, inscritos, lista_cruzada, materia_codigo FROM Seccion")
+        stored_seccion_hashes = {
+            row[0]: db.cartelera_hash(db.cartelera_seccion_values(*row[1:])) for row in cursor.fetchall()
+        }
+        # Sections in the snapshot compare with the last imported values
+        for (nrc, _), (_, seccion_hash, _) in snapshot.items():
+            stored_seccion_hashes[nrc] = seccion_hash
+        
+        cursor.execute("SELECT codigo FROM Materia")
+        existing_materias = {row[0] for row in cursor.fetchall()}
+        cursor.execute("SELECT id, nombres, apellidos FROM Profesor ORDER BY id")
+        existing_profesores = {}
+        for profesor_id, nombres, apellidos in cursor.fetchall():
+            existing_profesores.setdefault(f"{nombres} {apellidos}", profesor_id)
+        
+        next_sesion_id = db.get_next_id(cursor, 'Sesion')
+        
+        batch = self.new_import_batch()
+        batch['departamentos'] = [(nombre,) for nombre in frame['departamento'].unique()]
+        batch['profesores'], profesor_ids_by_key = self.assign_profesor_ids(
+            frame, db.get_next_id(cursor, 'Profesor'), existing_profesores
+        )
+        batch['profesor_departamentos'] = self.profesor_departamento_rows(frame, profesor_ids_by_key)
+        batch['materias'] = self.materia_rows(frame, existing_materias)
+        
+        valid = frame[frame['valid']]
+        profesor_ids = valid['profesores_key'].map(profesor_ids_by_key).tolist()
+        profesor_names = [
+            [f"{prof['nombres'].strip()} {prof['apellidos'].strip()}" for prof in profesores]
+            for profesores in valid['profesores']
+        ]
+        
+        # Sections: first row of each NRC
+        secciones = valid.drop_duplicates('nrc')
+        seccion_rows = self._frame_to_rows(pd.DataFrame({
+            'nrc': secciones['nrc'],
+            'indicador': secciones['indicador'],
+            'cupo': secciones['cupo'],
+            'inscritos': secciones['inscritos'],
+            'cupo_disponible': secciones['cupo'] - secciones['inscritos'],
+            'lista_cruzada': secciones['lista_cruzada'].replace('', None),
+            'materia': secciones['materia'],
+        }))
+        seccion_hashes = {}
+        seccion_updates = []
+        nuevas = []
+        for nrc, indicador, cupo, inscritos, cupo_disponible, lista_cruzada, materia in seccion_rows:
+            seccion_hash = db.cartelera_hash(
+                db.cartelera_seccion_values(indicador, cupo, inscritos, lista_cruzada, materia)
+            )
+            seccion_hashes[nrc] = seccion_hash
+            if nrc not in stored_seccion_hashes:
+                nuevas.append(nrc)
+            elif stored_seccion_hashes[nrc] != seccion_hash:
+                seccion_updates.append((indicador, cupo, inscritos, cupo_disponible, lista_cruzada, materia, nrc))
+        
+        snapshot_nrcs = {nrc for nrc, _ in snapshot}
+        seccion_deletes = sorted(snapshot_nrcs - set(seccion_hashes))
+        
+        # Section professors: every professor of any row, in order of appearance
+        seccion_profesores = {}
+        for nrc, ids in zip(valid['nrc'].tolist(), profesor_ids):
+            seccion_profesores.setdefault(nrc, {}).update(dict.fromkeys(ids))
+        
+        nuevas_set = set(nuevas)
+        nuevas_rows = [row for row in seccion_rows if row[0] in nuevas_set]
+        batch['secciones'] = [
+            row + (json.dumps({str(profesor_id): 0 for profesor_id in seccion_profesores[row[0]]}),)
+            for row in nuevas_rows
+        ]
+        batch['seccion_profesores'] = [
+            (nrc, profesor_id) for nrc in nuevas for profesor_id in seccion_profesores[nrc]
+        ]
+        
+        # Sessions: keyed by (NRC, slot), compared by hash
+        sesion_rows = self._frame_to_rows(valid[[
+            'nrc', 'tipo_horario', 'hora_inicio', 'hora_fin', 'duracion',
+            'edificio', 'salon', 'atributo_salon', 'dias'
+        ]])
+        slots = db.cartelera_slots([(row[0], row[1], row[8], row[2], row[3]) for row in sesion_rows])
+        
+        sesion_updates = []
+        snapshot_rows = []
+        source_keys = set()
+        touched = set()
+        unchanged = 0
+        for row, slot, ids, names in zip(sesion_rows, slots, profesor_ids, profesor_names):
+            nrc = row[0]
+            key = (nrc, slot)
+            source_keys.add(key)
+            sesion_hash = db.cartelera_hash(db.cartelera_sesion_values(*row[1:], names))
+            
+            if key in snapshot:
+                sesion_id, _, stored_hash = snapshot[key]
+                if stored_hash == sesion_hash:
+                    unchanged += 1
+                    continue
+                sesion_updates.append(row[1:] + (json.dumps(ids), sesion_id))
+            else:
+                sesion_id = next_sesion_id
+                next_sesion_id += 1
+                batch['sesiones'].append((sesion_id,) + row[1:] + (0, nrc, json.dumps(ids)))
+            
+            batch['sesion_profesores'].extend((sesion_id, profesor_id) for profesor_id in dict.fromkeys(ids))
+            snapshot_rows.append((nrc, slot, sesion_id, seccion_hashes[nrc], sesion_hash))
+            touched.add(nrc)
+        
+        deleted_nrcs = set(seccion_deletes)
+        sesion_deletes = []
+        for key, (sesion_id, _, _) in snapshot.items():
+            if key not in source_keys and key[0] not in deleted_nrcs:
+                sesion_deletes.append(sesion_id)
+                touched.add(key[0])
+        
+        delta = {
+            'batch': batch,
+            'seccion_updates': seccion_updates,
+            'seccion_deletes': seccion_deletes,
+            'sesion_updates': sesion_updates,
+            'sesion_deletes': sesion_deletes,
+            'seccion_profesores': {
+                nrc: list(seccion_profesores[nrc]) for nrc in touched if nrc not in nuevas_set
+            },
+            'snapshot_rows': snapshot_rows,
+            'snapshot_seccion_hashes': [(seccion_hashes[update[-1]], update[-1]) for update in seccion_updates],
+        }
+        
+        changes = {
+            'sections_inserted': len(nuevas),
+            'sections_updated': len(seccion_updates),
+            'sections_deleted': len(seccion_deletes),
+            'sessions_inserted': len(batch['sesiones']),
+            'sessions_updated': len(sesion_updates),
+            'sessions_deleted': len(sesion_deletes),
+            'sessions_unchanged': unchanged,
+            'professors_inserted': len(batch['profesores']),
+            'changed_nrcs': sorted(touched | nuevas_set | deleted_nrcs | {update[-1] for update in seccion_updates}),
+        }
+        return delta, changes
+    
+    def _frame_to_rows(self, frame: pd.DataFrame) -> List[tuple]:
+        """Rows of a frame as tuples of native Python values (NaN -> None) for executemany"""
+        columns = [
+            frame[column].astype(object).where(frame[column].notna(), None).tolist()
+            for column in frame.columns
+        ]
+        return list(zip(*columns))
+    
     def _process_single_row(self, row, row_number: int, inserted_departamentos: set,
                            inserted_profesores: dict, inserted_materias: set,
                            inserted_secciones: set, seccion_professors: dict) -> bool:
@@ -461,34 +1202,8 @@ class CSVProcessor:
             return 16
     
     def _update_section_professors(self, nrc: int, profesor_ids: List[int]):
-        """Update professors for a section"""
-        try:
-            conn = self.db_manager.get_connection()
-            cursor = conn.cursor()
-            
-            # Get current professors
-            cursor.execute("SELECT profesor_id FROM SeccionProfesor WHERE seccion_NRC = ?", (nrc,))
-            current_profs = {row[0] for row in cursor.fetchall()}
-            
-            # Add new professors
-            for prof_id in profesor_ids:
-                if prof_id not in current_profs:
-                    cursor.execute(
-                        "INSERT INTO SeccionProfesor (seccion_NRC, profesor_id) VALUES (?, ?)",
-                        (nrc, prof_id)
-                    )
-            
-            # Update JSON field
-            cursor.execute(
-                "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
-                (json.dumps(profesor_ids), nrc)
-            )
-            
-            conn.commit()
-            conn.close()
-            
-        except Exception as e:
-            print(f"Error updating section professors: {e}")
+        """Update professors for a section (new professors start at 0% dedication)"""
+        self.db_manager._update_section_professors(nrc, profesor_ids)
     
     def _create_session_from_row(self, row, nrc: int, profesor_ids: List[int]) -> bool:
         """Create a session from CSV row data"""
@@ -534,64 +1249,31 @@ class CSVProcessor:
     
     def validate_csv_file(self, csv_file_path: str) -> Dict:
         """
-        Validate CSV file structure and content
+        Validate CSV file structure and content, streaming only the critical
+        columns (process_csv_file runs the same checks during the import)
         
         Returns:
             Dictionary with validation results
         """
-        result = {
-            'valid': False,
-            'errors': [],
-            'warnings': [],
-            'row_count': 0,
-            'required_columns': []
-        }
-        
-        required_columns = [
-            'NRC', 'Materia', 'Departamento', 'Profesor(es)',
-            'Nombre largo curso', 'Créditos', 'Secc', 'Cupo'
-        ]
-        
         try:
-            # Try to read the file
-            df = pd.read_csv(csv_file_path)
-            result['row_count'] = len(df)
-            
-            # Check for required columns
-            missing_columns = []
-            for col in required_columns:
-                if col not in df.columns:
-                    missing_columns.append(col)
-            
-            if missing_columns:
-                result['errors'].append(f"Faltan columnas requeridas: {', '.join(missing_columns)}")
-            else:
-                result['valid'] = True
-                result['required_columns'] = required_columns
-            
-            # Check for empty critical data
-            critical_fields = ['NRC', 'Materia', 'Departamento']
-            for field in critical_fields:
-                if field in df.columns:
-                    empty_count = df[field].isna().sum()
-                    if empty_count > 0:
-                        result['warnings'].append(f"Campo '{field}' tiene {empty_count} valores vacíos")
-            
-            # Check for duplicate NRCs
-            if 'NRC' in df.columns:
-                nrc_counts = df['NRC'].value_counts()
-                duplicates = nrc_counts[nrc_counts > 1]
-                if len(duplicates) > 0:
-                    result['warnings'].append(f"Se encontraron {len(duplicates)} NRCs duplicados")
+            scan = self.new_cartelera_scan(self.read_cartelera_header(csv_file_path))
+            for chunk in self.read_cartelera_chunks(csv_file_path, self.CRITICAL_FIELDS):
+                self.scan_cartelera_chunk(scan, chunk, preview_rows=0)
+            return self.finish_cartelera_scan(scan)
             
         except Exception as e:
-            result['errors'].append(f"Error al leer el archivo: {str(e)}")
-        
-        return result
+            return {
+                'valid': False,
+                'errors': [f"Error al leer el archivo: {str(e)}"],
+                'warnings': [],
+                'row_count': 0,
+                'required_columns': []
+            }
     
     def preview_csv_data(self, csv_file_path: str, max_rows: int = 5) -> Dict:
         """
-        Preview first few rows of CSV data
+        Preview first few rows of CSV data (only max_rows rows are parsed;
+        the total is counted streaming a single column)
         
         Returns:
             Dictionary with preview data
@@ -605,13 +1287,23 @@ class CSVProcessor:
         }
         
         try:
-            df = pd.read_csv(csv_file_path)
-            result['total_rows'] = len(df)
-            result['columns'] = df.columns.tolist()
+            if is_spreadsheet(csv_file_path):
+                sheet = self.sheet_reader.read_sheet(csv_file_path, self.CARTELERA_COLUMNS)
+                result.update({
+                    'success': True,
+                    'columns': sheet.columns.tolist(),
+                    'data': sheet.head(max_rows).values.tolist(),
+                    'total_rows': len(sheet)
+                })
+                return result
             
-            # Get preview data
-            preview_df = df.head(max_rows)
+            preview_df = pd.read_csv(csv_file_path, nrows=max_rows)
+            result['columns'] = preview_df.columns.tolist()
             result['data'] = preview_df.values.tolist()
+            
+            with pd.read_csv(csv_file_path, usecols=[0], dtype=str,
+                             chunksize=self.READ_CHUNK_ROWS) as reader:
+                result['total_rows'] = sum(len(chunk) for chunk in reader)
             result['success'] = True
             
         except Exception as e:
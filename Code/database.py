@@ -1,18 +1,574 @@
 import sqlite3
+import copy
+import hashlib
 import json
 import re
+import threading
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime
 
+from per_engine import PEREngine
+from name_matching import (
+    DEFAULT_COMPOUND_FIRST_NAMES, DEFAULT_SURNAME_PARTICLES, NameScoringBackend,
+    NameSplitKnowledge, normalize_name, split_three_part_name
+)
+
+
+class PooledConnection:
+    """
+    Proxy around a pooled sqlite3 connection.
+    
+    Behaves like the wrapped connection, except that close() hands the
+    connection back to its ConnectionManager instead of closing it, so the
+    existing ``conn = get_connection() ... conn.close()`` code keeps working.
+    """
+    
+    def __init__(self, manager: 'ConnectionManager', conn: sqlite3.Connection):
+        self._manager = manager
+        self._conn = conn
+        self._closed = False
+    
+    def __getattr__(self, name):
+        return getattr(self._conn, name)
+    
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return self._conn.__exit__(exc_type, exc_value, traceback)
+    
+    def close(self):
+        """Return the connection to the pool (uncommitted work is rolled back)"""
+        if not self._closed:
+            self._closed = True
+            self._manager.release(self)
+
+
+class ConnectionManager:
+    """
+    Thread-local pool of long-lived SQLite connections for one database file.
+    
+    Every thread (the Tk main loop, background workers) lazily gets its own
+    connection, tuned with PRAGMAS once when it is opened. WAL journaling lets
+    a worker write while the UI thread keeps reading.
+    """
+    
+    PRAGMAS = (
+        ('journal_mode', 'WAL'),
+        ('synchronous', 'NORMAL'),
+        ('cache_size', -20000),        # ~20 MB page cache
+        ('temp_store', 'MEMORY'),
+        ('mmap_size', 268435456),      # 256 MB
+        ('busy_timeout', 5000),        # ms to wait on a concurrent writer
+    )
+    
+    def __init__(self, db_path: str, pooled: bool = True):
+        """
+        Args:
+            db_path: Path to the SQLite database file
+            pooled: If False, every checkout opens a plain, untuned connection
+                    (the legacy behaviour, kept for benchmarking)
+        """
+        self.db_path = db_path
+        self.pooled = pooled
+        self.connections_opened = 0
+        self.statements_executed = 0
+        self.trace_statements = False
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all_connections = []
+        self._generation = 0
+    
+    def _trace(self, statement):
+        self.statements_executed += 1
+    
+    def enable_statement_tracing(self):
+        """Count every SQL statement executed through this manager's connections"""
+        self.trace_statements = True
+        with self._lock:
+            for conn in self._all_connections:
+                conn.set_trace_callback(self._trace)
+    
+    def open_connection(self) -> sqlite3.Connection:
+        """Open a new raw connection (tuned with PRAGMAS when pooling)"""
+        conn = sqlite3.connect(self.db_path, check_same_thread=not self.pooled)
+        self.connections_opened += 1
+        
+        if self.pooled:
+            for pragma, value in self.PRAGMAS:
+                conn.execute(f"PRAGMA {pragma} = {value}")
+        
+        if self.trace_statements:
+            conn.set_trace_callback(self._trace)
+        
+        return conn
+    
+    def _thread_state(self):
+        state = self._local
+        if getattr(state, 'generation', None) != self._generation:
+            state.conn = None
+            state.checkouts = weakref.WeakSet()
+            state.generation = self._generation
+        
+        if state.conn is None:
+            state.conn = self.open_connection()
+            with self._lock:
+                self._all_connections.append(state.conn)
+        
+        return state
+    
+    def get_connection(self):
+        """Check out this thread's connection"""
+        if not self.pooled:
+            return self.open_connection()
+        
+        state = self._thread_state()
+        
+        # A checkout that was dropped without close() leaves its transaction
+        # open; discard it like closing a throwaway connection used to
+        if not state.checkouts and state.conn.in_transaction:
+            state.conn.rollback()
+        
+        wrapper = PooledConnection(self, state.conn)
+        state.checkouts.add(wrapper)
+        return wrapper
+    
+    def release(self, wrapper: PooledConnection):
+        """Return a checked-out connection to the pool"""
+        state = self._local
+        checkouts = getattr(state, 'checkouts', None)
+        if checkouts is not None:
+            checkouts.discard(wrapper)
+        
+        if not checkouts and wrapper._conn.in_transaction:
+            try:
+                wrapper._conn.rollback()
+            except sqlite3.ProgrammingError:
+                pass  # Connection already closed by close_all()
+    
+    def change_token(self) -> Tuple[int, int, int]:
+        """
+        Cheap fingerprint of the database contents for cache invalidation:
+        changes made through any pooled connection plus commits from other
+        processes (PRAGMA data_version)
+        """
+        if not self.pooled:
+            return (self._generation, -1, -1)
+        
+        conn = self._thread_state().conn
+        data_version = conn.execute("PRAGMA data_version").fetchone()[0]
+        with self._lock:
+            total_changes = sum(c.total_changes for c in self._all_connections)
+        return (self._generation, total_changes, data_version)
+    
+    def close_all(self):
+        """Close every pooled connection (threads reopen lazily on next use)"""
+        with self._lock:
+            connections = self._all_connections
+            self._all_connections = []
+            self._generation += 1
+        
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+class ProfessorDirectory:
+    """
+    Cached professor listing shared by every professor picker.
+    
+    The listing costs a constant number of queries (see
+    DatabaseManager.get_professor_directory) and is only reloaded when the
+    database has changed since it was loaded.
+    """
+    
+    def __init__(self, db_manager: 'DatabaseManager'):
+        self.db_manager = db_manager
+        self._professors = None
+        self._token = None
+    
+    def get_professors(self) -> List[Dict]:
+        """All professors ordered by apellidos, nombres (do not modify the dicts)"""
+        token = self.db_manager.connections.change_token()
+        if self._professors is None or token != self._token or token[1] < 0:
+            self._professors = self.db_manager.get_professor_directory()
+            self._token = token
+        return self._professors
+    
+    def count(self) -> int:
+        """Total number of professors"""
+        return len(self.get_professors())
+    
+    def invalidate(self):
+        """Force a reload on next access"""
+        self._professors = None
+    
+    def filter(self, name_filter: str = "", tipo_filter: str = None,
+               department_filter: str = None) -> List[Dict]:
+        """
+        Filter professors in memory
+        
+        Args:
+            name_filter: Words starting a token of nombres or apellidos (case and
+                         accent insensitive, from the FTS index), or text contained
+                         in them when the database has no index
+            tipo_filter: 'Planta', 'Cátedra' or an exact professor tipo
+            department_filter: Department the professor must belong to
+        """
+        matching_ids = self.db_manager.search_professor_ids(name_filter) if name_filter else None
+        name_filter = name_filter.lower() if name_filter and matching_ids is None else ""
+        
+        results = []
+        for prof in self.get_professors():
+            if matching_ids is not None and prof['id'] not in matching_ids:
+                continue
+            if name_filter and not (name_filter in prof['nombres'].lower() or
+                                    name_filter in prof['apellidos'].lower()):
+                continue
+            
+            if tipo_filter and tipo_filter != "Todos los tipos":
+                if tipo_filter == "Planta":
+                    if prof['tipo'] == 'CÁTEDRA':
+                        continue
+                elif tipo_filter == "Cátedra":
+                    if prof['tipo'] != 'CÁTEDRA':
+                        continue
+                elif prof['tipo'] != tipo_filter:
+                    continue
+            
+            if (department_filter and department_filter != "Todos los departamentos" and
+                    department_filter not in prof['departamentos_list']):
+                continue
+            
+            results.append(prof)
+        
+        return results
+    
+    def search(self, nombres: str = "", apellidos: str = "") -> List[Dict]:
+        """Professors matching a search by nombres and/or apellidos (see filter)"""
+        matching_ids = self.db_manager.search_professor_ids(nombres=nombres, apellidos=apellidos)
+        if matching_ids is not None:
+            return [prof for prof in self.get_professors() if prof['id'] in matching_ids]
+        
+        nombres = nombres.lower() if nombres else ""
+        apellidos = apellidos.lower() if apellidos else ""
+        return [prof for prof in self.get_professors()
+                if nombres in prof['nombres'].lower() and apellidos in prof['apellidos'].lower()]
+
+
+class MateriaDirectory:
+    """
+    Cached materia listing with section and session statistics, shared by
+    the materia pickers (see DatabaseManager.get_all_materias_with_stats).
+    Reloaded only when the database has changed since it was loaded.
+    """
+    
+    def __init__(self, db_manager: 'DatabaseManager'):
+        self.db_manager = db_manager
+        self._materias = None
+        self._token = None
+    
+    def get_materias(self) -> List[Dict]:
+        """All materias ordered by departamento, codigo (do not modify the dicts)"""
+        token = self.db_manager.connections.change_token()
+        if self._materias is None or token != self._token or token[1] < 0:
+            self._materias = self.db_manager.get_all_materias_with_stats()
+            self._token = token
+        return self._materias
+    
+    def count(self) -> int:
+        """Total number of materias"""
+        return len(self.get_materias())
+    
+    def invalidate(self):
+        """Force a reload on next access"""
+        self._materias = None
+
+
+class TamanoEstandarContext:
+    """
+    Tamaño Estándar calculation shared by one RECOP run.
+    
+    The sessions and the per-department values are computed once and reused
+    until the 'tamano_estandar' data version changes. That version is bumped
+    by triggers (see DatabaseManager._migration_tamano_estandar_version)
+    whenever an input of the calculation changes: Seccion.inscritos,
+    Sesion.tipoHorario, lista cruzada membership or the materia level.
+    """
+    
+    SCOPE = 'tamano_estandar'
+    
+    def __init__(self, db_manager: 'DatabaseManager'):
+        self.db_manager = db_manager
+        self._sessions = None
+        self._by_department = None
+        self._version = None
+    
+    def version(self) -> int:
+        """Current data version of the Tamaño Estándar inputs"""
+        return self.db_manager.get_data_version(self.SCOPE)
+    
+    def _refresh(self):
+        version = self.version()
+        if self._sessions is None or version != self._version:
+            self._sessions = self.db_manager.load_sessions_for_tamano_estandar_calculation()
+            self._by_department = self.db_manager.compute_tamano_estandar_by_department(self._sessions)
+            self._version = version
+    
+    def get_sessions(self) -> List[Dict]:
+        """Sessions of nivel 3 and 4 materias, lista cruzada groups combined (do not modify)"""
+        self._refresh()
+        return self._sessions
+    
+    def get_by_department(self) -> Dict:
+        """Tamaño Estándar per department and course type (do not modify)"""
+        self._refresh()
+        return self._by_department
+    
+    def invalidate(self):
+        """Force a recomputation on next access"""
+        self._sessions = None
+        self._by_department = None
+
+
+class ResultCache:
+    """
+    LRU cache for derived results (statistics, summaries, dashboards).
+    
+    Entries are keyed on the 'data' version, which triggers on every base
+    table bump on each insert, update or delete (see
+    DatabaseManager._migration_data_version). A result is therefore reused
+    until any data changes, whatever connection or process changed it.
+    With persist=True entries are also stored as JSON in the ResultCache
+    table, so they survive restarting the application. Only plain data is
+    stored (never pickles), so opening a shared database file can't run code.
+    """
+    
+    SCOPE = 'data'
+    # Bump when the shape or encoding of a cached result changes, to ignore
+    # persisted entries (format 1 entries were pickles and are never read)
+    FORMAT = 2
+    
+    # JSON has no tuples, sets or non-string keys: such values are stored
+    # as a single-key object tagged with one of these keys
+    TUPLE_TAG = '__tuple__'
+    SET_TAG = '__set__'
+    ITEMS_TAG = '__items__'
+    
+    def __init__(self, db_manager: 'DatabaseManager', max_entries: int = 32, persist: bool = False):
+        self.db_manager = db_manager
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, name: str, compute):
+        """
+        Cached result of compute() for the current data version
+        
+        Args:
+            name: Cache key of the result
+            compute: Function returning the result; empty results are not cached
+            
+        Returns:
+            A fresh copy of the cached result, safe for the caller to modify
+        """
+        version = self.db_manager.get_data_version(self.SCOPE)
+        
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            value = entry[1]
+            self.hits += 1
+        else:
+            value = self._load(name, version) if self.persist else None
+            if value is None:
+                self.misses += 1
+                value = compute()
+                if not value:
+                    return value
+                if self.persist:
+                    self._store(name, version, value)
+            else:
+                self.hits += 1
+            self._entries[name] = (version, value)
+        
+        self._entries.move_to_end(name)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        
+        return copy.deepcopy(value)
+    
+    def invalidate(self):
+        """Drop every cached result (memory and disk)"""
+        self._entries.clear()
+        if self.persist:
+            try:
+                self.db_manager.execute_query("DELETE FROM ResultCache")
+            except Exception as e:
+                print(f"Error clearing result cache: {e}")
+    
+    def encode(self, value):
+        """A result as JSON-compatible data (see decode)"""
+        if isinstance(value, dict):
+            if all(isinstance(key, str) for key in value) and not {self.TUPLE_TAG, self.SET_TAG, self.ITEMS_TAG} & value.keys():
+                return {key: self.encode(item) for key, item in value.items()}
+            return {self.ITEMS_TAG: [[self.encode(key), self.encode(item)] for key, item in value.items()]}
+        if isinstance(value, tuple):
+            return {self.TUPLE_TAG: [self.encode(item) for item in value]}
+        if isinstance(value, (set, frozenset)):
+            return {self.SET_TAG: [self.encode(item) for item in value]}
+        if isinstance(value, list):
+            return [self.encode(item) for item in value]
+        if value is None or isinstance(value, (str, int, float, bool)):
+            return value
+        raise TypeError(f"Can't persist a {type(value).__name__} result")
+    
+    def decode(self, data):
+        """The result encoded as data by encode"""
+        if isinstance(data, list):
+            return [self.decode(item) for item in data]
+        if not isinstance(data, dict):
+            return data
+        if len(data) == 1:
+            tag, items = next(iter(data.items()))
+            if tag == self.TUPLE_TAG:
+                return tuple(self.decode(item) for item in items)
+            if tag == self.SET_TAG:
+                return {self.decode(item) for item in items}
+            if tag == self.ITEMS_TAG:
+                return {self.decode(key): self.decode(item) for key, item in items}
+        return {key: self.decode(item) for key, item in data.items()}
+    
+    def _load(self, name: str, version: int):
+        try:
+            result = self.db_manager.execute_query(
+                "SELECT payload FROM ResultCache WHERE name = ? AND version = ? AND format = ?",
+                (name, version, self.FORMAT), fetch_one=True
+            )
+            return self.decode(json.loads(result[0])) if result else None
+        except Exception as e:
+            print(f"Error loading cached result {name}: {e}")
+            return None
+    
+    def _store(self, name: str, version: int, value):
+        try:
+            payload = json.dumps(self.encode(value), ensure_ascii=False)
+            self.db_manager.execute_query(
+                "INSERT OR REPLACE INTO ResultCache (name, version, format, payload) VALUES (?, ?, ?, ?)",
+                (name, version, self.FORMAT, payload)
+            )
+        except Exception as e:
+            print(f"Error storing cached result {name}: {e}")
+
+
+class TableCursor:
+    """
+    Keyset cursor over one search of a table, held by the database viewer.
+    
+    Pages are read with get_table_data(after_key=...). The cursor remembers
+    the order key of the row before every page boundary it has seen, so the
+    first, next, previous and already visited pages each cost one index
+    seek, and pages near the end are read backwards from the last row. Only
+    a jump far from both reads the rows between it and the nearest known
+    boundary.
+    
+    The row count is computed once and reused until the 'data' version
+    changes (see DatabaseManager._migration_data_version), which also drops
+    the remembered boundaries.
+    """
+    
+    SCOPE = 'data'
+    
+    def __init__(self, db_manager: 'DatabaseManager', table_name: str, search_term: str = None,
+                 tipo_filter: str = None):
+        self.db_manager = db_manager
+        self.table_name = table_name
+        self.search_term = search_term
+        self.tipo_filter = tipo_filter
+        self._positions = db_manager.table_key_positions(table_name)
+        self._version = None
+        self._count = None
+        self._boundaries = {0: None}  # Row offset -> order key of the row before it
+    
+    def matches(self, table_name: str, search_term: str = None, tipo_filter: str = None) -> bool:
+        """True if the cursor browses this table search"""
+        return (self.table_name, self.search_term, self.tipo_filter) == (table_name, search_term, tipo_filter)
+    
+    def _check_version(self):
+        version = self.db_manager.get_data_version(self.SCOPE)
+        if version != self._version:
+            self._version = version
+            self._count = None
+            self._boundaries = {0: None}
+    
+    def count(self) -> int:
+        """Rows in the search (cached until the data changes)"""
+        self._check_version()
+        if self._count is None:
+            self._count = self.db_manager.count_table_rows(self.table_name, self.search_term, self.tipo_filter)
+        return self._count
+    
+    def _key(self, row: tuple) -> tuple:
+        return tuple(row[position] for position in self._positions)
+    
+    def fetch(self, limit: int, offset: int) -> List[tuple]:
+        """Rows offset..offset+limit-1 of the search (a PagedRowProvider fetch)"""
+        total = self.count()
+        if limit <= 0 or offset >= total:
+            return []
+        
+        if self._positions is None:
+            return self.db_manager.get_table_data(self.table_name, self.search_term, limit, offset,
+                                                  tipo_filter=self.tipo_filter)
+        
+        start = max(boundary for boundary in self._boundaries if boundary <= offset)
+        if offset - start <= total - offset:
+            # Seek to the nearest known boundary and read forward
+            rows = self.db_manager.get_table_data(
+                self.table_name, self.search_term, limit + offset - start,
+                after_key=self._boundaries[start], tipo_filter=self.tipo_filter
+            )
+            if offset > start and len(rows) >= offset - start:
+                self._boundaries[offset] = self._key(rows[offset - start - 1])
+            rows = rows[offset - start:]
+        else:
+            # Closer to the end: read the tail of the order backwards
+            rows = self.db_manager.get_table_data(
+                self.table_name, self.search_term, total - offset,
+                descending=True, tipo_filter=self.tipo_filter
+            )
+            rows.reverse()
+            rows = rows[:limit]
+        
+        if rows:
+            self._boundaries[offset + len(rows)] = self._key(rows[-1])
+        return rows
+
 
 class DatabaseManager:
-    def __init__(self, db_path='Bases de Datos/university_schedule.db'):
+    def __init__(self, db_path='Bases de Datos/university_schedule.db', pooled: bool = True,
+                 persist_cache: bool = False):
         self.db_path = db_path
+        self.connections = ConnectionManager(db_path, pooled=pooled)
+        self.professor_directory = ProfessorDirectory(self)
+        self.materia_directory = MateriaDirectory(self)
+        self.tamano_estandar = TamanoEstandarContext(self)
+        self.result_cache = ResultCache(self, persist=persist_cache)
+        self.per_engine = PEREngine()
+        self.name_scoring = NameScoringBackend()
         self.create_schema()
+        self.name_split_knowledge = self.load_name_split_knowledge()
     
     def create_schema(self):
         """Create database tables"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self.get_connection()
         try:
             cursor = conn.cursor()
             
@@ -123,6 +679,9 @@ class DatabaseManager:
                 )
             ''')
             
+            self.migrate_schema(cursor)
+            self.search_indexes = self._available_search_indexes(cursor)
+            
             conn.commit()
         except Exception as e:
             print(f"Error creating schema: {e}")
@@ -131,9 +690,374 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    # ==================== SCHEMA MIGRATIONS ====================
+    
+    def migrate_schema(self, cursor):
+        """Apply pending schema migrations, tracked with PRAGMA user_version"""
+        migrations = [
+            self._migration_secondary_indexes,
+            self._migration_profesor_dedicacion,
+            self._migration_tamano_estandar_version,
+            self._migration_data_version,
+            self._migration_personal_data_crosswalk,
+            self._migration_name_review_queue,
+            self._migration_name_split_knowledge,
+            self._migration_cartelera_snapshot,
+            self._migration_profesor_name_index,
+            self._migration_search_indexes,
+            self._migration_materia_search_key,
+        ]
+        
+        cursor.execute("PRAGMA user_version")
+        version = cursor.fetchone()[0]
+        
+        for number, migration in enumerate(migrations, start=1):
+            if version < number:
+                migration(cursor)
+                cursor.execute(f"PRAGMA user_version = {number}")
+    
+    def _migration_secondary_indexes(self, cursor):
+        """Migration 1: indexes for the join and filter columns, then ANALYZE"""
+        indexes = [
+            "CREATE INDEX IF NOT EXISTS idx_sesionprofesor_profesor ON SesionProfesor (profesor_id, sesion_id)",
+            "CREATE INDEX IF NOT EXISTS idx_seccionprofesor_profesor ON SeccionProfesor (profesor_id, seccion_NRC)",
+            "CREATE INDEX IF NOT EXISTS idx_sesion_seccion ON Sesion (seccion_NRC)",
+            "CREATE INDEX IF NOT EXISTS idx_seccion_materia ON Seccion (materia_codigo)",
+            "CREATE INDEX IF NOT EXISTS idx_seccion_lista_cruzada ON Seccion (lista_cruzada)",
+            "CREATE INDEX IF NOT EXISTS idx_materia_departamento ON Materia (departamento_nombre, nivel_numerico, codigo)",
+            "CREATE INDEX IF NOT EXISTS idx_materia_nivel ON Materia (nivel_numerico, codigo)",
+            "CREATE INDEX IF NOT EXISTS idx_profesordepartamento_departamento ON ProfesorDepartamento (departamento_nombre, profesor_id)",
+        ]
+        for statement in indexes:
+            cursor.execute(statement)
+        
+        cursor.execute("ANALYZE")
+    
+    def _migration_profesor_dedicacion(self, cursor):
+        """
+        Migration 2: move professor dedications out of the Seccion JSON column
+        into the ProfesorDedicacion table. The JSON column is rewritten in dict
+        form and kept in sync for older readers.
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ProfesorDedicacion (
+                seccion_NRC INTEGER,
+                profesor_id INTEGER,
+                dedicacion INTEGER DEFAULT 0,
+                PRIMARY KEY (seccion_NRC, profesor_id),
+                FOREIGN KEY (seccion_NRC) REFERENCES Seccion(NRC),
+                FOREIGN KEY (profesor_id) REFERENCES Profesor(id)
+            )
+        ''')
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_profesordedicacion_profesor ON ProfesorDedicacion (profesor_id, seccion_NRC)"
+        )
+        
+        cursor.execute("SELECT NRC, profesor_dedicaciones FROM Seccion WHERE profesor_dedicaciones IS NOT NULL")
+        for nrc, dedicaciones_json in cursor.fetchall():
+            dedicaciones = self._parse_dedicaciones_json(dedicaciones_json, nrc)
+            self._write_seccion_dedicaciones(cursor, nrc, dedicaciones)
+    
+    def _migration_tamano_estandar_version(self, cursor):
+        """
+        Migration 3: DataVersion counters, plus the triggers that bump the
+        'tamano_estandar' counter whenever an input of that calculation changes
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS DataVersion (
+                scope TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute("INSERT OR IGNORE INTO DataVersion (scope, version) VALUES ('tamano_estandar', 0)")
+        
+        bump = "UPDATE DataVersion SET version = version + 1 WHERE scope = 'tamano_estandar';"
+        triggers = {
+            'trg_tamano_estandar_seccion_insert': "AFTER INSERT ON Seccion",
+            'trg_tamano_estandar_seccion_delete': "AFTER DELETE ON Seccion",
+            'trg_tamano_estandar_seccion_update': (
+                "AFTER UPDATE OF inscritos, lista_cruzada, materia_codigo ON Seccion "
+                "WHEN OLD.inscritos IS NOT NEW.inscritos "
+                "OR OLD.lista_cruzada IS NOT NEW.lista_cruzada "
+                "OR OLD.materia_codigo IS NOT NEW.materia_codigo"
+            ),
+            'trg_tamano_estandar_sesion_insert': "AFTER INSERT ON Sesion",
+            'trg_tamano_estandar_sesion_delete': "AFTER DELETE ON Sesion",
+            'trg_tamano_estandar_sesion_update': (
+                "AFTER UPDATE OF tipoHorario, seccion_NRC ON Sesion "
+                "WHEN OLD.tipoHorario IS NOT NEW.tipoHorario "
+                "OR OLD.seccion_NRC IS NOT NEW.seccion_NRC"
+            ),
+            'trg_tamano_estandar_materia_insert': "AFTER INSERT ON Materia",
+            'trg_tamano_estandar_materia_delete': "AFTER DELETE ON Materia",
+            'trg_tamano_estandar_materia_update': (
+                "AFTER UPDATE OF nivel_numerico, departamento_nombre ON Materia "
+                "WHEN OLD.nivel_numerico IS NOT NEW.nivel_numerico "
+                "OR OLD.departamento_nombre IS NOT NEW.departamento_nombre"
+            ),
+        }
+        for name, event in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {bump} END")
+    
+    def _migration_data_version(self, cursor):
+        """
+        Migration 4: 'data' version bumped by triggers on every base table,
+        and the ResultCache table used to persist derived results
+        """
+        cursor.execute("INSERT OR IGNORE INTO DataVersion (scope, version) VALUES ('data', 0)")
+        
+        bump = "UPDATE DataVersion SET version = version + 1 WHERE scope = 'data';"
+        tables = [
+            'Departamento', 'Profesor', 'ProfesorDepartamento', 'Materia', 'Seccion',
+            'Sesion', 'SesionProfesor', 'SeccionProfesor', 'ProfesorDedicacion'
+        ]
+        for table in tables:
+            for event in ('INSERT', 'UPDATE', 'DELETE'):
+                cursor.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS trg_data_version_{table.lower()}_{event.lower()} "
+                    f"AFTER {event} ON {table} BEGIN {bump} END"
+                )
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS ResultCache (
+                name TEXT PRIMARY KEY,
+                version INTEGER NOT NULL,
+                format INTEGER NOT NULL,
+                payload BLOB
+            )
+        ''')
+    
+    def _migration_personal_data_crosswalk(self, cursor):
+        """
+        Migration 5: PersonalDataCrosswalk linking personnel file people
+        (person_id and normalized name key) to professors, seeded from the
+        professors already linked to personal data
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS PersonalDataCrosswalk (
+                profesor_id INTEGER PRIMARY KEY,
+                person_id INTEGER,
+                name_key TEXT,
+                confidence REAL,
+                source_file TEXT,
+                fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (profesor_id) REFERENCES Profesor(id)
+            )
+        ''')
+        cursor.execute(
+            "CREATE UNIQUE INDEX IF NOT EXISTS idx_crosswalk_person ON PersonalDataCrosswalk (person_id)"
+        )
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_crosswalk_name_key ON PersonalDataCrosswalk (name_key)"
+        )
+        
+        cursor.execute(
+            "SELECT id, person_id, nombres, apellidos FROM Profesor WHERE person_id IS NOT NULL"
+        )
+        cursor.executemany(
+            """INSERT OR IGNORE INTO PersonalDataCrosswalk (profesor_id, person_id, name_key)
+               VALUES (?, ?, ?)""",
+            [(profesor_id, person_id, normalize_name(f"{nombres or ''} {apellidos or ''}"))
+             for profesor_id, person_id, nombres, apellidos in cursor.fetchall()]
+        )
+    
+    def _migration_name_review_queue(self, cursor):
+        """
+        Migration 6: NameReviewQueue of three-part professor names split by the
+        import's default rule, to be reviewed in batch after the import
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS NameReviewQueue (
+                full_name TEXT PRIMARY KEY,
+                applied_choice INTEGER NOT NULL DEFAULT 2,
+                status TEXT NOT NULL DEFAULT 'pending',
+                fecha_creacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                fecha_revision TIMESTAMP
+            )
+        ''')
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_namereview_status ON NameReviewQueue (status)"
+        )
+    
+    def _migration_name_split_knowledge(self, cursor):
+        """
+        Migration 7: NameSplitKnowledge table (compound first names, surname
+        particles and resolved full names), seeded with the built-in rules and
+        the names already reviewed
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS NameSplitKnowledge (
+                kind TEXT NOT NULL,
+                value TEXT NOT NULL,
+                choice INTEGER,
+                source TEXT,
+                fecha_actualizacion TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (kind, value)
+            )
+        ''')
+        
+        rows = [('compound_first_name', name, None, 'builtin') for name in sorted(DEFAULT_COMPOUND_FIRST_NAMES)]
+        rows += [('surname_particle', particle, None, 'builtin') for particle in sorted(DEFAULT_SURNAME_PARTICLES)]
+        cursor.execute("SELECT full_name, applied_choice FROM NameReviewQueue WHERE status = 'reviewed'")
+        rows += [('full_name', normalize_name(full_name), choice, 'user') for full_name, choice in cursor.fetchall()]
+        cursor.executemany(
+            "INSERT OR IGNORE INTO NameSplitKnowledge (kind, value, choice, source) VALUES (?, ?, ?, ?)",
+            rows
+        )
+    
+    def _migration_cartelera_snapshot(self, cursor):
+        """
+        Migration 8: CarteleraSnapshot with the hash of every imported
+        cartelera row, keyed by (NRC, session slot), for delta imports.
+        Filled lazily from the stored sessions (see sync_cartelera_snapshot).
+        """
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS CarteleraSnapshot (
+                seccion_NRC INTEGER NOT NULL,
+                slot TEXT NOT NULL,
+                sesion_id INTEGER NOT NULL,
+                seccion_hash TEXT,
+                sesion_hash TEXT,
+                PRIMARY KEY (seccion_NRC, slot)
+            )
+        ''')
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_snapshot_sesion ON CarteleraSnapshot (sesion_id)"
+        )
+    
+    def _migration_profesor_name_index(self, cursor):
+        """
+        Migration 9: index on the professor name order, so the viewer's
+        keyset pages of Profesor (see TABLE_ORDER_KEYS) are index seeks
+        """
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_profesor_apellidos ON Profesor (apellidos, nombres)"
+        )
+
+    # Full-text indexes of the searched tables: table -> (FTS5 table, key
+    # column, indexed columns). An index row shares the rowid of its table row,
+    # except for the tables in SEARCH_STORED_KEYS.
+    SEARCH_INDEXES = {
+        'Profesor': ('ProfesorFTS', 'id', ['nombres', 'apellidos']),
+        'Materia': ('MateriaFTS', 'codigo', ['codigo', 'nombre', 'departamento_nombre']),
+        'Seccion': ('SeccionFTS', 'NRC', ['NRC', 'indicador', 'lista_cruzada', 'materia_codigo']),
+        'Sesion': ('SesionFTS', 'id', ['tipoHorario', 'edificio', 'salon', 'seccion_NRC']),
+    }
+
+    # Tables whose key isn't an INTEGER PRIMARY KEY: their implicit rowid can
+    # change (VACUUM renumbers it), so index rows are matched on the key
+    # column, which the index stores
+    SEARCH_STORED_KEYS = {'Materia'}
+
+    # Case and accent insensitive: 'marino' finds 'MARIÑO'
+    SEARCH_TOKENIZER = "unicode61 remove_diacritics 2"
+
+    def _migration_search_indexes(self, cursor):
+        """
+        Migration 10: FTS5 indexes of the browsed and searched tables (see
+        SEARCH_INDEXES), kept in sync by triggers. Skipped when SQLite was
+        built without FTS5; searches then fall back to LIKE.
+        """
+        try:
+            cursor.execute("CREATE VIRTUAL TABLE temp.fts5_probe USING fts5(value)")
+            cursor.execute("DROP TABLE temp.fts5_probe")
+        except sqlite3.OperationalError:
+            print("SQLite has no FTS5 support; searches will use LIKE")
+            return
+
+        for table, (fts_table, _, columns) in self.SEARCH_INDEXES.items():
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts_table} "
+                f"USING fts5({', '.join(columns)}, tokenize = '{self.SEARCH_TOKENIZER}')"
+            )
+            self._create_search_triggers(cursor, table)
+
+        self._fill_search_indexes(cursor)
+
+    def _migration_materia_search_key(self, cursor):
+        """
+        Migration 11: match MateriaFTS rows on codigo instead of Materia's
+        implicit rowid (see SEARCH_STORED_KEYS)
+        """
+        if 'Materia' not in self._available_search_indexes(cursor):
+            return
+        for event in ('insert', 'delete', 'update'):
+            cursor.execute(f"DROP TRIGGER IF EXISTS trg_search_materia_{event}")
+        self._create_search_triggers(cursor, 'Materia')
+        self._fill_search_indexes(cursor, ['Materia'])
+
+    def _create_search_triggers(self, cursor, table: str):
+        """Triggers keeping the FTS index of a table in sync with its rows"""
+        fts_table, key, columns = self.SEARCH_INDEXES[table]
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f"new.{column}" for column in columns)
+        if table in self.SEARCH_STORED_KEYS:
+            insert = f"INSERT INTO {fts_table} ({column_list}) VALUES ({new_values});"
+            delete = f"DELETE FROM {fts_table} WHERE {key} = old.{key};"
+        else:
+            insert = f"INSERT OR REPLACE INTO {fts_table} (rowid, {column_list}) VALUES (new.rowid, {new_values});"
+            delete = f"DELETE FROM {fts_table} WHERE rowid = old.rowid;"
+        watched = ', '.join(dict.fromkeys([key] + columns))
+        triggers = {
+            f"trg_search_{table.lower()}_insert": (f"AFTER INSERT ON {table}", insert),
+            f"trg_search_{table.lower()}_delete": (f"AFTER DELETE ON {table}", delete),
+            # PER and count updates don't touch the index
+            f"trg_search_{table.lower()}_update": (f"AFTER UPDATE OF {watched} ON {table}", f"{delete} {insert}"),
+        }
+        for name, (event, body) in triggers.items():
+            cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {event} BEGIN {body} END")
+
+    def _fill_search_indexes(self, cursor, tables: List[str] = None):
+        """Rebuild the FTS indexes (all, or those of tables) from the rows of their table"""
+        for table in tables or self.SEARCH_INDEXES:
+            fts_table, _, columns = self.SEARCH_INDEXES[table]
+            column_list = ', '.join(columns)
+            cursor.execute(f"DELETE FROM {fts_table}")
+            if table in self.SEARCH_STORED_KEYS:
+                cursor.execute(f"INSERT INTO {fts_table} ({column_list}) SELECT {column_list} FROM {table}")
+            else:
+                cursor.execute(
+                    f"INSERT INTO {fts_table} (rowid, {column_list}) SELECT rowid, {column_list} FROM {table}"
+                )
+
+    def _available_search_indexes(self, cursor) -> set:
+        """Tables whose FTS index exists (see SEARCH_INDEXES)"""
+        fts_tables = {fts_table: table for table, (fts_table, _, _) in self.SEARCH_INDEXES.items()}
+        placeholders = ', '.join('?' * len(fts_tables))
+        cursor.execute(
+            f"SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ({placeholders})",
+            tuple(fts_tables)
+        )
+        return {fts_tables[name] for name, in cursor.fetchall()}
+
+    def get_data_version(self, scope: str) -> int:
+        """Current value of a DataVersion counter (bumped by triggers on every relevant change)"""
+        result = self.execute_query(
+            "SELECT version FROM DataVersion WHERE scope = ?", (scope,), fetch_one=True
+        )
+        return result[0] if result else 0
+    
+    def analyze(self):
+        """Refresh the query planner statistics (after large imports)"""
+        conn = self.get_connection()
+        try:
+            conn.execute("ANALYZE")
+            conn.commit()
+        finally:
+            conn.close()
+    
     def get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Get this thread's pooled database connection (close() returns it to the pool)"""
+        return self.connections.get_connection()
+    
+    def close(self):
+        """Close all pooled connections"""
+        self.connections.close_all()
+    
+    def checkpoint(self):
+        """Flush the WAL into the main database file (e.g. before copying it)"""
+        if self.connections.pooled:
+            self.execute_query("PRAGMA wal_checkpoint(TRUNCATE)", fetch_one=True)
     
     def execute_query(self, query: str, params: tuple = (), fetch_one: bool = False, fetch_all: bool = True):
         """Execute a query and return results"""
@@ -157,6 +1081,282 @@ class DatabaseManager:
         finally:
             conn.close()
     
+    @contextmanager
+    def transaction(self):
+        """
+        Run a block of statements as one atomic transaction
+        
+        Yields:
+            Cursor on this thread's connection. The transaction is committed
+            when the block ends and rolled back if it raises.
+        """
+        conn = self.get_connection()
+        try:
+            cursor = conn.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            yield cursor
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+    
+    # ==================== BULK IMPORT OPERATIONS ====================
+    
+    def get_next_id(self, cursor, table_name: str) -> int:
+        """Next AUTOINCREMENT id for a table, so bulk inserts can assign ids up front"""
+        cursor.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}")
+        max_id = cursor.fetchone()[0]
+        
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,))
+        row = cursor.fetchone()
+        sequence = row[0] if row else 0
+        
+        return max(max_id, sequence) + 1
+    
+    def insert_import_batch(self, cursor, batch: Dict):
+        """
+        Write one batch of a cartelera import with executemany, in FK order
+        
+        Args:
+            cursor: Cursor inside an open transaction (see transaction())
+            batch: Rows per table as built by CSVProcessor.new_import_batch()
+        """
+        cursor.executemany(
+            "INSERT OR IGNORE INTO Departamento (nombre) VALUES (?)",
+            batch['departamentos']
+        )
+        cursor.executemany(
+            "INSERT INTO Profesor (id, nombres, apellidos, tipo) VALUES (?, ?, ?, ?)",
+            batch['profesores']
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO ProfesorDepartamento (profesor_id, departamento_nombre) VALUES (?, ?)",
+            batch['profesor_departamentos']
+        )
+        cursor.executemany(
+            """INSERT OR IGNORE INTO Materia (codigo, nombre, creditos, nivel, nivel_numerico,
+               calificacion, campus, periodo, semanas, departamento_nombre)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            batch['materias']
+        )
+        cursor.executemany(
+            """INSERT INTO Seccion (NRC, indicador, cupo, inscritos, cupoDisponible,
+                                    lista_cruzada, materia_codigo, profesor_dedicaciones)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            batch['secciones']
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO SeccionProfesor (seccion_NRC, profesor_id) VALUES (?, ?)",
+            batch['seccion_profesores']
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO ProfesorDedicacion (seccion_NRC, profesor_id, dedicacion) VALUES (?, ?, 0)",
+            batch['seccion_profesores']
+        )
+        cursor.executemany(
+            "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
+            [(dedicaciones_json, nrc) for nrc, dedicaciones_json in batch['seccion_dedicaciones_json'].items()]
+        )
+        cursor.executemany(
+            """INSERT INTO Sesion (id, tipoHorario, horaInicio, horaFin, duracion, edificio, salon,
+                                   atributoSalon, dias, PER, seccion_NRC, profesor_ids)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            batch['sesiones']
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO SesionProfesor (sesion_id, profesor_id) VALUES (?, ?)",
+            batch['sesion_profesores']
+        )
+    
+    # ==================== CARTELERA SNAPSHOT (DELTA IMPORT) ====================
+    
+    def _snapshot_value(self, value) -> str:
+        """Canonical text of a stored or imported value (None and '' match, 2.0 matches 2)"""
+        if value is None or (isinstance(value, float) and value != value):
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+    
+    def cartelera_hash(self, values) -> str:
+        """Hash of one cartelera row part (see cartelera_seccion_values / cartelera_sesion_values)"""
+        text = '\x1f'.join(self._snapshot_value(value) for value in values)
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()
+    
+    def cartelera_seccion_values(self, indicador, cupo, inscritos, lista_cruzada, materia_codigo) -> tuple:
+        """Section fields a cartelera row sets (hashed per NRC)"""
+        return (indicador, cupo, inscritos, lista_cruzada, materia_codigo)
+    
+    def cartelera_sesion_values(self, tipo_horario, hora_inicio, hora_fin, duracion, edificio,
+                                salon, atributo_salon, dias, profesor_names) -> tuple:
+        """Session fields a cartelera row sets; professors as 'nombres apellidos' in any order"""
+        return (tipo_horario, hora_inicio, hora_fin, duracion, edificio, salon, atributo_salon, dias,
+                '|'.join(sorted(profesor_names)))
+    
+    def cartelera_slots(self, rows: List[tuple]) -> List[str]:
+        """
+        Session slot of each row within its section: tipo horario, days and
+        hours, numbered when a section repeats the same slot
+        
+        Args:
+            rows: (nrc, tipo_horario, dias, hora_inicio, hora_fin) in file (or id) order
+        """
+        seen = {}
+        slots = []
+        for nrc, *slot_values in rows:
+            slot = '|'.join(self._snapshot_value(value) for value in slot_values)
+            occurrence = seen.get((nrc, slot), 0)
+            seen[(nrc, slot)] = occurrence + 1
+            slots.append(f"{slot}#{occurrence}")
+        return slots
+    
+    def sync_cartelera_snapshot(self, cursor) -> int:
+        """
+        Rebuild the snapshot of every section whose stored sessions don't match
+        it (imported before the snapshot existed, appended by a full import or
+        edited by hand), hashing the stored rows
+        
+        Args:
+            cursor: Cursor inside an open transaction
+            
+        Returns:
+            Number of sections rebuilt
+        """
+        cursor.execute("""
+            SELECT seccion_NRC FROM Sesion
+            WHERE id NOT IN (SELECT sesion_id FROM CarteleraSnapshot)
+            UNION
+            SELECT seccion_NRC FROM CarteleraSnapshot
+            WHERE sesion_id NOT IN (SELECT id FROM Sesion)
+        """)
+        stale = {row[0] for row in cursor.fetchall()}
+        if not stale:
+            return 0
+        
+        cursor.executemany("DELETE FROM CarteleraSnapshot WHERE seccion_NRC = ?", [(nrc,) for nrc in stale])
+        
+        cursor.execute("""
+            SELECT sp.sesion_id, p.nombres, p.apellidos
+            FROM SesionProfesor sp
+            JOIN Profesor p ON p.id = sp.profesor_id
+        """)
+        profesor_names = {}
+        for sesion_id, nombres, apellidos in cursor.fetchall():
+            profesor_names.setdefault(sesion_id, []).append(f"{nombres} {apellidos}")
+        
+        cursor.execute("""
+            SELECT se.id, se.seccion_NRC, se.tipoHorario, se.horaInicio, se.horaFin, se.duracion,
+                   se.edificio, se.salon, se.atributoSalon, se.dias,
+                   s.indicador, s.cupo, s.inscritos, s.lista_cruzada, s.materia_codigo
+            FROM Sesion se
+            JOIN Seccion s ON s.NRC = se.seccion_NRC
+            ORDER BY se.id
+        """)
+        sesiones = [row for row in cursor.fetchall() if row[1] in stale]
+        slots = self.cartelera_slots([(row[1], row[2], row[9], row[3], row[4]) for row in sesiones])
+        
+        cursor.executemany(
+            """INSERT INTO CarteleraSnapshot (seccion_NRC, slot, sesion_id, seccion_hash, sesion_hash)
+               VALUES (?, ?, ?, ?, ?)""",
+            [(row[1], slot, row[0],
+              self.cartelera_hash(self.cartelera_seccion_values(*row[10:15])),
+              self.cartelera_hash(self.cartelera_sesion_values(*row[2:10], profesor_names.get(row[0], []))))
+             for row, slot in zip(sesiones, slots)]
+        )
+        return len(stale)
+    
+    def load_cartelera_snapshot(self, cursor) -> Dict[Tuple[int, str], Tuple[int, str, str]]:
+        """Snapshot rows: {(nrc, slot): (sesion_id, seccion_hash, sesion_hash)}"""
+        self.sync_cartelera_snapshot(cursor)
+        cursor.execute("SELECT seccion_NRC, slot, sesion_id, seccion_hash, sesion_hash FROM CarteleraSnapshot")
+        return {(nrc, slot): (sesion_id, seccion_hash, sesion_hash)
+                for nrc, slot, sesion_id, seccion_hash, sesion_hash in cursor.fetchall()}
+    
+    def apply_import_delta(self, cursor, delta: Dict) -> Dict:
+        """
+        Apply a delta import built by CSVProcessor.build_import_delta. Deletes
+        run first, then the inserts (insert_import_batch), then updates; kept
+        sessions keep their id and PER, kept assignments their dedicacion.
+        
+        Args:
+            cursor: Cursor inside an open transaction
+            delta: Row lists per change (see CSVProcessor.build_import_delta)
+            
+        Returns:
+            Dictionary with the number of assignments added and removed
+        """
+        # Sections that left the cartelera, with their sessions and assignments
+        seccion_deletes = [(nrc,) for nrc in delta['seccion_deletes']]
+        cursor.executemany(
+            "DELETE FROM SesionProfesor WHERE sesion_id IN (SELECT id FROM Sesion WHERE seccion_NRC = ?)",
+            seccion_deletes
+        )
+        for table in ('Sesion', 'SeccionProfesor', 'ProfesorDedicacion', 'CarteleraSnapshot'):
+            cursor.executemany(f"DELETE FROM {table} WHERE seccion_NRC = ?", seccion_deletes)
+        cursor.executemany("DELETE FROM Seccion WHERE NRC = ?", seccion_deletes)
+        
+        # Removed sessions, and the professor links of the updated ones
+        sesion_deletes = [(sesion_id,) for sesion_id in delta['sesion_deletes']]
+        cursor.executemany(
+            "DELETE FROM SesionProfesor WHERE sesion_id = ?",
+            sesion_deletes + [(update[-1],) for update in delta['sesion_updates']]
+        )
+        cursor.executemany("DELETE FROM Sesion WHERE id = ?", sesion_deletes)
+        cursor.executemany("DELETE FROM CarteleraSnapshot WHERE sesion_id = ?", sesion_deletes)
+        
+        self.insert_import_batch(cursor, delta['batch'])
+        
+        cursor.executemany(
+            """UPDATE Seccion SET indicador = ?, cupo = ?, inscritos = ?, cupoDisponible = ?,
+                                  lista_cruzada = ?, materia_codigo = ?
+               WHERE NRC = ?""",
+            delta['seccion_updates']
+        )
+        cursor.executemany(
+            """UPDATE Sesion SET tipoHorario = ?, horaInicio = ?, horaFin = ?, duracion = ?, edificio = ?,
+                                 salon = ?, atributoSalon = ?, dias = ?, profesor_ids = ?
+               WHERE id = ?""",
+            delta['sesion_updates']
+        )
+        
+        # Professor assignments of the changed sections that stay
+        cursor.execute("SELECT seccion_NRC, profesor_id FROM SeccionProfesor")
+        assigned = {}
+        for nrc, profesor_id in cursor.fetchall():
+            assigned.setdefault(nrc, set()).add(profesor_id)
+        
+        added, removed = [], []
+        for nrc, profesor_ids in delta['seccion_profesores'].items():
+            current = assigned.get(nrc, set())
+            added.extend((nrc, profesor_id) for profesor_id in profesor_ids if profesor_id not in current)
+            removed.extend((nrc, profesor_id) for profesor_id in current if profesor_id not in profesor_ids)
+        
+        cursor.executemany("INSERT INTO SeccionProfesor (seccion_NRC, profesor_id) VALUES (?, ?)", added)
+        cursor.executemany("DELETE FROM SeccionProfesor WHERE seccion_NRC = ? AND profesor_id = ?", removed)
+        
+        for nrc in {nrc for nrc, _ in added + removed}:
+            dedicaciones = self._read_seccion_dedicaciones(cursor, nrc)
+            target = delta['seccion_profesores'][nrc]
+            merged = {profesor_id: dedicacion for profesor_id, dedicacion in dedicaciones.items()
+                      if profesor_id in target}
+            for profesor_id in target:
+                merged.setdefault(profesor_id, 0)
+            self._write_seccion_dedicaciones(cursor, nrc, merged)
+        
+        cursor.executemany(
+            """INSERT OR REPLACE INTO CarteleraSnapshot (seccion_NRC, slot, sesion_id, seccion_hash, sesion_hash)
+               VALUES (?, ?, ?, ?, ?)""",
+            delta['snapshot_rows']
+        )
+        cursor.executemany(
+            "UPDATE CarteleraSnapshot SET seccion_hash = ? WHERE seccion_NRC = ?",
+            delta['snapshot_seccion_hashes']
+        )
+        
+        return {'assignments_added': len(added), 'assignments_removed': len(removed)}
+    
     # Add this method to the DatabaseManager class:
     
     def cleanup_duplicate_professor_departments(self) -> Dict:
@@ -236,6 +1436,222 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error getting columns for table {table_name}: {e}")
             return []
+    
+    # ==================== NAME REVIEW QUEUE ====================
+    
+    def queue_name_reviews(self, full_names: List[str], applied_choice: int = 2) -> int:
+        """
+        Record three-part names split with the default rule during an import.
+        Names already in the queue (pending or reviewed) are left untouched.
+        
+        Returns:
+            Number of names added to the queue (0 on error)
+        """
+        try:
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO NameReviewQueue (full_name, applied_choice) VALUES (?, ?)",
+                    [(full_name, applied_choice) for full_name in full_names]
+                )
+                return max(cursor.rowcount, 0)
+        except Exception as e:
+            print(f"Error queuing name reviews: {e}")
+            return 0
+    
+    def get_pending_name_reviews(self) -> List[Dict]:
+        """Names waiting for review, with the split currently stored in Profesor"""
+        results = self.execute_query(
+            """SELECT full_name, applied_choice, fecha_creacion
+               FROM NameReviewQueue
+               WHERE status = 'pending'
+               ORDER BY full_name""",
+            fetch_all=True
+        )
+        
+        reviews = []
+        for full_name, applied_choice, fecha_creacion in results or []:
+            nombres, apellidos = split_three_part_name(full_name.split(), applied_choice)
+            reviews.append({
+                'full_name': full_name,
+                'applied_choice': applied_choice,
+                'nombres': nombres,
+                'apellidos': apellidos,
+                'fecha_creacion': fecha_creacion
+            })
+        return reviews
+    
+    def apply_name_reviews(self, choices: Dict[str, int]) -> bool:
+        """
+        Apply reviewed splits in one transaction: professors stored with a
+        different split are renamed in bulk, the names are marked reviewed and
+        the splits are added to the name-split knowledge base
+        
+        Args:
+            choices: Split choice (1 or 2) keyed by full name
+            
+        Returns:
+            True if every change was applied, False (nothing applied) on error
+        """
+        if not choices:
+            return True
+        
+        try:
+            with self.transaction() as cursor:
+                placeholders = ','.join('?' * len(choices))
+                cursor.execute(
+                    f"SELECT full_name, applied_choice FROM NameReviewQueue WHERE full_name IN ({placeholders})",
+                    list(choices)
+                )
+                applied = dict(cursor.fetchall())
+                
+                renames = []
+                for full_name, choice in choices.items():
+                    if full_name in applied and applied[full_name] != choice:
+                        name_parts = full_name.split()
+                        old_nombres, old_apellidos = split_three_part_name(name_parts, applied[full_name])
+                        nombres, apellidos = split_three_part_name(name_parts, choice)
+                        renames.append((nombres, apellidos, old_nombres, old_apellidos))
+                
+                cursor.executemany(
+                    "UPDATE Profesor SET nombres = ?, apellidos = ? WHERE nombres = ? AND apellidos = ?",
+                    renames
+                )
+                cursor.executemany(
+                    """UPDATE NameReviewQueue
+                       SET applied_choice = ?, status = 'reviewed', fecha_revision = CURRENT_TIMESTAMP
+                       WHERE full_name = ?""",
+                    [(choice, full_name) for full_name, choice in choices.items()]
+                )
+                decisions = [(full_name, choice, 'user') for full_name, choice in choices.items()]
+                rows = self._write_name_splits(cursor, decisions)
+            
+            self._learn_name_split_rows(rows)
+            return True
+        except Exception as e:
+            print(f"Error applying name reviews: {e}")
+            return False
+    
+    # ==================== NAME SPLIT KNOWLEDGE ====================
+    
+    def load_name_split_knowledge(self) -> NameSplitKnowledge:
+        """Load the name-split knowledge base (the built-in rules if the table can't be read)"""
+        results = self.execute_query(
+            "SELECT kind, value, choice FROM NameSplitKnowledge", fetch_all=True
+        )
+        if not results:
+            return NameSplitKnowledge(DEFAULT_COMPOUND_FIRST_NAMES, DEFAULT_SURNAME_PARTICLES)
+        
+        return NameSplitKnowledge(
+            compound_first_names=[value for kind, value, _ in results if kind == 'compound_first_name'],
+            surname_particles=[value for kind, value, _ in results if kind == 'surname_particle'],
+            full_names={value: choice for kind, value, choice in results if kind == 'full_name'}
+        )
+    
+    def _write_name_splits(self, cursor, decisions: List[Tuple[str, int, str]]) -> List[Tuple]:
+        """
+        Store resolved three-part names inside an open transaction. A
+        two-nombres split decided by the user also stores its compound first name.
+        
+        Args:
+            decisions: (full_name, choice, source) with source 'user' or 'heuristic'
+            
+        Returns:
+            The NameSplitKnowledge rows written (kind, value, choice, source)
+        """
+        rows = []
+        for full_name, choice, source in decisions:
+            key = normalize_name(full_name)
+            rows.append(('full_name', key, choice, source))
+            name_parts = key.split()
+            if source == 'user' and choice == 1 and len(name_parts) == 3:
+                rows.append(('compound_first_name', ' '.join(name_parts[:2]), None, source))
+        
+        cursor.executemany(
+            """INSERT OR REPLACE INTO NameSplitKnowledge (kind, value, choice, source, fecha_actualizacion)
+               VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+            rows
+        )
+        return rows
+    
+    def _learn_name_split_rows(self, rows: List[Tuple]):
+        """Mirror committed NameSplitKnowledge rows in the loaded knowledge base"""
+        for kind, value, choice, _ in rows:
+            if kind == 'full_name':
+                self.name_split_knowledge.learn(value, choice)
+            elif kind == 'compound_first_name':
+                self.name_split_knowledge.learn_compound_first_name(value)
+            elif kind == 'surname_particle':
+                self.name_split_knowledge.surname_particles.add(value)
+    
+    def learn_name_splits(self, decisions: List[Tuple[str, int, str]]) -> int:
+        """
+        Add resolved three-part names to the knowledge base in one transaction
+        
+        Args:
+            decisions: (full_name, choice, source) with source 'user' or 'heuristic'
+            
+        Returns:
+            Number of rows written (0 on error)
+        """
+        if not decisions:
+            return 0
+        
+        try:
+            with self.transaction() as cursor:
+                rows = self._write_name_splits(cursor, decisions)
+            self._learn_name_split_rows(rows)
+            return len(rows)
+        except Exception as e:
+            print(f"Error saving name splits: {e}")
+            return 0
+    
+    def export_name_split_knowledge(self, file_path: str) -> bool:
+        """Write the knowledge base to a JSON file that other databases can import"""
+        try:
+            knowledge = self.name_split_knowledge
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump({
+                    'compound_first_names': sorted(knowledge.compound_first_names),
+                    'surname_particles': sorted(knowledge.surname_particles),
+                    'full_names': dict(sorted(knowledge.full_names.items()))
+                }, f, ensure_ascii=False, indent=2)
+            return True
+        except Exception as e:
+            print(f"Error exporting name split knowledge: {e}")
+            return False
+    
+    def import_name_split_knowledge(self, file_path: str) -> int:
+        """
+        Merge a JSON file written by export_name_split_knowledge. Entries
+        already known are kept as they are.
+        
+        Returns:
+            Number of new entries (0 on error)
+        """
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            
+            rows = [('compound_first_name', normalize_name(name), None, 'import')
+                    for name in data.get('compound_first_names', [])]
+            rows += [('surname_particle', normalize_name(particle), None, 'import')
+                     for particle in data.get('surname_particles', [])]
+            rows += [('full_name', normalize_name(name), int(choice), 'import')
+                     for name, choice in data.get('full_names', {}).items() if int(choice) in (1, 2)]
+            
+            with self.transaction() as cursor:
+                cursor.executemany(
+                    "INSERT OR IGNORE INTO NameSplitKnowledge (kind, value, choice, source) VALUES (?, ?, ?, ?)",
+                    rows
+                )
+                added = max(cursor.rowcount, 0)
+            
+            self.name_split_knowledge = self.load_name_split_knowledge()
+            return added
+        except Exception as e:
+            print(f"Error importing name split knowledge: {e}")
+            return 0
+    
     # ==================== DEPARTAMENTO OPERATIONS ====================
     
     def create_departamento(self, nombre: str) -> bool:
@@ -344,43 +1760,61 @@ class DatabaseManager:
     
     def get_all_profesores(self) -> List[Dict]:
         """Get all professors with their departments (avoiding duplicates)"""
+        return [dict(prof) for prof in self.professor_directory.get_professors()]
+    
+    def get_profesor_departamentos_map(self) -> Dict[int, List[str]]:
+        """Departments of every professor in a single query"""
+        results = self.execute_query(
+            """SELECT DISTINCT profesor_id, departamento_nombre 
+               FROM ProfesorDepartamento 
+               ORDER BY profesor_id, departamento_nombre"""
+        )
+        
+        departamentos = {}
+        for profesor_id, departamento in results:
+            departamentos.setdefault(profesor_id, []).append(departamento)
+        return departamentos
+    
+    def get_professor_directory(self) -> List[Dict]:
+        """
+        Load every professor with departments and session/section/materia
+        counts using two set-based queries (no per-professor lookups)
+        """
         results = self.execute_query(
             """SELECT p.id, p.nombres, p.apellidos, p.tipo,
-                      COUNT(DISTINCT sp.sesion_id) as num_sessions,
-                      COUNT(DISTINCT scp.seccion_NRC) as num_sections
+                      COALESCE(ses.num_sessions, 0) as num_sessions,
+                      COALESCE(sec.num_sections, 0) as num_sections,
+                      COALESCE(sec.num_materias, 0) as num_materias
                FROM Profesor p
-               LEFT JOIN SesionProfesor sp ON p.id = sp.profesor_id
-               LEFT JOIN SeccionProfesor scp ON p.id = scp.profesor_id
-               GROUP BY p.id, p.nombres, p.apellidos, p.tipo
+               LEFT JOIN (SELECT profesor_id, COUNT(DISTINCT sesion_id) as num_sessions
+                          FROM SesionProfesor
+                          GROUP BY profesor_id) ses ON p.id = ses.profesor_id
+               LEFT JOIN (SELECT scp.profesor_id,
+                                 COUNT(DISTINCT scp.seccion_NRC) as num_sections,
+                                 COUNT(DISTINCT m.codigo) as num_materias
+                          FROM SeccionProfesor scp
+                          LEFT JOIN Seccion s ON scp.seccion_NRC = s.NRC
+                          LEFT JOIN Materia m ON s.materia_codigo = m.codigo
+                          GROUP BY scp.profesor_id) sec ON p.id = sec.profesor_id
                ORDER BY p.apellidos, p.nombres"""
         )
+        departamentos_map = self.get_profesor_departamentos_map()
         
         profesores = []
         for row in results:
-            profesor_id = row[0]
-            
-            # Get departments separately to avoid duplicates
-            dept_results = self.execute_query(
-                """SELECT DISTINCT departamento_nombre 
-                   FROM ProfesorDepartamento 
-                   WHERE profesor_id = ? 
-                   ORDER BY departamento_nombre""",
-                (profesor_id,)
-            )
-            
-            # Create clean department list
-            departamentos = [dept[0] for dept in dept_results]
-            departamentos_str = ', '.join(departamentos) if departamentos else 'Sin departamento'
+            departamentos = departamentos_map.get(row[0], [])
             
             profesores.append({
                 'id': row[0],
                 'nombres': row[1],
                 'apellidos': row[2],
                 'tipo': row[3],
-                'departamentos': departamentos_str,
+                'departamentos': ', '.join(departamentos) if departamentos else 'Sin departamento',
+                'departamentos_list': departamentos,
                 'full_name': f"{row[1]} {row[2]}",
                 'num_sessions': row[4],
-                'num_sections': row[5]
+                'num_sections': row[5],
+                'num_materias': row[6]
             })
         
         return profesores
@@ -513,6 +1947,7 @@ class DatabaseManager:
             # Delete from junction tables first
             cursor.execute("DELETE FROM SesionProfesor WHERE profesor_id = ?", (profesor_id,))
             cursor.execute("DELETE FROM SeccionProfesor WHERE profesor_id = ?", (profesor_id,))
+            cursor.execute("DELETE FROM ProfesorDedicacion WHERE profesor_id = ?", (profesor_id,))
             cursor.execute("DELETE FROM ProfesorDepartamento WHERE profesor_id = ?", (profesor_id,))
             
             # Delete profesor
@@ -920,7 +2355,11 @@ class DatabaseManager:
             params.append(nivel_filter.upper())
         
         # Name filter
-        if name_filter:
+        search = self._search_condition('Profesor', 'p.id', self.search_words(name_filter))
+        if search:
+            conditions.append(search[0])
+            params.extend(search[1])
+        elif name_filter:
             conditions.append("(LOWER(p.nombres) LIKE ? OR LOWER(p.apellidos) LIKE ?)")
             filter_param = f"%{name_filter.lower()}%"
             params.extend([filter_param, filter_param])
@@ -998,47 +2437,7 @@ class DatabaseManager:
     
     def get_all_profesores_with_materia_stats(self) -> List[Dict]:
         """Get all professors with their materia statistics"""
-        results = self.execute_query(
-            """SELECT p.id, p.nombres, p.apellidos, p.tipo,
-                      COUNT(DISTINCT m.codigo) as num_materias,
-                      COUNT(DISTINCT scp.seccion_NRC) as num_sections
-               FROM Profesor p
-               LEFT JOIN SeccionProfesor scp ON p.id = scp.profesor_id
-               LEFT JOIN Seccion sec ON scp.seccion_NRC = sec.NRC
-               LEFT JOIN Materia m ON sec.materia_codigo = m.codigo
-               GROUP BY p.id, p.nombres, p.apellidos, p.tipo
-               ORDER BY p.apellidos, p.nombres"""
-        )
-        
-        profesores = []
-        for row in results:
-            profesor_id = row[0]
-            
-            # Get departments separately to avoid duplicates
-            dept_results = self.execute_query(
-                """SELECT DISTINCT departamento_nombre 
-                   FROM ProfesorDepartamento 
-                   WHERE profesor_id = ? 
-                   ORDER BY departamento_nombre""",
-                (profesor_id,)
-            )
-            
-            # Create clean department list
-            departamentos = [dept[0] for dept in dept_results]
-            departamentos_str = ', '.join(departamentos) if departamentos else 'Sin departamento'
-            
-            profesores.append({
-                'id': row[0],
-                'nombres': row[1],
-                'apellidos': row[2],
-                'tipo': row[3],
-                'departamentos': departamentos_str,
-                'full_name': f"{row[1]} {row[2]}",
-                'num_materias': row[4],
-                'num_sections': row[5]
-            })
-        
-        return profesores
+        return [dict(prof) for prof in self.professor_directory.get_professors()]
     
     def get_profesor_materias(self, profesor_id: int) -> List[Dict]:
         """Get all materias for a specific professor with detailed information"""
@@ -1476,6 +2875,10 @@ class DatabaseManager:
                     "INSERT INTO SeccionProfesor (seccion_NRC, profesor_id) VALUES (?, ?)",
                     (nrc, profesor_id)
                 )
+                cursor.execute(
+                    "INSERT OR IGNORE INTO ProfesorDedicacion (seccion_NRC, profesor_id, dedicacion) VALUES (?, ?, 0)",
+                    (nrc, profesor_id)
+                )
             
             conn.commit()
             conn.close()
@@ -1595,25 +2998,14 @@ class DatabaseManager:
                         (nrc, prof_id)
                     )
             
-            # UPDATED: Update profesor_dedicaciones JSON field (keep existing dedicaciones, add new professors with 0%)
-            cursor.execute("SELECT profesor_dedicaciones FROM Seccion WHERE NRC = ?", (nrc,))
-            current_dedicaciones_json = cursor.fetchone()[0]
+            # Keep existing dedicaciones, add new professors with 0%
+            current_dedicaciones = self._read_seccion_dedicaciones(cursor, nrc)
             
-            if current_dedicaciones_json:
-                current_dedicaciones = json.loads(current_dedicaciones_json)
-            else:
-                current_dedicaciones = {}
-            
-            # Add new professors with 0% dedication (don't overwrite existing)
             for prof_id in profesor_ids:
-                if str(prof_id) not in current_dedicaciones:
-                    current_dedicaciones[str(prof_id)] = 0
+                if prof_id not in current_dedicaciones:
+                    current_dedicaciones[prof_id] = 0
             
-            # Update section with new dedicaciones
-            cursor.execute(
-                "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
-                (json.dumps(current_dedicaciones), nrc)
-            )
+            self._write_seccion_dedicaciones(cursor, nrc, current_dedicaciones)
             
             conn.commit()
             conn.close()
@@ -1621,57 +3013,28 @@ class DatabaseManager:
         except Exception as e:
             print(f"Error updating section professors: {e}")
             
-    def get_seccion_profesor_dedicaciones(self, nrc: int) -> Dict[int, int]:
-        """Get professor dedicaciones for a section"""
-        try:
-            result = self.execute_query(
-                "SELECT profesor_dedicaciones FROM Seccion WHERE NRC = ?",
-                (nrc,),
-                fetch_one=True
-            )
-            
-            if result and result[0]:
-                dedicaciones_json = json.loads(result[0])
-                # Convert string keys back to integers
-                return {int(prof_id): dedicacion for prof_id, dedicacion in dedicaciones_json.items()}
-            return {}
-        except Exception as e:
-            print(f"Error getting section dedicaciones: {e}")
-            return {}
-    
-    
     def get_profesor_dedicaciones_by_seccion(self, profesor_id: int) -> List[Dict]:
         """Get all sections and dedicaciones for a specific professor"""
         try:
             results = self.execute_query(
-                """SELECT sec.NRC, sec.profesor_dedicaciones, m.codigo, m.nombre
+                """SELECT sec.NRC, COALESCE(pd.dedicacion, 0), m.codigo, m.nombre
                    FROM Seccion sec
                    JOIN SeccionProfesor sp ON sec.NRC = sp.seccion_NRC
                    JOIN Materia m ON sec.materia_codigo = m.codigo
+                   LEFT JOIN ProfesorDedicacion pd 
+                        ON pd.seccion_NRC = sp.seccion_NRC AND pd.profesor_id = sp.profesor_id
                    WHERE sp.profesor_id = ?
-                   ORDER BY m.codigo""",
+                   ORDER BY m.codigo, sec.NRC""",
                 (profesor_id,)
             )
             
             dedicaciones = []
             for row in results:
-                nrc = row[0]
-                dedicaciones_json = row[1]
-                materia_codigo = row[2]
-                materia_nombre = row[3]
-                
-                # Parse dedicaciones JSON
-                if dedicaciones_json:
-                    dedicaciones_dict = json.loads(dedicaciones_json)
-                    dedicacion = dedicaciones_dict.get(str(profesor_id), 0)
-                else:
-                    dedicacion = 0
-                
                 dedicaciones.append({
-                    'nrc': nrc,
-                    'materia_codigo': materia_codigo,
-                    'materia_nombre': materia_nombre,
-                    'dedicacion': dedicacion
+                    'nrc': row[0],
+                    'materia_codigo': row[2],
+                    'materia_nombre': row[3],
+                    'dedicacion': row[1]
                 })
             
             return dedicaciones
@@ -1680,6 +3043,10 @@ class DatabaseManager:
             return []
         
     def get_sections_with_dedication_info(self) -> List[Dict]:
+        """Get all sections with current dedication information (cached per data version)"""
+        return self.result_cache.get('sections_with_dedication_info', self.compute_sections_with_dedication_info)
+    
+    def compute_sections_with_dedication_info(self) -> List[Dict]:
         """Get all sections with current dedication information"""
         results = self.execute_query(
             """SELECT 
@@ -1687,7 +3054,6 @@ class DatabaseManager:
                 sec.indicador,
                 sec.cupo,
                 sec.inscritos,
-                sec.profesor_dedicaciones,
                 m.codigo as materia_codigo,
                 m.nombre as materia_nombre,
                 m.departamento_nombre
@@ -1695,24 +3061,11 @@ class DatabaseManager:
             JOIN Materia m ON sec.materia_codigo = m.codigo
             ORDER BY m.departamento_nombre, m.codigo, sec.NRC"""
         )
+        dedicaciones_by_nrc = self.get_all_seccion_dedicaciones()
         
         sections = []
         for row in results:
-            # Parse dedication JSON
-            dedicaciones_json = row[4]
-            dedicaciones = {}
-            total_dedicacion = 0
-            
-            if dedicaciones_json:
-                try:
-                    dedicaciones_dict = json.loads(dedicaciones_json)
-                    # Convert back to int keys and calculate total
-                    for prof_id_str, dedicacion in dedicaciones_dict.items():
-                        prof_id = int(prof_id_str)
-                        dedicaciones[prof_id] = dedicacion
-                        total_dedicacion += dedicacion
-                except:
-                    pass
+            dedicaciones = dedicaciones_by_nrc.get(row[0], {})
             
             sections.append({
                 'nrc': row[0],
@@ -1720,15 +3073,19 @@ class DatabaseManager:
                 'cupo': row[2],
                 'inscritos': row[3],
                 'dedicaciones': dedicaciones,
-                'total_dedicacion': total_dedicacion,
-                'materia_codigo': row[5],
-                'materia_nombre': row[6],
-                'departamento': row[7]
+                'total_dedicacion': sum(dedicaciones.values()),
+                'materia_codigo': row[4],
+                'materia_nombre': row[5],
+                'departamento': row[6]
             })
         
         return sections
     
     def get_professor_dedication_summary(self) -> List[Dict]:
+        """Get summary of professor dedication across all sections (cached per data version)"""
+        return self.result_cache.get('professor_dedication_summary', self.compute_professor_dedication_summary)
+    
+    def compute_professor_dedication_summary(self) -> List[Dict]:
         """Get summary of professor dedication across all sections"""
         results = self.execute_query(
             """SELECT 
@@ -1742,12 +3099,30 @@ class DatabaseManager:
             ORDER BY p.apellidos, p.nombres"""
         )
         
+        # Dedication details for every professor in one query
+        detail_results = self.execute_query(
+            """SELECT sp.profesor_id, sec.NRC, COALESCE(pd.dedicacion, 0), m.codigo, m.nombre
+               FROM SeccionProfesor sp
+               JOIN Seccion sec ON sec.NRC = sp.seccion_NRC
+               JOIN Materia m ON sec.materia_codigo = m.codigo
+               LEFT JOIN ProfesorDedicacion pd 
+                    ON pd.seccion_NRC = sp.seccion_NRC AND pd.profesor_id = sp.profesor_id
+               ORDER BY sp.profesor_id, m.codigo, sec.NRC"""
+        )
+        dedicaciones_by_profesor = {}
+        for row in detail_results:
+            dedicaciones_by_profesor.setdefault(row[0], []).append({
+                'nrc': row[1],
+                'materia_codigo': row[3],
+                'materia_nombre': row[4],
+                'dedicacion': row[2]
+            })
+        
         professors = []
         for row in results:
             profesor_id = row[0]
             
-            # Get dedication details for this professor
-            dedicaciones = self.get_profesor_dedicaciones_by_seccion(profesor_id)
+            dedicaciones = dedicaciones_by_profesor.get(profesor_id, [])
             total_dedicacion = sum(d['dedicacion'] for d in dedicaciones)
             
             professors.append({
@@ -1789,87 +3164,114 @@ class DatabaseManager:
             
         except Exception as e:
             print(f"Error getting section professors: {e}")
-            return []
+            return []
+    
+    def get_section_professors_map(self) -> Dict[int, List[Dict]]:
+        """Professors assigned to every section in a single query: {nrc: [professor, ...]}"""
+        try:
+            results = self.execute_query(
+                """SELECT sp.seccion_NRC, p.id, p.nombres, p.apellidos, p.tipo
+                   FROM SeccionProfesor sp
+                   JOIN Profesor p ON p.id = sp.profesor_id
+                   ORDER BY sp.seccion_NRC, p.apellidos, p.nombres"""
+            )
+            
+            professors = {}
+            for row in results:
+                professors.setdefault(row[0], []).append({
+                    'id': row[1],
+                    'nombres': row[2],
+                    'apellidos': row[3],
+                    'tipo': row[4],
+                    'full_name': f"{row[2]} {row[3]}"
+                })
+            
+            return professors
+            
+        except Exception as e:
+            print(f"Error getting section professors: {e}")
+            return {}
     
     def get_seccion_profesor_dedicaciones(self, nrc: int) -> Dict[int, int]:
-        """Get current professor dedicaciones for a section - FIXED to handle both list and dict JSON"""
+        """Get current professor dedicaciones for a section"""
         try:
-            result = self.execute_query(
-                "SELECT profesor_dedicaciones FROM Seccion WHERE NRC = ?",
-                (nrc,),
-                fetch_one=True
-            )
-            
-            if not result or not result[0]:
-                return {}
-            
-            dedicaciones_json = result[0]
-            
-            # Handle different data types
-            if isinstance(dedicaciones_json, str):
-                try:
-                    dedicaciones_data = json.loads(dedicaciones_json)
-                except json.JSONDecodeError:
-                    print(f"Invalid JSON in profesor_dedicaciones for NRC {nrc}")
-                    return {}
-            else:
-                dedicaciones_data = dedicaciones_json
-            
-            # FIXED: Handle both list and dict formats
-            if isinstance(dedicaciones_data, list):
-                # If it's a list, it might be empty or contain professor IDs
-                # Convert to dict format with 0% dedication
-                if not dedicaciones_data:
-                    return {}
-                
-                # If list contains professor IDs, convert to dict
-                result_dict = {}
-                for item in dedicaciones_data:
-                    if isinstance(item, (int, str)):
-                        try:
-                            prof_id = int(item)
-                            result_dict[prof_id] = 0  # Default to 0% dedication
-                        except (ValueError, TypeError):
-                            continue
-                return result_dict
-                
-            elif isinstance(dedicaciones_data, dict):
-                # Handle normal dict format
-                result_dict = {}
-                for key, value in dedicaciones_data.items():
-                    try:
-                        prof_id = int(key)
-                        dedicacion = int(value) if value is not None else 0
-                        result_dict[prof_id] = dedicacion
-                    except (ValueError, TypeError):
-                        print(f"Invalid profesor_dedicaciones data: {key}={value}")
-                        continue
-                return result_dict
-            
-            else:
-                print(f"Unexpected data type for profesor_dedicaciones: {type(dedicaciones_data)}")
-                return {}
-                
+            conn = self.get_connection()
+            try:
+                return self._read_seccion_dedicaciones(conn.cursor(), nrc)
+            finally:
+                conn.close()
         except Exception as e:
             print(f"Error getting section dedicaciones: {e}")
             return {}
     
+    def get_all_seccion_dedicaciones(self) -> Dict[int, Dict[int, int]]:
+        """Dedicaciones of every section: {nrc: {profesor_id: dedicacion}}"""
+        results = self.execute_query(
+            "SELECT seccion_NRC, profesor_id, dedicacion FROM ProfesorDedicacion ORDER BY seccion_NRC, rowid"
+        )
+        
+        dedicaciones = {}
+        for nrc, profesor_id, dedicacion in results:
+            dedicaciones.setdefault(nrc, {})[profesor_id] = dedicacion if dedicacion is not None else 0
+        return dedicaciones
+    
     def update_seccion_profesor_dedicaciones(self, nrc: int, dedicaciones: Dict[int, int]) -> bool:
-        """Update professor dedicaciones for a section - ENSURES dict format"""
+        """Update professor dedicaciones for a section"""
         try:
-            # FIXED: Always ensure we're storing a dict format, not a list
             if not isinstance(dedicaciones, dict):
                 print(f"Warning: Expected dict for dedicaciones, got {type(dedicaciones)}")
                 return False
             
-            # Convert dedicaciones dict to JSON string with string keys
-            dedicaciones_json = json.dumps({str(k): v for k, v in dedicaciones.items()})
+            with self.transaction() as cursor:
+                self._write_seccion_dedicaciones(cursor, nrc, dedicaciones)
             
-            result = self.execute_query(
-                "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
-                (dedicaciones_json, nrc),
-                fetch_one=False
-            )
+            return True
+            
+        except Exception as e:
+            print(f"Error updating section dedicaciones: {e}")
+            return False
+    
+    def merge_seccion_dedicaciones(self, updates: Dict[int, Dict[int, int]]) -> bool:
+        """
+        Merge new professor dedicaciones into many sections in one transaction
+        
+        Args:
+            updates: {nrc: {profesor_id: dedicacion}}; professors not listed
+                keep their current dedicacion
+            
+        Returns:
+            True if every section was written, False (nothing written) on error
+        """
+        try:
+            with self.transaction() as cursor:
+                cursor.execute(
+                    "SELECT seccion_NRC, profesor_id, dedicacion FROM ProfesorDedicacion ORDER BY seccion_NRC, rowid"
+                )
+                current = {}
+                for nrc, profesor_id, dedicacion in cursor.fetchall():
+                    if nrc in updates:
+                        current.setdefault(nrc, {})[profesor_id] = dedicacion if dedicacion is not None else 0
+                
+                merged = {}
+                for nrc, dedicaciones in updates.items():
+                    # Sections without table rows fall back to the legacy JSON column
+                    merged[nrc] = current[nrc] if nrc in current else self._read_seccion_dedicaciones(cursor, nrc)
+                    merged[nrc].update(dedicaciones)
+                
+                cursor.executemany(
+                    "DELETE FROM ProfesorDedicacion WHERE seccion_NRC = ?", [(nrc,) for nrc in merged]
+                )
+                cursor.executemany(
+                    "INSERT INTO ProfesorDedicacion (seccion_NRC, profesor_id, dedicacion) VALUES (?, ?, ?)",
+                    [(nrc, int(profesor_id), dedicacion)
+                     for nrc, dedicaciones in merged.items()
+                     for profesor_id, dedicacion in dedicaciones.items()]
+                )
+                cursor.executemany(
+                    "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
+                    [(json.dumps({str(k): v for k, v in dedicaciones.items()}), nrc)
+                     for nrc, dedicaciones in merged.items()]
+                )
             
             return True
             
@@ -1877,6 +3279,72 @@ class DatabaseManager:
             print(f"Error updating section dedicaciones: {e}")
             return False
     
+    def _read_seccion_dedicaciones(self, cursor, nrc: int) -> Dict[int, int]:
+        """
+        Dedicaciones of one section from ProfesorDedicacion, falling back to
+        the legacy JSON column when the table has no rows for the section
+        """
+        cursor.execute(
+            "SELECT profesor_id, dedicacion FROM ProfesorDedicacion WHERE seccion_NRC = ? ORDER BY rowid",
+            (nrc,)
+        )
+        rows = cursor.fetchall()
+        if rows:
+            return {row[0]: row[1] if row[1] is not None else 0 for row in rows}
+        
+        cursor.execute("SELECT profesor_dedicaciones FROM Seccion WHERE NRC = ?", (nrc,))
+        result = cursor.fetchone()
+        return self._parse_dedicaciones_json(result[0] if result else None, nrc)
+    
+    def _write_seccion_dedicaciones(self, cursor, nrc: int, dedicaciones: Dict[int, int]):
+        """Replace the dedicaciones of one section (table and JSON column)"""
+        cursor.execute("DELETE FROM ProfesorDedicacion WHERE seccion_NRC = ?", (nrc,))
+        cursor.executemany(
+            "INSERT INTO ProfesorDedicacion (seccion_NRC, profesor_id, dedicacion) VALUES (?, ?, ?)",
+            [(nrc, int(profesor_id), dedicacion) for profesor_id, dedicacion in dedicaciones.items()]
+        )
+        cursor.execute(
+            "UPDATE Seccion SET profesor_dedicaciones = ? WHERE NRC = ?",
+            (json.dumps({str(k): v for k, v in dedicaciones.items()}), nrc)
+        )
+    
+    def _parse_dedicaciones_json(self, dedicaciones_json, nrc: int = None) -> Dict[int, int]:
+        """Decode the legacy profesor_dedicaciones JSON (dict of dedicaciones or list of ids)"""
+        if not dedicaciones_json:
+            return {}
+        
+        try:
+            dedicaciones_data = json.loads(dedicaciones_json)
+        except (json.JSONDecodeError, TypeError):
+            print(f"Invalid JSON in profesor_dedicaciones for NRC {nrc}")
+            return {}
+        
+        result_dict = {}
+        if isinstance(dedicaciones_data, list):
+            # List of professor IDs: all at 0% dedication
+            for item in dedicaciones_data:
+                try:
+                    result_dict[int(item)] = 0
+                except (ValueError, TypeError):
+                    continue
+        
+        elif isinstance(dedicaciones_data, dict):
+            for key, value in dedicaciones_data.items():
+                try:
+                    if value is None:
+                        value = 0
+                    elif not isinstance(value, (int, float)):
+                        value = float(value)
+                    result_dict[int(key)] = value
+                except (ValueError, TypeError):
+                    print(f"Invalid profesor_dedicaciones data: {key}={value}")
+                    continue
+        
+        else:
+            print(f"Unexpected data type for profesor_dedicaciones: {type(dedicaciones_data)}")
+        
+        return result_dict
+    
     def delete_seccion(self, nrc: int) -> bool:
         """Delete section and all related data"""
         try:
@@ -1889,6 +3357,7 @@ class DatabaseManager:
             
             # Delete from SeccionProfesor
             cursor.execute("DELETE FROM SeccionProfesor WHERE seccion_NRC = ?", (nrc,))
+            cursor.execute("DELETE FROM ProfesorDedicacion WHERE seccion_NRC = ?", (nrc,))
             
             # Delete section
             cursor.execute("DELETE FROM Seccion WHERE NRC = ?", (nrc,))
@@ -1947,21 +3416,6 @@ class DatabaseManager:
         
         return sessions
     
-    def get_per_statistics(self) -> Dict:
-        """Get statistics about PER values"""
-        results = self.execute_query(
-            """SELECT PER, COUNT(*) as count
-               FROM Sesion
-               GROUP BY PER
-               ORDER BY PER"""
-        )
-        
-        stats = {}
-        for row in results:
-            stats[row[0]] = row[1]
-        
-        return stats
-    
     def get_sessions_for_per_calculation(self) -> List[Dict]:
         """Get sessions from materias with nivel_numerico 1 or 2 for PER calculation - UPDATED with lista_cruzada grouping"""
         results = self.execute_query(
@@ -2043,32 +3497,24 @@ class DatabaseManager:
         return final_sessions
     
     def bulk_update_per_values(self, updates: List[Dict]) -> int:
-        """Bulk update PER values for multiple sessions"""
-        updated_count = 0
-        
+        """Bulk update PER values for multiple sessions (one executemany, one transaction)"""
         try:
-            conn = self.get_connection()
-            cursor = conn.cursor()
-            
-            for update in updates:
-                cursor.execute(
+            with self.transaction() as cursor:
+                cursor.executemany(
                     "UPDATE Sesion SET PER = ? WHERE id = ?",
-                    (update['new_per'], update['sesion_id'])
+                    [(update['new_per'], update['sesion_id']) for update in updates]
                 )
-                updated_count += 1
-            
-            conn.commit()
-            conn.close()
+            return len(updates)
             
         except Exception as e:
             print(f"Error updating PER values: {e}")
-            if conn:
-                conn.rollback()
-                conn.close()
-        
-        return updated_count
+            return 0
     
     def get_per_statistics(self) -> Dict:
+        """Get statistics about PER values (cached per data version)"""
+        return self.result_cache.get('per_statistics', self.compute_per_statistics)
+    
+    def compute_per_statistics(self) -> Dict:
         """Get statistics about PER values"""
         results = self.execute_query(
             """SELECT PER, COUNT(*) as count
@@ -2107,6 +3553,10 @@ class DatabaseManager:
         
     def get_sessions_for_tamano_estandar_calculation(self) -> List[Dict]:
         """Get sessions from materias with nivel_numerico 3 or 4 for Tamaño Estándar calculation - UPDATED with lista_cruzada grouping"""
+        return [dict(session) for session in self.tamano_estandar.get_sessions()]
+    
+    def load_sessions_for_tamano_estandar_calculation(self) -> List[Dict]:
+        """Read the Tamaño Estándar sessions from the database (use the memoized getter instead)"""
         results = self.execute_query(
             """SELECT 
                 ses.tipoHorario,
@@ -2122,6 +3572,20 @@ class DatabaseManager:
             ORDER BY m.departamento_nombre, ses.tipoHorario"""
         )
         
+        # Combined enrollment of every lista_cruzada group, in one pass
+        group_totals = {
+            row[0]: (row[1], row[2])
+            for row in self.execute_query(
+                """SELECT sec.lista_cruzada,
+                          SUM(CASE WHEN sec.inscritos THEN sec.inscritos ELSE 0 END),
+                          COUNT(*)
+                   FROM Seccion sec
+                   JOIN Materia m ON sec.materia_codigo = m.codigo
+                   WHERE sec.lista_cruzada IS NOT NULL AND m.nivel_numerico IN (3, 4)
+                   GROUP BY sec.lista_cruzada"""
+            )
+        }
+        
         # Group by lista_cruzada to avoid double counting enrollment
         processed_grupos = set()
         final_sessions = []
@@ -2150,22 +3614,12 @@ class DatabaseManager:
             else:
                 # For grouped sections, only count once per lista_cruzada group
                 if lista_cruzada not in processed_grupos:
-                    # Get all sections in this lista_cruzada group
-                    group_results = self.execute_query(
-                        """SELECT sec.inscritos, sec.NRC
-                           FROM Seccion sec
-                           JOIN Materia m ON sec.materia_codigo = m.codigo
-                           WHERE sec.lista_cruzada = ? AND m.nivel_numerico IN (3, 4)""",
-                        (lista_cruzada,)
-                    )
-                    
-                    # Calculate combined enrollment for the group
-                    total_inscritos = sum(row[0] if row[0] else 0 for row in group_results)
+                    total_inscritos, group_size = group_totals[lista_cruzada]
                     
                     # Add one representative session with combined enrollment
                     session_data['inscritos'] = total_inscritos
                     session_data['is_grouped'] = True
-                    session_data['group_size'] = len(group_results)
+                    session_data['group_size'] = group_size
                     final_sessions.append(session_data)
                     
                     processed_grupos.add(lista_cruzada)
@@ -2173,9 +3627,11 @@ class DatabaseManager:
         return final_sessions
     
     def calculate_tamano_estandar_by_department(self) -> Dict:
-        """Calculate Tamaño Estándar for each department and course type"""
-        sessions = self.get_sessions_for_tamano_estandar_calculation()
-        
+        """Calculate Tamaño Estándar for each department and course type (memoized per data version)"""
+        return copy.deepcopy(self.tamano_estandar.get_by_department())
+    
+    def compute_tamano_estandar_by_department(self, sessions: List[Dict]) -> Dict:
+        """Tamaño Estándar for each department and course type from the given sessions"""
         if not sessions:
             return {}
         
@@ -2246,6 +3702,10 @@ class DatabaseManager:
         return results
     
     def get_tamano_estandar_statistics(self) -> Dict:
+        """Get statistics about Tamaño Estándar calculations (cached per data version)"""
+        return self.result_cache.get('tamano_estandar_statistics', self.compute_tamano_estandar_statistics)
+    
+    def compute_tamano_estandar_statistics(self) -> Dict:
         """Get statistics about Tamaño Estándar calculations"""
         data = self.calculate_tamano_estandar_by_department()
         
@@ -2380,33 +3840,31 @@ class DatabaseManager:
         updates = []
         tamano_estandar_used = {}
         
-        for session in sessions:
-            dept = session['departamento']
-            tipo_horario = session['tipo_horario'].upper()
-            inscritos = session['inscritos']  # PE (Puestos estudiante en el curso)
-            
-            # Classify course type
-            if tipo_horario in ['MAGISTRAL', 'TEORICA']:
-                course_type = 'TEORICO'
-            elif tipo_horario in ['LABORATORIO', 'TALLER Y PBL']:
-                course_type = 'PRACTICO'
-            else:
+        # Sessions with a recognized course type and an available Tamaño Estándar
+        candidates = []
+        course_types = self.per_engine.course_types([session['tipo_horario'] for session in sessions])
+        for session, course_type in zip(sessions, course_types):
+            if not course_type:
                 continue  # Skip unrecognized types
             
-            # Get Tamaño Estándar for this department and course type
+            dept = session['departamento']
             if dept in tamano_estandar_data and tamano_estandar_data[dept][course_type]['total_sections'] > 0:
                 tamano_estandar = tamano_estandar_data[dept][course_type]['tamano_estandar']
             else:
                 continue  # Skip if no Tamaño Estándar available
             
             # Store the Tamaño Estándar used for reporting
-            if dept not in tamano_estandar_used:
-                tamano_estandar_used[dept] = {}
-            tamano_estandar_used[dept][course_type] = tamano_estandar
-            
-            # Calculate PER based on the table logic
-            new_per = self.calculate_per_from_table(course_type, tamano_estandar, inscritos)
-            
+            tamano_estandar_used.setdefault(dept, {})[course_type] = tamano_estandar
+            candidates.append((session, course_type, tamano_estandar))
+        
+        # Evaluate the PER table for every candidate at once
+        new_pers = self.per_engine.per_levels_3_4(
+            [course_type for _, course_type, _ in candidates],
+            [tamano_estandar for _, _, tamano_estandar in candidates],
+            [session['inscritos'] for session, _, _ in candidates]
+        ).tolist()
+        
+        for (session, course_type, tamano_estandar), new_per in zip(candidates, new_pers):
             # Only update if PER changed
             if new_per != session['current_per']:
                 updates.append({
@@ -2415,8 +3873,8 @@ class DatabaseManager:
                     'old_per': session['current_per'],
                     'materia': session['materia_codigo'],
                     'tipo_horario': session['tipo_horario'],
-                    'inscritos': inscritos,
-                    'departamento': dept,
+                    'inscritos': session['inscritos'],
+                    'departamento': session['departamento'],
                     'tamano_estandar': tamano_estandar,
                     'course_type': course_type
                 })
@@ -2519,6 +3977,10 @@ class DatabaseManager:
         return 1
     # ==================== VALIDATION METHODS ====================
     
+    def get_all_nrcs(self) -> set:
+        """Set of every section NRC"""
+        return {row[0] for row in self.execute_query("SELECT NRC FROM Seccion")}
+    
     def nrc_exists(self, nrc: int) -> bool:
         """Check if NRC already exists"""
         result = self.execute_query(
@@ -2559,9 +4021,84 @@ class DatabaseManager:
         
         return stats
     
-    def get_table_data(self, table_name: str, search_term: str = None, 
-                      limit: int = None, offset: int = None) -> List[tuple]:
-        """Get data from any table with optional search and pagination"""
+    # ==================== TABLE BROWSING ====================
+    
+    # Order of each browsable table as unique key columns, so a page can
+    # continue after the last row of the previous one (keyset pagination)
+    TABLE_ORDER_KEYS = {
+        'Sesion': ['ses.id'],
+        'Profesor': ['apellidos', 'nombres', 'id'],
+        'Materia': ['departamento_nombre', 'nivel_numerico', 'codigo'],
+        'Seccion': ['NRC'],
+        'Departamento': ['nombre'],
+        'ProfesorDepartamento': ['departamento_nombre', 'profesor_id'],
+        'SeccionProfesor': ['seccion_NRC', 'profesor_id'],
+        'SesionProfesor': ['sesion_id', 'profesor_id'],
+        'ProfesorDedicacion': ['seccion_NRC', 'profesor_id'],
+    }
+    
+    @staticmethod
+    def search_words(text: str) -> List[str]:
+        """Words of a search text, as the FTS tokenizer splits them"""
+        return re.findall(r'[^\W_]+', text or '')
+
+    def _search_condition(self, table_name: str, key_expression: str, words: List[str],
+                          columns: List[str] = None) -> Optional[Tuple[str, List]]:
+        """
+        Condition keeping the rows of table_name (key_expression is its key
+        column) where every word starts a token of the indexed columns (or
+        only of the given columns). None when the table has no FTS index.
+        """
+        if table_name not in self.search_indexes or not words:
+            return None
+        fts_table, key, _ = self.SEARCH_INDEXES[table_name]
+        index_key = key if table_name in self.SEARCH_STORED_KEYS else 'rowid'
+        scope = f"{{{' '.join(columns)}}} : " if columns else ""
+        # Quoted, so words like AND/NOT or a bare number are plain text
+        expression = ' AND '.join(f'{scope}"{word}"*' for word in words)
+        return f"{key_expression} IN (SELECT {index_key} FROM {fts_table} WHERE {fts_table} MATCH ?)", [expression]
+
+    def search_professor_ids(self, text: str = None, nombres: str = None,
+                             apellidos: str = None) -> Optional[set]:
+        """
+        Ids of the professors matching a name search, from the FTS index
+
+        Args:
+            text: Words searched in nombres and apellidos
+            nombres: Words searched in nombres only
+            apellidos: Words searched in apellidos only
+
+        Returns:
+            Set of professor ids, or None if the index can't serve the search
+            (callers then match substrings themselves)
+        """
+        conditions = []
+        params = []
+        for words, columns in ((text, None), (nombres, ['nombres']), (apellidos, ['apellidos'])):
+            if not words:
+                continue
+            search = self._search_condition('Profesor', 'rowid', self.search_words(words), columns)
+            if search is None:
+                return None
+            conditions.append(search[0])
+            params.extend(search[1])
+
+        if not conditions:
+            return None
+        try:
+            rows = self.execute_query(
+                f"SELECT id FROM Profesor WHERE {' AND '.join(conditions)}", tuple(params)
+            )
+            return {row[0] for row in rows}
+        except Exception as e:
+            print(f"Error searching professors: {e}")
+            return None
+
+    def _table_query(self, table_name: str, search_term: str = None,
+                     tipo_filter: str = None) -> Tuple[str, List[str], List]:
+        """(SELECT ... FROM ..., WHERE conditions, parameters) for browsing a table"""
+        conditions = []
+        params = []
         
         # Special handling for Sesion table to include materia information
         if table_name == "Sesion":
@@ -2586,10 +4123,17 @@ class DatabaseManager:
                 JOIN Seccion sec ON ses.seccion_NRC = sec.NRC
                 JOIN Materia m ON sec.materia_codigo = m.codigo
             """
-            params = []
             
-            if search_term:
-                query += """ WHERE (
+            words = self.search_words(search_term)
+            if words and {'Sesion', 'Materia'} <= self.search_indexes:
+                # Each word is found in the session or in its course
+                for word in words:
+                    in_session, session_params = self._search_condition('Sesion', 'ses.id', [word])
+                    in_course, course_params = self._search_condition('Materia', 'm.codigo', [word])
+                    conditions.append(f"({in_session} OR {in_course})")
+                    params.extend(session_params + course_params)
+            elif search_term:
+                conditions.append("""(
                     ses.tipoHorario LIKE ? OR
                     ses.edificio LIKE ? OR
                     ses.salon LIKE ? OR
@@ -2597,49 +4141,110 @@ class DatabaseManager:
                     m.nombre LIKE ? OR
                     m.departamento_nombre LIKE ? OR
                     CAST(ses.seccion_NRC AS TEXT) LIKE ?
-                )"""
-                search_param = f"%{search_term}%"
-                params.extend([search_param] * 7)
-            
-            query += " ORDER BY ses.id"
+                )""")
+                params.extend([f"%{search_term}%"] * 7)
             
-            if limit:
-                query += " LIMIT ? OFFSET ?"
-                params.extend([limit, offset or 0])
-            
-            return self.execute_query(query, tuple(params))
+            return query, conditions, params
         
-        # Original logic for other tables
         query = f"SELECT * FROM {table_name}"
-        params = []
         
-        if search_term:
+        # Professors are searched by name and can be filtered by tipo
+        if table_name == "Profesor":
+            search = self._search_condition('Profesor', 'id', self.search_words(search_term))
+            if search:
+                conditions.append(search[0])
+                params.extend(search[1])
+            elif search_term:
+                conditions.append("(nombres LIKE ? OR apellidos LIKE ?)")
+                params.extend([f"%{search_term}%", f"%{search_term}%"])
+            if tipo_filter:
+                conditions.append("tipo = ?")
+                params.append(tipo_filter)
+            return query, conditions, params
+        
+        # Materia and Seccion are searched in their FTS index, the rest with LIKE
+        key = self.SEARCH_INDEXES[table_name][1] if table_name in self.SEARCH_INDEXES else 'rowid'
+        search = self._search_condition(table_name, key, self.search_words(search_term))
+        if search:
+            conditions.append(search[0])
+            params.extend(search[1])
+        elif search_term:
             # Get table columns to build search condition
             columns = self.get_table_columns(table_name)
             if columns:
                 search_conditions = []
                 for col in columns:
                     search_conditions.append(f"CAST({col} AS TEXT) LIKE ?")
-                query += f" WHERE ({' OR '.join(search_conditions)})"
-                params = [f"%{search_term}%"] * len(columns)
+                conditions.append(f"({' OR '.join(search_conditions)})")
+                params.extend([f"%{search_term}%"] * len(columns))
+        
+        return query, conditions, params
+    
+    def _seek_condition(self, keys: List[str], values: tuple) -> Tuple[str, List]:
+        """
+        Condition selecting the rows ordered after the row with key values
+        (ascending order, where SQLite sorts NULL first)
+        """
+        if None not in values:
+            # A row value comparison seeks straight into the index
+            placeholders = ', '.join('?' * len(values))
+            return f"({', '.join(keys)}) > ({placeholders})", list(values)
+        
+        column, value = keys[0], values[0]
+        if value is None:
+            later, later_params = f"{column} IS NOT NULL", []
+            tie, tie_params = f"{column} IS NULL", []
+        else:
+            later, later_params = f"{column} > ?", [value]
+            tie, tie_params = f"{column} = ?", [value]
+        
+        if len(keys) == 1:
+            return later, later_params
+        rest, rest_params = self._seek_condition(keys[1:], values[1:])
+        return f"({later} OR ({tie} AND {rest}))", later_params + tie_params + rest_params
+    
+    def table_key_positions(self, table_name: str) -> Optional[List[int]]:
+        """Positions of the order key columns in a get_table_data row (None if the table has no keys)"""
+        keys = self.TABLE_ORDER_KEYS.get(table_name)
+        if not keys:
+            return None
+        columns = self.get_table_columns(table_name)
+        return [columns.index(key.split('.')[-1]) for key in keys]
+    
+    def get_table_data(self, table_name: str, search_term: str = None, 
+                      limit: int = None, offset: int = None, after_key: tuple = None,
+                      descending: bool = False, tipo_filter: str = None) -> List[tuple]:
+        """
+        Get data from any table with optional search and pagination
+        
+        Args:
+            table_name: Table to read
+            search_term: Text searched in the table's columns (names for Profesor)
+            limit: Maximum rows to return
+            offset: Rows to skip (prefer after_key for deep pages)
+            after_key: Start after the row with these order key values (see
+                       table_key_positions); the page is found with an index seek
+                       instead of reading and discarding the earlier rows
+            descending: Reverse the order (reads the last rows of the table)
+            tipo_filter: Professor tipo (Profesor table only)
+        """
+        query, conditions, params = self._table_query(table_name, search_term, tipo_filter)
+        keys = self.TABLE_ORDER_KEYS.get(table_name, [])
+        
+        if after_key is not None and keys:
+            seek, seek_params = self._seek_condition(keys, tuple(after_key))
+            conditions.append(seek)
+            params.extend(seek_params)
+        
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
         
         # Add ordering for consistent results
-        if table_name == "Profesor":
-            query += " ORDER BY apellidos, nombres"
-        elif table_name == "Materia":
-            query += " ORDER BY departamento_nombre, nivel_numerico, codigo"
-        elif table_name == "Seccion":
-            query += " ORDER BY NRC"
-        elif table_name == "Departamento":
-            query += " ORDER BY nombre"
-        elif table_name == "ProfesorDepartamento":
-            query += " ORDER BY departamento_nombre, profesor_id"
-        elif table_name == "SeccionProfesor":
-            query += " ORDER BY seccion_NRC, profesor_id"
-        elif table_name == "SesionProfesor":
-            query += " ORDER BY sesion_id, profesor_id"
+        direction = " DESC" if descending else ""
+        if keys:
+            query += " ORDER BY " + ", ".join(f"{key}{direction}" for key in keys)
         else:
-            query += " ORDER BY 1"  # Order by first column
+            query += f" ORDER BY 1{direction}"  # Order by first column
         
         if limit:
             query += " LIMIT ? OFFSET ?"
@@ -2647,22 +4252,31 @@ class DatabaseManager:
         
         return self.execute_query(query, tuple(params))
     
+    def count_table_rows(self, table_name: str, search_term: str = None, tipo_filter: str = None) -> int:
+        """Number of rows get_table_data returns for a search"""
+        try:
+            query, conditions, params = self._table_query(table_name, search_term, tipo_filter)
+            query = f"SELECT COUNT(*) FROM ({query}{' WHERE ' + ' AND '.join(conditions) if conditions else ''})"
+            result = self.execute_query(query, tuple(params), fetch_one=True)
+            return result[0] if result else 0
+        except Exception as e:
+            print(f"Error getting record count for {table_name}: {e}")
+            return 0
+    
     # ==================== PERSONAL MERGE METHODS ====================
     
     
     def find_professors_by_name_similarity(self, target_name: str, threshold: float = 0.8) -> List[Dict]:
         """Find professors by name similarity"""
-        from difflib import SequenceMatcher
-        
         all_professors = self.get_all_profesores()
         similar_professors = []
         
-        target_normalized = ' '.join(target_name.upper().split())
+        # Only the names go to the scoring backend
+        scores = self.name_scoring.score(
+            [target_name], [prof['full_name'] for prof in all_professors]
+        )[0]
         
-        for prof in all_professors:
-            existing_normalized = ' '.join(prof['full_name'].upper().split())
-            similarity = SequenceMatcher(None, target_normalized, existing_normalized).ratio()
-            
+        for prof, similarity in zip(all_professors, scores):
             if similarity >= threshold:
                 prof_copy = prof.copy()
                 prof_copy['similarity_score'] = similarity
@@ -2673,6 +4287,54 @@ class DatabaseManager:
         
         return similar_professors
     
+    def get_personal_data_crosswalk(self) -> List[Dict]:
+        """Get every person_id / name key -> professor link of the personal data crosswalk"""
+        try:
+            results = self.execute_query(
+                """SELECT profesor_id, person_id, name_key, confidence, source_file
+                   FROM PersonalDataCrosswalk"""
+            )
+            return [
+                {
+                    'profesor_id': row[0],
+                    'person_id': row[1],
+                    'name_key': row[2],
+                    'confidence': row[3],
+                    'source_file': row[4]
+                }
+                for row in results
+            ]
+        except Exception as e:
+            print(f"Error getting personal data crosswalk: {e}")
+            return []
+    
+    def save_personal_data_crosswalk(self, entries: List[Dict]) -> int:
+        """
+        Insert or update crosswalk links in one transaction
+        
+        Args:
+            entries: Dicts with profesor_id, person_id, name_key, confidence and source_file
+            
+        Returns:
+            Number of links written (0 on error)
+        """
+        try:
+            with self.transaction() as cursor:
+                # REPLACE also drops the link of another professor holding the
+                # same person_id, so each person belongs to one professor
+                cursor.executemany(
+                    """INSERT OR REPLACE INTO PersonalDataCrosswalk
+                           (profesor_id, person_id, name_key, confidence, source_file, fecha_actualizacion)
+                       VALUES (?, ?, ?, ?, ?, CURRENT_TIMESTAMP)""",
+                    [(entry['profesor_id'], entry.get('person_id'), entry.get('name_key'),
+                      entry.get('confidence'), entry.get('source_file'))
+                     for entry in entries]
+                )
+            return len(entries)
+        except Exception as e:
+            print(f"Error saving personal data crosswalk: {e}")
+            return 0
+    
     def get_professor_by_exact_name(self, nombres: str, apellidos: str) -> Optional[Dict]:
         """Get professor by exact name match"""
         result = self.execute_query(
@@ -2718,168 +4380,121 @@ class DatabaseManager:
         """
         UNIFIED calculation for both Horas Promedio and Secciones a Tamaño Estándar
         Enhanced structure: {dependencia: {nivel: {tipo_profesor: {tipo_sesion: {nrc: {profesor_id: {horas: float, per: float}}}}}}}
+
+        SQLite joins the sessions to their professors and dedication, drops the
+        rows left out of the calculation (levels above 4, other session types,
+        no dedication) and returns them in NRC and session order. The business
+        rules (dependencia, professor type, session classification, recognized
+        hours) are evaluated once per distinct input and kept in dictionaries; each
+        professor's hours accumulate session by session, capped at the credits
+        (except ISIS-1221), with the PER of the first session.
         """
         try:
-            # Get all sessions with required data
             query = """
-                SELECT 
-                    ses.id as sesion_id,
+                SELECT
+                    ses.seccion_NRC,
+                    p.id as profesor_id,
+                    m.departamento_nombre,
+                    p.dependencia,
+                    p.tipo as profesor_tipo,
                     ses.tipoHorario,
-                    ses.duracion,
                     ses.dias,
+                    ses.duracion,
                     ses.PER as session_per,
-                    ses.seccion_NRC,
-                    sec.profesor_dedicaciones,
-                    m.creditos,
+                    m.nivel_numerico,
                     m.codigo as materia_codigo,
+                    m.creditos,
                     m.semanas,
-                    m.nivel_numerico,
-                    m.departamento_nombre,
-                    p.id as profesor_id,
-                    p.dependencia,
-                    p.tipo as profesor_tipo
+                    pd.dedicacion
                 FROM Sesion ses
                 JOIN Seccion sec ON ses.seccion_NRC = sec.NRC
                 JOIN Materia m ON sec.materia_codigo = m.codigo
                 JOIN SesionProfesor sp ON ses.id = sp.sesion_id
                 JOIN Profesor p ON sp.profesor_id = p.id
+                JOIN ProfesorDedicacion pd
+                     ON pd.seccion_NRC = ses.seccion_NRC AND pd.profesor_id = p.id
                 WHERE m.nivel_numerico IN (1, 2, 3, 4)
                 AND UPPER(ses.tipoHorario) IN ('MAGISTRAL', 'TEORICA', 'LABORATORIO', 'TALLER Y PBL')
+                AND pd.dedicacion != 0
                 ORDER BY ses.seccion_NRC, ses.id
             """
-            
+
             results = self.execute_query(query)
-            
+
             if not results:
                 return {}
-            
-            # Initialize the nested dictionary structure
+
             unified_estructura = {}
-            
-            # Track processed professor-section combinations to avoid PER duplication
-            
+            dependencias = {}
+            tipos = {}
+            clasificaciones = {}
+            horas_reconocidas = {}
+
             print(f"Processing {len(results)} session-professor combinations...")
-            
-            # Process each session record
-            for row in results:
-                sesion_id = row[0]
-                tipo_horario = row[1] if row[1] else 'No especificado'
-                duracion = row[2] if row[2] else 0
-                dias = row[3] if row[3] else ''
-                session_per = row[4] if row[4] else 0
-                seccion_nrc = row[5]
-                profesor_dedicaciones_json = row[6]
-                creditos = row[7] if row[7] else 0
-                materia_codigo = row[8]
-                semanas = row[9] if row[9] else 16
-                nivel_numerico = row[10] if row[10] else 1
-                departamento_nombre = row[11]
-                profesor_id = row[12]
-                profesor_dependencia = row[13]
-                profesor_tipo = row[14]
-                
-                
-                if profesor_dependencia: # Step 1: Determine Professor's Dependencia using simple mapping
-                    if ('DEPARTAMENTO' in profesor_dependencia.upper()):
-                        dependencia_key = self.get_dependency_for_department(departamento_nombre, profesor_dependencia)
-                    else:
-                        dependencia_key = self.get_dependency_for_department(departamento_nombre, None)
-                else: 
-                    dependencia_key = self.get_dependency_for_department(departamento_nombre, None)
-                
-                # Step 2: Determine Academic Level Category
-                if nivel_numerico in [1, 2]:
-                    nivel_categoria = "Basico e intermedio"
-                elif nivel_numerico in [3, 4]:
-                    nivel_categoria = "Avanzado"
-                else:
-                    continue  # Skip higher levels as requested
-                
-                # Step 3: Classify session type
-                session_classification = self.classify_session_type(tipo_horario)
+
+            for (seccion_nrc, profesor_id, departamento_nombre, profesor_dependencia, profesor_tipo,
+                 tipo_horario, dias, duracion, session_per, nivel_numerico, materia_codigo,
+                 creditos, semanas, dedication_percentage) in results:
+                tipo_horario = tipo_horario if tipo_horario else 'No especificado'
+
+                if tipo_horario not in clasificaciones:
+                    clasificaciones[tipo_horario] = self.classify_session_type(tipo_horario)
+                session_classification = clasificaciones[tipo_horario]
                 if session_classification is None:
-                    continue  # Skip sessions that are not considered
-                
-                # Step 4: Get Dedication Percentage
-                dedication_percentage = 0
-                if profesor_dedicaciones_json:
-                    try:
-                        if isinstance(profesor_dedicaciones_json, str):
-                            dedicaciones = json.loads(profesor_dedicaciones_json)
-                        else:
-                            dedicaciones = profesor_dedicaciones_json
-                        
-                        if isinstance(dedicaciones, dict):
-                            dedication_percentage = dedicaciones.get(str(profesor_id), 0)
-                    except Exception as e:
-                        print(f"Error parsing dedicaciones for section {seccion_nrc}: {e}")
-                        dedication_percentage = 0
-                
-                # Skip if no dedication (professor gets 0 hours and PER)
-                if dedication_percentage == 0:
                     continue
-                
-                # Step 5: Normalize Professor Type
-                tipo_profesor_normalizado = self.normalize_profesor_tipo_for_calculation(profesor_tipo)
-                
-                if tipo_profesor_normalizado == 'AGD' or tipo_profesor_normalizado == 'AGM':
+
+                # AGD and AGM professors are left out of the calculation
+                if profesor_tipo not in tipos:
+                    tipos[profesor_tipo] = self.normalize_profesor_tipo_for_calculation(profesor_tipo)
+                tipo_profesor_normalizado = tipos[profesor_tipo]
+                if tipo_profesor_normalizado in ('AGD', 'AGM'):
                     continue
-                
-                # Step 6: Calculate Base Hours
-                base_hours = self.calculate_horas_reconocidas_formula(
-                    duracion=duracion,
-                    dias=dias,
-                    creditos=creditos,
-                    semanas=semanas,
-                    tipo_horario=tipo_horario,
-                    tipo_profesor=tipo_profesor_normalizado,
-                    materia_codigo=materia_codigo
-                )
-                
-                # Step 7: Apply Dedication Percentage to Hours
-                final_hours = base_hours * (dedication_percentage / 100.0)
-                
-                # Step 8: Calculate PER with Dedication (only once per professor-section)
-                final_per = session_per * (dedication_percentage / 100.0)
 
-                
-                # Step 9: Build/Update the Enhanced Nested Structure
-                # Ensure structure exists
-                if dependencia_key not in unified_estructura:
-                    unified_estructura[dependencia_key] = {}
-                
-                if nivel_categoria not in unified_estructura[dependencia_key]:
-                    unified_estructura[dependencia_key][nivel_categoria] = {}
-                
-                if tipo_profesor_normalizado not in unified_estructura[dependencia_key][nivel_categoria]:
-                    unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado] = {}
-                
-                if session_classification not in unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado]:
-                    unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification] = {}
-                
-                if seccion_nrc not in unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification]:
-                    unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc] = {}
-                
-                # Add/update professor with both hours and PER
-                if profesor_id not in unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc]:
-                    unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc][profesor_id] = {
-                        'horas': final_hours,
-                        'per': final_per
-                    }
-                else:
-                    
-                    if materia_codigo != 'ISIS-1221':
-                        horas_actuales = unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc][profesor_id]['horas']
-                        unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc][profesor_id]['horas'] = min(horas_actuales + final_hours, creditos)
+                # A professor whose dependencia names a department keeps it; any
+                # other professor gets the dependencia of the course's department
+                dependencia_id = (departamento_nombre, profesor_dependencia)
+                if dependencia_id not in dependencias:
+                    if profesor_dependencia and 'DEPARTAMENTO' in profesor_dependencia.upper():
+                        dependencias[dependencia_id] = self.get_dependency_for_department(departamento_nombre, profesor_dependencia)
                     else:
-                        unified_estructura[dependencia_key][nivel_categoria][tipo_profesor_normalizado][session_classification][seccion_nrc][profesor_id]['horas'] += final_hours
-                    
-                    
+                        dependencias[dependencia_id] = self.get_dependency_for_department(departamento_nombre, None)
+                dependencia_key = dependencias[dependencia_id]
+
+                nivel_categoria = "Basico e intermedio" if nivel_numerico in (1, 2) else "Avanzado"
+                creditos = creditos if creditos else 0
+
+                formula_id = (duracion, dias, creditos, semanas, tipo_horario, tipo_profesor_normalizado, materia_codigo)
+                if formula_id not in horas_reconocidas:
+                    horas_reconocidas[formula_id] = self.calculate_horas_reconocidas_formula(
+                        duracion=duracion if duracion else 0,
+                        dias=dias if dias else '',
+                        creditos=creditos,
+                        semanas=semanas if semanas else 16,
+                        tipo_horario=tipo_horario,
+                        tipo_profesor=tipo_profesor_normalizado,
+                        materia_codigo=materia_codigo
+                    )
+                final_hours = horas_reconocidas[formula_id] * (dedication_percentage / 100.0)
+                final_per = (session_per if session_per else 0) * (dedication_percentage / 100.0)
+
+                profesores = (unified_estructura
+                              .setdefault(dependencia_key, {})
+                              .setdefault(nivel_categoria, {})
+                              .setdefault(tipo_profesor_normalizado, {})
+                              .setdefault(session_classification, {})
+                              .setdefault(seccion_nrc, {}))
+
+                if profesor_id not in profesores:
+                    profesores[profesor_id] = {'horas': final_hours, 'per': final_per}
+                elif materia_codigo != 'ISIS-1221':
+                    horas_actuales = profesores[profesor_id]['horas']
+                    profesores[profesor_id]['horas'] = min(horas_actuales + final_hours, creditos)
+                else:
+                    profesores[profesor_id]['horas'] += final_hours
 
-            
             print("Unified structure calculation completed successfully.")
             return unified_estructura
-            
+
         except Exception as e:
             print(f"Error calculating unified structure: {e}")
             return {}
@@ -2998,6 +4613,10 @@ class DatabaseManager:
         
     
     def get_unified_recop_statistics(self) -> Dict:
+        """Get comprehensive statistics for both metrics (cached per data version)"""
+        return self.result_cache.get('unified_recop_statistics', self.compute_unified_recop_statistics)
+    
+    def compute_unified_recop_statistics(self) -> Dict:
         """Get comprehensive statistics for both metrics from unified calculation"""
         try:
             # Calculate the unified structure
@@ -1,7 +1,72 @@
 import pandas as pd
+import csv
 import json
-from typing import List, Dict, Optional
-from difflib import SequenceMatcher
+from typing import List, Dict, Optional, Iterable, Iterator
+from name_matching import CharacterCountIndex, name_similarity
+from spreadsheet_reader import SpreadsheetReader, is_spreadsheet
+
+# Materias of the engineering faculty kept from the raw dedication export
+DEPENDENCIAS_INGENIERIA = {
+    'MISW', 'IELE', 'MSIN', 'MBIT', 'CBPC', 'MIIA', 'IQYA', 'CBCA', 'MINE', 'IIND', 'ARTI',
+    'ISIS', 'IING', 'IDOC', 'MAIA', 'ICYA', 'MPET', 'DPRO', 'IBIO', 'IMEC', 'CBCO'
+}
+
+# Columns of the raw export (headers are padded with spaces, compared stripped)
+RAW_EXPORT_COLUMNS = {
+    'periodo': 'PERIODO',
+    'seccion': 'CRN',
+    'materia': 'MATERIA',
+    'profesores': 'PROFESOR_FRANJA1'
+}
+
+DEDICATION_COLUMNS = ['seccion', 'profesor', 'dedicacion', 'periodo']
+
+# Columns used to find the sheet and header row of either format in a workbook
+DEDICATION_SHEET_COLUMNS = list(RAW_EXPORT_COLUMNS.values()) + DEDICATION_COLUMNS
+
+_sheet_reader = SpreadsheetReader()
+
+
+def read_raw_export_rows(file_path: str) -> Iterator[List[str]]:
+    """
+    Rows of a dedication file as lists of text, the header first: the CSV is
+    streamed with csv.reader, an XLSX workbook is read through the sheet cache
+    (empty cells as '')
+    """
+    if is_spreadsheet(file_path):
+        sheet = _sheet_reader.read_sheet(file_path, DEDICATION_SHEET_COLUMNS)
+        yield [str(column) for column in sheet.columns]
+        for row in sheet.itertuples(index=False):
+            yield ['' if pd.isna(value) else value for value in row]
+        return
+    
+    with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+        yield from csv.reader(file)
+
+
+def detect_dedication_file_format(file_path: str) -> str:
+    """
+    'raw_export' for the raw schedule export with PROFESOR_FRANJA columns,
+    'dedication_csv' for a seccion,profesor,dedicacion,periodo file
+    """
+    if is_spreadsheet(file_path):
+        headers = _sheet_reader.read_header(file_path, DEDICATION_SHEET_COLUMNS)
+    else:
+        with open(file_path, 'r', encoding='utf-8-sig', newline='') as file:
+            headers = next(csv.reader(file), [])
+    
+    stripped = {str(header).strip() for header in headers}
+    if all(column in stripped for column in RAW_EXPORT_COLUMNS.values()):
+        return 'raw_export'
+    return 'dedication_csv'
+
+
+def read_dedication_frame(file_path: str) -> pd.DataFrame:
+    """A seccion,profesor,dedicacion,periodo file as read by pd.read_csv (CSV or XLSX)"""
+    if is_spreadsheet(file_path):
+        return _sheet_reader.infer_types(_sheet_reader.read_sheet(file_path, DEDICATION_SHEET_COLUMNS))
+    return pd.read_csv(file_path)
+
 
 class DedicationDataProcessor:
     """Processor for dedication data CSV files"""
@@ -11,12 +76,12 @@ class DedicationDataProcessor:
         self.match_threshold = 0.7  # Name similarity threshold
         
     def load_dedication_csv(self, file_path: str) -> pd.DataFrame:
-        """Load and validate dedication CSV file"""
+        """Load and validate dedication CSV (or XLSX) file"""
         try:
-            df = pd.read_csv(file_path)
+            df = read_dedication_frame(file_path)
             
             # Validate required columns
-            required_columns = ['seccion', 'profesor', 'dedicacion', 'periodo']
+            required_columns = DEDICATION_COLUMNS
             missing_columns = [col for col in required_columns if col not in df.columns]
             
             if missing_columns:
@@ -45,52 +110,191 @@ class DedicationDataProcessor:
         except Exception as e:
             raise Exception(f"Error loading dedication CSV: {str(e)}")
     
-    def find_professor_by_name(self, professor_name: str, nrc: int = None) -> Optional[Dict]:
-        """Find professor in database by name using similarity matching - OPTIMIZED for section-specific search"""
-        if not professor_name or pd.isna(professor_name):
-            return None
+    def iter_raw_dedication_export(self, file_path: str) -> Iterator[Dict]:
+        """
+        Stream dedication records out of the raw schedule export
+        
+        Rows whose materia is not in DEPENDENCIAS_INGENIERIA are skipped
+        before their professor column is parsed. The professor column holds
+        'id|NOMBRE|dedicacion' entries joined by '***'; as in the auxiliary
+        dedicacion.py program only the first franja is read, the first
+        dedication of a name in a section wins, and every record carries the
+        period of the first engineering row.
         
-        # Clean the name
-        clean_name = str(professor_name).strip().upper()
-        if not clean_name:
-            return None
+        Yields:
+            Dicts with seccion, profesor, dedicacion and periodo
+        """
+        reader = read_raw_export_rows(file_path)
+        headers = [header.strip() for header in next(reader, [])]
+        columns = {key: headers.index(name) for key, name in RAW_EXPORT_COLUMNS.items()}
+        last_column = max(columns.values())
         
+        periodo = ''
+        seen_names = {}
+        for row in reader:
+            if len(row) <= last_column:
+                continue
+            if row[columns['materia']].strip() not in DEPENDENCIAS_INGENIERIA:
+                continue
+            
+            if periodo == '':
+                periodo = row[columns['periodo']].strip()
+            seccion = row[columns['seccion']].strip()
+            content = row[columns['profesores']]
+            if not content:
+                continue
+            
+            section_names = seen_names.setdefault(seccion, set())
+            for prof in content.split('***'):
+                prof_info = prof.split('|')
+                if len(prof_info) < 3:
+                    continue
+                
+                name = prof_info[1].strip()
+                if name == '' or name in section_names:
+                    continue
+                section_names.add(name)
+                
+                try:
+                    dedicacion = float(prof_info[2].strip())
+                except ValueError:
+                    dedicacion = float('nan')
+                yield {
+                    'seccion': seccion,
+                    'profesor': name,
+                    'dedicacion': dedicacion,
+                    'periodo': periodo
+                }
+    
+    def find_professor_by_name(self, professor_name: str, nrc: int = None) -> Optional[Dict]:
+        """Find professor in database by name using similarity matching - OPTIMIZED for section-specific search"""
+        return self.find_professors_by_name([(professor_name, nrc)])[0]
+    
+    def load_lookup(self) -> Dict:
+        """
+        Preload everything dedication matching reads: the NRC set, the
+        SeccionProfesor adjacency and the professor directory (three queries)
+        """
+        return {
+            'nrcs': self.db_manager.get_all_nrcs(),
+            'section_professors': self.db_manager.get_section_professors_map(),
+            'professors': self.db_manager.get_all_profesores()
+        }
+    
+    def _get_search_pool(self, lookup: Dict, nrc: int = None):
+        """Professors to compare a name against and the scope of that search"""
         # OPTIMIZED: If NRC is provided, search only among professors assigned to that section
         if nrc:
-            section_professors = self.db_manager.get_section_professors(nrc)
+            section_professors = lookup['section_professors'].get(nrc)
             if section_professors:
-                print(f"Searching among {len(section_professors)} professors assigned to section {nrc}")
-                search_pool = section_professors
-            else:
-                print(f"No professors found for section {nrc}, searching all professors")
-                search_pool = self.db_manager.get_all_profesores()
-        else:
-            # Fallback to searching all professors
-            search_pool = self.db_manager.get_all_profesores()
-        
-        best_match = None
-        best_score = 0
-        
-        for prof in search_pool:
-            # Create full name for comparison
-            prof_full_name = f"{prof['apellidos']} {prof['nombres']}".upper()
+                return section_professors, 'section_specific'
+        
+        # Fallback to searching all professors
+        return lookup['professors'], 'global'
+    
+    def find_professors_by_name(self, name_requests: List[tuple], progress_callback=None,
+                                lookup: Dict = None) -> List[Optional[Dict]]:
+        """
+        Find the best professor match for many (professor_name, nrc) pairs at once
+        
+        Matching runs in memory on a preloaded lookup (see load_lookup). Every
+        name is scored in a single call to the db_manager's name scoring
+        backend, which only receives the professor name strings and the
+        candidate positions of each search pool.
+        
+        Returns:
+            One best match dict (or None) per request, as find_professor_by_name
+        """
+        if lookup is None:
+            lookup = self.load_lookup()
+        
+        results = [None] * len(name_requests)
+        queries = []
+        query_positions = []
+        candidate_ids = []
+        query_candidates = []
+        
+        # Each distinct professor gets one position in the names array
+        names = []
+        name_positions = {}
+        global_bounds = None
+        # A name searched again in the same pool reuses the first search
+        query_keys = {}
+        
+        for position, (professor_name, nrc) in enumerate(name_requests):
+            if not professor_name or pd.isna(professor_name):
+                continue
             
-            # Calculate similarity
-            similarity = self._calculate_name_similarity(clean_name, prof_full_name)
+            # Clean the name
+            clean_name = str(professor_name).strip().upper()
+            if not clean_name:
+                continue
             
-            if similarity > best_score and similarity >= self.match_threshold:
-                best_score = similarity
-                best_match = {
-                    'professor': prof,
-                    'similarity': similarity,
-                    'matched_name': prof_full_name,
-                    'search_scope': 'section_specific' if nrc and section_professors else 'global'
-                }
+            search_pool, search_scope = self._get_search_pool(lookup, nrc)
+            query_key = (clean_name, nrc if search_scope == 'section_specific' else None)
+            if query_key in query_keys:
+                query_positions[query_keys[query_key]].append(position)
+                continue
+            
+            # In the global pool, skip professors whose score cannot reach the threshold
+            reachable = None
+            if search_scope == 'global':
+                if global_bounds is None:
+                    global_bounds = CharacterCountIndex(
+                        [f"{prof['apellidos']} {prof['nombres']}" for prof in search_pool]
+                    )
+                reachable = (global_bounds.upper_bounds(clean_name) >= self.match_threshold).tolist()
+            
+            candidates = []
+            for pool_position, prof in enumerate(search_pool):
+                if reachable is not None and not reachable[pool_position]:
+                    continue
+                if prof['id'] not in name_positions:
+                    name_positions[prof['id']] = len(names)
+                    # Create full name for comparison
+                    names.append(f"{prof['apellidos']} {prof['nombres']}".upper())
+                candidates.append((prof, name_positions[prof['id']]))
+            
+            query_keys[query_key] = len(queries)
+            queries.append(clean_name)
+            query_positions.append([position])
+            candidate_ids.append([name_id for _, name_id in candidates])
+            query_candidates.append((candidates, search_scope))
         
-        return best_match
+        all_scores = self.db_manager.name_scoring.score(
+            queries, names, candidate_ids, progress_callback=progress_callback
+        )
+        
+        for positions, scores, (candidates, search_scope) in zip(query_positions, all_scores, query_candidates):
+            best_match = None
+            best_score = 0
+            
+            for (prof, name_id), similarity in zip(candidates, scores):
+                if similarity > best_score and similarity >= self.match_threshold:
+                    best_score = similarity
+                    best_match = {
+                        'professor': prof,
+                        'similarity': similarity,
+                        'matched_name': names[name_id],
+                        'search_scope': search_scope
+                    }
+            
+            for position in positions:
+                results[position] = dict(best_match) if best_match else None
+        
+        return results
     
-    def process_dedication_csv(self, file_path: str) -> Dict:
-        """Process dedication CSV and return matching results - UPDATED for efficient search"""
+    def process_dedication_csv(self, file_path: str, progress_callback=None) -> Dict:
+        """
+        Process dedication CSV and return matching results - UPDATED for efficient search
+        
+        Accepts a seccion,profesor,dedicacion,periodo file or the raw schedule
+        export with PROFESOR_FRANJA columns (see iter_raw_dedication_export).
+        
+        Sections and professors are preloaded once (load_lookup), rows are
+        validated in memory and all professor names are then matched in one
+        batch; progress_callback receives (scored pairs, total pairs).
+        """
         result = {
             'success': False,
             'matches': [],
@@ -106,15 +310,20 @@ class DedicationDataProcessor:
         }
         
         try:
-            # Load CSV
-            df = self.load_dedication_csv(file_path)
-            result['statistics']['total_rows'] = len(df)
+            # The raw export is streamed straight into the matcher
+            if detect_dedication_file_format(file_path) == 'raw_export':
+                records = self.iter_raw_dedication_export(file_path)
+            else:
+                records = self.load_dedication_csv(file_path).to_dict('records')
             
             # Track duplicates to enforce first-come-first-served
             seen_combinations = set()
+            lookup = self.load_lookup()
             
-            # Process each row
-            for index, row in df.iterrows():
+            # Validate each row, keeping the rows that need a professor match
+            pending_rows = []
+            for index, row in enumerate(records):
+                result['statistics']['total_rows'] += 1
                 try:
                     # Extract data
                     nrc = int(row['seccion'])
@@ -136,46 +345,57 @@ class DedicationDataProcessor:
                     result['statistics']['valid_rows'] += 1
                     
                     # Check if NRC exists first
-                    nrc_exists = self.validate_nrc_exists(nrc)
+                    nrc_exists = nrc in lookup['nrcs']
                     if nrc_exists:
                         result['statistics']['nrc_matches'] += 1
                     
-                    # OPTIMIZED: Find professor match using section-specific search
-                    prof_match = self.find_professor_by_name(professor_name, nrc if nrc_exists else None)
-                    professor_found = prof_match is not None
-                    if professor_found:
-                        result['statistics']['professor_matches'] += 1
-                    
-                    # Create match record
-                    match_record = {
-                        'row_index': index,
-                        'nrc': nrc,
-                        'professor_name': professor_name,
-                        'dedicacion': dedicacion,
-                        'periodo': periodo,
-                        'professor_match': prof_match,
-                        'professor_found': professor_found,
-                        'nrc_exists': nrc_exists,
-                        'can_apply': professor_found and nrc_exists,
-                        'issues': []
-                    }
-                    
-                    # Add issues
-                    if not professor_found:
-                        match_record['issues'].append(f"Professor '{professor_name}' not found in database")
-                    if not nrc_exists:
-                        match_record['issues'].append(f"NRC {nrc} not found in database")
-                    if dedicacion < 0 or dedicacion > 200:  # Allow up to 200% dedication
-                        match_record['issues'].append(f"Unusual dedication value: {dedicacion}%")
-                    
-                    if match_record['can_apply']:
-                        result['statistics']['ready_to_apply'] += 1
-                    
-                    result['matches'].append(match_record)
+                    pending_rows.append((index, nrc, professor_name, dedicacion, periodo, nrc_exists))
                     
                 except Exception as e:
                     result['errors'].append(f"Row {index + 1}: {str(e)}")
             
+            if result['statistics']['total_rows'] == 0:
+                raise ValueError("No dedication records found in file")
+            
+            # OPTIMIZED: Find every professor match in one batch using section-specific search
+            prof_matches = self.find_professors_by_name(
+                [(row[2], row[1] if row[5] else None) for row in pending_rows],
+                progress_callback=progress_callback, lookup=lookup
+            )
+            
+            for (index, nrc, professor_name, dedicacion, periodo, nrc_exists), prof_match in zip(
+                    pending_rows, prof_matches):
+                professor_found = prof_match is not None
+                if professor_found:
+                    result['statistics']['professor_matches'] += 1
+                
+                # Create match record
+                match_record = {
+                    'row_index': index,
+                    'nrc': nrc,
+                    'professor_name': professor_name,
+                    'dedicacion': dedicacion,
+                    'periodo': periodo,
+                    'professor_match': prof_match,
+                    'professor_found': professor_found,
+                    'nrc_exists': nrc_exists,
+                    'can_apply': professor_found and nrc_exists,
+                    'issues': []
+                }
+                
+                # Add issues
+                if not professor_found:
+                    match_record['issues'].append(f"Professor '{professor_name}' not found in database")
+                if not nrc_exists:
+                    match_record['issues'].append(f"NRC {nrc} not found in database")
+                if dedicacion < 0 or dedicacion > 200:  # Allow up to 200% dedication
+                    match_record['issues'].append(f"Unusual dedication value: {dedicacion}%")
+                
+                if match_record['can_apply']:
+                    result['statistics']['ready_to_apply'] += 1
+                
+                result['matches'].append(match_record)
+            
             result['success'] = True
             return result
             
@@ -185,24 +405,15 @@ class DedicationDataProcessor:
     
     def _calculate_name_similarity(self, name1: str, name2: str) -> float:
         """Calculate similarity between two names"""
-        if not name1 or not name2:
-            return 0.0
-        
-        # Normalize names
-        norm1 = ' '.join(name1.upper().split())
-        norm2 = ' '.join(name2.upper().split())
-        
-        return SequenceMatcher(None, norm1, norm2).ratio()
-    
-    def validate_nrc_exists(self, nrc: int) -> bool:
-        """Check if NRC exists in database"""
-        try:
-            return self.db_manager.nrc_exists(nrc)
-        except:
-            return False
+        return name_similarity(name1, name2)
     
     def apply_dedication_matches(self, approved_matches: List[Dict]) -> Dict:
-        """Apply approved dedication matches to update section records"""
+        """
+        Apply approved dedication matches to update section records
+        
+        Assignments are checked against the preloaded SeccionProfesor
+        adjacency and every section is written in a single transaction.
+        """
         results = {
             'updated': 0,
             'errors': [],
@@ -220,14 +431,19 @@ class DedicationDataProcessor:
                 nrc_groups[nrc] = []
             nrc_groups[nrc].append(match)
         
-        # Update each section
+        try:
+            section_professors = self.db_manager.get_section_professors_map()
+        except Exception as e:
+            results['errors'].append(f"Error loading section professors: {str(e)}")
+            return results
+        
+        # Collect the new dedicaciones of each section (only for matched professors)
+        dedicaciones_updates = {}
+        updated_sections = []
         for nrc, matches in nrc_groups.items():
             try:
-                # Get current dedicaciones for this section
-                current_dedicaciones = self.db_manager.get_seccion_profesor_dedicaciones(nrc)
-                
-                # Update with new dedicaciones (only for matched professors)
-                updated_dedicaciones = current_dedicaciones.copy()
+                assigned_ids = {prof['id'] for prof in section_professors.get(nrc, [])}
+                section_updates = {}
                 professor_updates = []
                 
                 for match in matches:
@@ -236,8 +452,8 @@ class DedicationDataProcessor:
                     dedicacion = int(match['dedicacion'])
                     
                     # Only update if this professor is assigned to this section
-                    if self._is_professor_assigned_to_section(profesor_id, nrc):
-                        updated_dedicaciones[profesor_id] = dedicacion
+                    if profesor_id in assigned_ids:
+                        section_updates[profesor_id] = dedicacion
                         professor_updates.append({
                             'profesor_id': profesor_id,
                             'profesor_name': f"{prof_info['nombres']} {prof_info['apellidos']}",
@@ -249,35 +465,29 @@ class DedicationDataProcessor:
                             f"is not assigned to section {nrc} - skipping dedication update"
                         )
                 
-                # Apply updates if any professors were updated
                 if professor_updates:
-                    if self.db_manager.update_seccion_profesor_dedicaciones(nrc, updated_dedicaciones):
-                        results['updated'] += 1
-                        results['updated_sections'].append({
-                            'nrc': nrc,
-                            'professor_updates': professor_updates,
-                            'total_dedicacion': sum(d['dedicacion'] for d in professor_updates)
-                        })
-                    else:
-                        results['errors'].append(f"Failed to update section {nrc}")
+                    dedicaciones_updates[nrc] = section_updates
+                    updated_sections.append({
+                        'nrc': nrc,
+                        'professor_updates': professor_updates,
+                        'total_dedicacion': sum(d['dedicacion'] for d in professor_updates)
+                    })
                 
             except Exception as e:
                 results['errors'].append(f"Error updating section {nrc}: {str(e)}")
         
+        # Apply all sections at once
+        if dedicaciones_updates:
+            if self.db_manager.merge_seccion_dedicaciones(dedicaciones_updates):
+                results['updated'] = len(updated_sections)
+                results['updated_sections'] = updated_sections
+            else:
+                results['errors'].append(
+                    f"Failed to update {len(dedicaciones_updates)} sections - no changes were applied"
+                )
+        
         return results
     
-    def _is_professor_assigned_to_section(self, profesor_id: int, nrc: int) -> bool:
-        """Check if professor is assigned to section"""
-        try:
-            result = self.db_manager.execute_query(
-                "SELECT COUNT(*) FROM SeccionProfesor WHERE profesor_id = ? AND seccion_NRC = ?",
-                (profesor_id, nrc),
-                fetch_one=True
-            )
-            return result[0] > 0
-        except Exception:
-            return False
-    
     def get_processing_statistics(self, matches: List[Dict]) -> Dict:
         """Generate statistics about the processing results"""
         stats = {
@@ -316,14 +526,39 @@ def validate_dedication_csv_file(file_path: str) -> Dict:
             result['errors'].append("File does not exist")
             return result
         
-        if not file_path.lower().endswith('.csv'):
-            result['warnings'].append("File does not have .csv extension")
+        if not file_path.lower().endswith('.csv') and not is_spreadsheet(file_path):
+            result['warnings'].append("File does not have .csv or .xlsx extension")
+        
+        # Raw schedule export: count the engineering rows in one streaming pass
+        if detect_dedication_file_format(file_path) == 'raw_export':
+            total_rows = 0
+            engineering_rows = 0
+            reader = read_raw_export_rows(file_path)
+            headers = [header.strip() for header in next(reader, [])]
+            materia_column = headers.index(RAW_EXPORT_COLUMNS['materia'])
+            for row in reader:
+                total_rows += 1
+                if len(row) > materia_column and row[materia_column].strip() in DEPENDENCIAS_INGENIERIA:
+                    engineering_rows += 1
+            
+            if engineering_rows == 0:
+                result['errors'].append("No engineering sections found in raw export")
+            
+            result['file_info'] = {
+                'total_rows': total_rows,
+                'engineering_rows': engineering_rows,
+                'columns': list(RAW_EXPORT_COLUMNS.values()),
+                'file_size_mb': round(os.path.getsize(file_path) / (1024 * 1024), 2),
+                'format': 'raw_export'
+            }
+            result['valid'] = not result['errors']
+            return result
         
         # Try to read the file
-        df = pd.read_csv(file_path)
+        df = read_dedication_frame(file_path)
         
         # Check required columns
-        required_columns = ['seccion', 'profesor', 'dedicacion', 'periodo']
+        required_columns = DEDICATION_COLUMNS
         missing_columns = [col for col in required_columns if col not in df.columns]
         
         if missing_columns:
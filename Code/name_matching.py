@@ -0,0 +1,442 @@
+import heapq
+import os
+from array import array
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_name(name: str) -> str:
+    """Uppercase and collapse whitespace, the same normalization used before scoring names"""
+    if not name:
+        return ''
+    return ' '.join(str(name).upper().split())
+
+
+def name_similarity(name1: str, name2: str) -> float:
+    """
+    Similarity between two names (SequenceMatcher ratio of the normalized names)
+
+    Args:
+        name1: First name string
+        name2: Second name string
+
+    Returns:
+        Similarity score between 0 and 1
+    """
+    if not name1 or not name2:
+        return 0.0
+    return SequenceMatcher(None, normalize_name(name1), normalize_name(name2)).ratio()
+
+
+def split_three_part_name(name_parts: Sequence[str], choice: int) -> Tuple[str, str]:
+    """
+    Split a three-part name into (nombres, apellidos)
+
+    Args:
+        name_parts: The three name parts
+        choice: 1 for two nombres + one apellido, 2 for one nombre + two apellidos
+
+    Returns:
+        Tuple of (nombres, apellidos)
+    """
+    part1, part2, part3 = name_parts
+    if choice == 1:
+        return f"{part1} {part2}", part3
+    return part1, f"{part2} {part3}"
+
+
+# Seed of the name-split knowledge base (the rules the CSV import started with)
+DEFAULT_COMPOUND_FIRST_NAMES = {
+    'ANA MARIA', 'MARIA ELENA', 'JOSE LUIS', 'JUAN CARLOS', 'LUIS FERNANDO',
+    'MARIA FERNANDA', 'ANA LUCIA', 'CARLOS ANDRES', 'JUAN PABLO', 'MARIA JOSE',
+    'LUIS MIGUEL', 'JOSE ANTONIO', 'MARIA CRISTINA', 'ANA SOFIA', 'DIEGO ALEJANDRO',
+    'SANDRA PATRICIA', 'CLAUDIA PATRICIA', 'MARTHA LUCIA', 'GLORIA ELENA'
+}
+DEFAULT_SURNAME_PARTICLES = {'DE', 'DEL', 'LA', 'LAS', 'LOS', 'VAN', 'VON', 'MC', 'MAC', 'D'}
+
+
+class NameSplitKnowledge:
+    """
+    In-memory name-split knowledge base: compound first names, surname
+    particles and the split choice of every resolved three-part name.
+    Loaded once per DatabaseManager from the NameSplitKnowledge table and kept
+    in sync by DatabaseManager.learn_name_splits.
+    """
+
+    def __init__(self, compound_first_names: Iterable[str] = (),
+                 surname_particles: Iterable[str] = (), full_names: Optional[dict] = None):
+        self.compound_first_names = {normalize_name(name) for name in compound_first_names}
+        self.surname_particles = {normalize_name(particle) for particle in surname_particles}
+        self.full_names = {normalize_name(name): choice for name, choice in (full_names or {}).items()}
+
+    def resolve(self, name_parts: Sequence[str]) -> Optional[int]:
+        """
+        Split choice of a three-part name (1 = two nombres, 2 = two apellidos)
+        from a known full name, a compound first name or a surname particle
+
+        Returns:
+            The choice, or None if the knowledge base can't tell
+        """
+        choice = self.known_choice(' '.join(name_parts))
+        if choice is not None:
+            return choice
+
+        part1, part2, _ = name_parts
+        if normalize_name(f"{part1} {part2}") in self.compound_first_names:
+            return 1
+        if normalize_name(part2) in self.surname_particles:
+            return 2
+        return None
+
+    def known_choice(self, full_name: str) -> Optional[int]:
+        """Stored split choice of a full name, None if it was never resolved"""
+        return self.full_names.get(normalize_name(full_name))
+
+    def learn(self, full_name: str, choice: int):
+        """Remember the split choice of a full name"""
+        self.full_names[normalize_name(full_name)] = choice
+
+    def learn_compound_first_name(self, name: str):
+        """Remember a compound first name"""
+        self.compound_first_names.add(normalize_name(name))
+
+
+class CharacterCountIndex:
+    """
+    Character count matrix of a fixed list of names, giving an upper bound of
+    name_similarity of a query against every name in one numpy pass.
+
+    The bound is SequenceMatcher.quick_ratio on the normalized names:
+    2 * (characters in common, counted with multiplicity) / (sum of lengths).
+    The matching blocks SequenceMatcher finds can't hold more characters
+    than the two names share, so pairs whose bound is below a threshold can
+    be skipped without running SequenceMatcher.
+    """
+
+    def __init__(self, names: Sequence[str]):
+        normalized = [normalize_name(name) for name in names]
+        alphabet = sorted(set(''.join(normalized)))
+        self.columns = {char: column for column, char in enumerate(alphabet)}
+        self.counts = np.zeros((len(normalized), len(alphabet)), dtype=np.int32)
+        for row, name in enumerate(normalized):
+            for char, count in Counter(name).items():
+                self.counts[row, self.columns[char]] = count
+        self.lengths = np.array([len(name) for name in normalized], dtype=np.int32)
+
+    def upper_bounds(self, query: str) -> np.ndarray:
+        """Upper bound of name_similarity of the query against every name (0 for empty names)"""
+        normalized = normalize_name(query)
+        query_counts = np.zeros(len(self.columns), dtype=np.int32)
+        for char, count in Counter(normalized).items():
+            if char in self.columns:
+                query_counts[self.columns[char]] = count
+
+        matches = np.minimum(self.counts, query_counts).sum(axis=1)
+        totals = self.lengths + len(normalized)
+        bounds = np.divide(2.0 * matches, totals, out=np.zeros(len(totals)), where=totals > 0)
+        if not normalized:
+            bounds[:] = 0.0
+        bounds[self.lengths == 0] = 0.0
+        return bounds
+
+
+class NameCandidateIndex:
+    """
+    Candidate generation for fuzzy name matching.
+
+    Built once over the names of one file: an inverted index from character
+    n-grams to the names containing them, plus surname blocking keys. A query
+    only has to be scored exactly (SequenceMatcher) against the names that
+    share the most n-grams with it and the names in its surname blocks,
+    instead of against every name in the file.
+    """
+
+    # Particles that appear in too many surnames to be useful blocking keys
+    SURNAME_STOPWORDS = {'DE', 'DEL', 'LA', 'LAS', 'LOS', 'Y', 'SAN', 'VAN', 'VON'}
+
+    def __init__(self, names: List[str], surnames: Optional[List[str]] = None,
+                 ngram_size: int = 3, top_k: int = 20):
+        """
+        Args:
+            names: Names to index, in file order (candidate ids are positions in this list)
+            surnames: Optional surname string for each name; defaults to the whole name
+            ngram_size: Length of the character n-grams
+            top_k: Number of best n-gram candidates kept for each query
+        """
+        self.names = list(names)
+        self.ngram_size = ngram_size
+        self.top_k = top_k
+        self.ngram_postings = defaultdict(list)
+        self.surname_postings = defaultdict(list)
+        self.ngram_counts = []
+
+        for name_id, name in enumerate(self.names):
+            ngrams = self.ngrams(name)
+            self.ngram_counts.append(len(ngrams))
+            for ngram in ngrams:
+                self.ngram_postings[ngram].append(name_id)
+
+            block_source = surnames[name_id] if surnames is not None else name
+            for key in self.blocking_keys(block_source):
+                self.surname_postings[key].append(name_id)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def ngrams(self, name: str) -> set:
+        """Set of padded character n-grams of a normalized name"""
+        padded = f" {normalize_name(name)} "
+        return {padded[i:i + self.ngram_size] for i in range(len(padded) - self.ngram_size + 1)}
+
+    def blocking_keys(self, surnames: str) -> set:
+        """Surname tokens used as blocking keys"""
+        return {
+            token for token in normalize_name(surnames).split()
+            if len(token) > 2 and token not in self.SURNAME_STOPWORDS
+        }
+
+    def candidates(self, name: str, surnames: Optional[str] = None) -> List[int]:
+        """
+        Ids of the names worth scoring for a query, in index order
+
+        Args:
+            name: Query name
+            surnames: Surnames of the query, used for blocking (defaults to the whole name)
+
+        Returns:
+            Sorted list of candidate ids: the top_k names by n-gram Dice
+            coefficient plus every name sharing a surname block
+        """
+        query_ngrams = self.ngrams(name)
+        shared = Counter()
+        for ngram in query_ngrams:
+            shared.update(self.ngram_postings.get(ngram, ()))
+
+        query_size = len(query_ngrams)
+        best = heapq.nlargest(
+            self.top_k, shared.items(),
+            key=lambda item: 2 * item[1] / (query_size + self.ngram_counts[item[0]])
+        )
+        candidate_ids = {name_id for name_id, _ in best}
+
+        for key in self.blocking_keys(surnames if surnames is not None else name):
+            candidate_ids.update(self.surname_postings.get(key, ()))
+
+        return sorted(candidate_ids)
+
+    def best_match(self, name: str, similarity: Callable[[str, str], float], threshold: float,
+                   surnames: Optional[str] = None,
+                   candidate_ids: Optional[Iterable[int]] = None) -> Tuple[Optional[int], float]:
+        """
+        Best scoring name for a query among its candidates
+
+        Candidates are scored in index order and only a strictly better score
+        replaces the current best, so ties resolve to the earliest name exactly
+        as a full scan over the file does.
+
+        Args:
+            name: Query name
+            similarity: Exact scoring function (query, indexed name) -> score
+            threshold: Minimum score for a match
+            surnames: Surnames of the query, used for blocking
+            candidate_ids: Ids to score instead of the generated candidates
+                (range(len(index)) gives the brute-force scan)
+
+        Returns:
+            Tuple of (name id or None, score)
+        """
+        if candidate_ids is None:
+            candidate_ids = self.candidates(name, surnames)
+
+        best_id = None
+        best_score = 0
+        for name_id in candidate_ids:
+            score = similarity(name, self.names[name_id])
+            if score > best_score and score >= threshold:
+                best_score = score
+                best_id = name_id
+
+        return best_id, best_score
+
+
+# ==================== PARALLEL SCORING ====================
+
+# Names and scorer of the current scoring job, set once in each worker process
+_worker_names = []
+_worker_scorer = name_similarity
+
+
+def _init_worker(names: List[str], scorer: Callable[[str, str], float]):
+    global _worker_names, _worker_scorer
+    _worker_names = names
+    _worker_scorer = scorer
+
+
+def _score_shard(queries: List[str], candidate_ids: Optional[List[array]]) -> List[List[float]]:
+    """Score a shard of queries in a worker process"""
+    return _score_queries(_worker_names, _worker_scorer, queries, candidate_ids)
+
+
+class _ProgressStopped(Exception):
+    """Carries an exception raised by a progress callback out of the parallel path"""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _score_queries(names: List[str], scorer: Callable[[str, str], float], queries: List[str],
+                   candidate_ids: Optional[List[array]]) -> List[List[float]]:
+    """Score queries against their candidate names (every name when candidate_ids is None)"""
+    if candidate_ids is None:
+        return [[scorer(query, name) for name in names] for query in queries]
+    return [
+        [scorer(query, names[name_id]) for name_id in ids]
+        for query, ids in zip(queries, candidate_ids)
+    ]
+
+
+class NameScoringBackend:
+    """
+    Pluggable backend for exact name scoring.
+
+    Scores queries against a list of names, either every name or a candidate
+    list per query. Large jobs are sharded by query across a
+    ProcessPoolExecutor; workers receive the name list once (as the pool
+    initializer) and each shard only carries its query strings and compact
+    candidate id arrays, never DataFrame rows or professor dicts. Jobs below
+    min_parallel_pairs, single-core machines and pools that fail to start
+    run serially in the calling process with the same scorer.
+    """
+
+    def __init__(self, scorer: Callable[[str, str], float] = name_similarity,
+                 max_workers: Optional[int] = None, min_parallel_pairs: int = 50000,
+                 shard_pairs: int = 5000):
+        """
+        Args:
+            scorer: Module-level (picklable) function (query, name) -> score
+            max_workers: Worker processes (defaults to the CPU count)
+            min_parallel_pairs: Smallest job sent to the process pool
+            shard_pairs: Approximate number of pairs per shard
+        """
+        self.scorer = scorer
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_parallel_pairs = min_parallel_pairs
+        self.shard_pairs = shard_pairs
+
+    def _shards(self, queries: Sequence[str], candidate_ids: Optional[List[array]],
+                name_count: int) -> List[Tuple[int, int, int]]:
+        """(start, end, pairs) query ranges of roughly shard_pairs pairs each"""
+        shards = []
+        start = 0
+        pairs = 0
+        for position in range(len(queries)):
+            pairs += name_count if candidate_ids is None else len(candidate_ids[position])
+            if pairs >= self.shard_pairs:
+                shards.append((start, position + 1, pairs))
+                start = position + 1
+                pairs = 0
+        if start < len(queries):
+            shards.append((start, len(queries), pairs))
+        return shards
+
+    def score(self, queries: Sequence[str], names: Sequence[str],
+              candidate_ids: Optional[Sequence[Iterable[int]]] = None,
+              progress_callback: Optional[Callable[[int, int], None]] = None) -> List[List[float]]:
+        """
+        Score each query against its candidate names
+
+        Args:
+            queries: Query names
+            names: Names to score against
+            candidate_ids: Ids into names for each query (None scores every name)
+            progress_callback: Called with (scored pairs, total pairs) after each shard
+
+        Returns:
+            For each query, the scores in the order of its candidate ids
+        """
+        queries = list(queries)
+        names = list(names)
+        if candidate_ids is not None:
+            candidate_ids = [array('l', ids) for ids in candidate_ids]
+
+        shards = self._shards(queries, candidate_ids, len(names))
+        total_pairs = sum(pairs for _, _, pairs in shards)
+        scores = [None] * len(queries)
+
+        if self.max_workers > 1 and len(shards) > 1 and total_pairs >= self.min_parallel_pairs:
+            try:
+                self._score_parallel(queries, names, candidate_ids, shards, scores, total_pairs,
+                                     progress_callback)
+                return scores
+            except _ProgressStopped as stopped:
+                raise stopped.error
+            except Exception as e:
+                print(f"Parallel name scoring failed, scoring serially: {e}")
+
+        done_pairs = 0
+        for start, end, pairs in shards:
+            shard_ids = candidate_ids[start:end] if candidate_ids is not None else None
+            scores[start:end] = _score_queries(names, self.scorer, queries[start:end], shard_ids)
+            done_pairs += pairs
+            if progress_callback:
+                progress_callback(done_pairs, total_pairs)
+        return scores
+
+    def _score_parallel(self, queries, names, candidate_ids, shards, scores, total_pairs,
+                        progress_callback):
+        """Score the shards in a process pool, filling scores in place"""
+        workers = min(self.max_workers, len(shards))
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(names, self.scorer)) as executor:
+            futures = {}
+            for start, end, pairs in shards:
+                shard_ids = candidate_ids[start:end] if candidate_ids is not None else None
+                future = executor.submit(_score_shard, queries[start:end], shard_ids)
+                futures[future] = (start, end, pairs)
+
+            done_pairs = 0
+            for future in as_completed(futures):
+                start, end, pairs = futures[future]
+                scores[start:end] = future.result()
+                done_pairs += pairs
+                if progress_callback:
+                    try:
+                        progress_callback(done_pairs, total_pairs)
+                    except Exception as e:
+                        # The caller stopped the scoring (a cancelled task): drop the queued shards
+                        executor.shutdown(wait=True, cancel_futures=True)
+                        raise _ProgressStopped(e)
+
+    def best_matches(self, queries: Sequence[str], names: Sequence[str], threshold: float,
+                     candidate_ids: Optional[Sequence[Iterable[int]]] = None,
+                     progress_callback: Optional[Callable[[int, int], None]] = None
+                     ) -> List[Tuple[Optional[int], float]]:
+        """
+        Best scoring name for each query
+
+        Candidates are compared in the order given and only a strictly better
+        score replaces the current best, like a serial scan.
+
+        Returns:
+            For each query, a tuple of (name id or None, score)
+        """
+        if candidate_ids is not None:
+            candidate_ids = [list(ids) for ids in candidate_ids]
+        all_scores = self.score(queries, names, candidate_ids, progress_callback)
+
+        results = []
+        for position, scores in enumerate(all_scores):
+            ids = candidate_ids[position] if candidate_ids is not None else range(len(names))
+            best_id = None
+            best_score = 0
+            for name_id, score in zip(ids, scores):
+                if score > best_score and score >= threshold:
+                    best_score = score
+                    best_id = name_id
+            results.append((best_id, best_score))
+        return results
@@ -4,8 +4,29 @@ import pandas as pd
 import os
 import re
 from typing import List, Dict, Tuple, Optional
-from difflib import SequenceMatcher
 from database import DatabaseManager
+from name_matching import NameCandidateIndex, name_similarity, normalize_name
+from spreadsheet_reader import SpreadsheetReader, canonical_columns, is_spreadsheet
+
+# Columns read from the personal data export; headers written as
+# 'Facultad / Unidad' or 'Número de persona' are renamed to these
+PERSONAL_DATA_COLUMNS = [
+    'Facultad_Unidad', 'Dependencia', 'Cargo', 'Número_de_persona', 'Apellido_y_Nombre',
+    'Tipo_de_contrato', 'Categoría_de_ordenamiento', 'Subcategoría_de_ordenamiento', 'Categoría_Especial'
+]
+
+_sheet_reader = SpreadsheetReader()
+
+
+def read_personal_data_file(file_path: str) -> pd.DataFrame:
+    """Read a personal data export (CSV, or XLSX with its title rows skipped) with canonical headers"""
+    if is_spreadsheet(file_path):
+        return _sheet_reader.read_sheet(file_path, PERSONAL_DATA_COLUMNS, typed=True)
+    
+    df = pd.read_csv(file_path)
+    df.columns = canonical_columns(df.columns, PERSONAL_DATA_COLUMNS)
+    return df
+
 
 class PersonalDataProcessor:
     """Processor for integrating personal data with existing professor records"""
@@ -299,22 +320,27 @@ class PersonalDataProcessor:
         Returns:
             Similarity score between 0 and 1
         """
-        if not name1 or not name2:
-            return 0.0
-        
-        # Normalize names (uppercase, remove extra spaces)
-        norm1 = ' '.join(name1.upper().split())
-        norm2 = ' '.join(name2.upper().split())
-        
-        # Calculate similarity using SequenceMatcher
-        return SequenceMatcher(None, norm1, norm2).ratio()
+        # Uppercase, collapse spaces and compare with SequenceMatcher
+        return name_similarity(name1, name2)
     
     # Update this part in the find_matching_professors method in personal_data_processor.py:
     
-    def find_matching_professors(self, personal_data_df: pd.DataFrame) -> List[Dict]:
+    def find_matching_professors(self, personal_data_df: pd.DataFrame, brute_force: bool = False,
+                                 progress_callback=None, use_crosswalk: bool = True,
+                                 source_file: str = '') -> List[Dict]:
         """
         Find matching professors between personal data and existing database
         MODIFIED: Find best personal data match for each existing professor
+
+        People already in the PersonalDataCrosswalk are resolved by person_id
+        (or name key) without fuzzy matching; only new or changed rows go on
+        to fuzzy matching (use_crosswalk=False matches everything).
+
+        The personal data names are indexed once (character trigrams plus
+        surname blocks) and each professor is only scored against its top
+        candidates. brute_force=True scores every record, as a reference.
+        Scoring runs on the db_manager's name scoring backend, which reports
+        (scored pairs, total pairs) to progress_callback.
         """
         matches = []
         
@@ -364,26 +390,56 @@ class PersonalDataProcessor:
                     'subcategoria_ordenamiento': subcategoria_ordenamiento,
                     'categoria_especial': categoria_especial,
                     'dependencia': dependencia,
-                    'tipo_contrato': tipo_contrato
+                    'tipo_contrato': tipo_contrato,
+                    'source_file': source_file
                 },
                 'position_info': position_info
             })
         
-        # Now, for each existing professor, find the best match in personal data
+        # Resolve people already linked in the crosswalk
+        resolved = self.resolve_from_crosswalk(personal_data_records, existing_professors) if use_crosswalk else {}
         for existing_prof in existing_professors:
+            if existing_prof['id'] in resolved:
+                matches.append({
+                    'personal_data': resolved[existing_prof['id']]['personal_data'],
+                    'existing_professor': existing_prof,
+                    'position_info': resolved[existing_prof['id']]['position_info'],
+                    'match_confidence': 1.0,
+                    'match_type': 'automatic',
+                    'match_source': 'crosswalk'
+                })
+        
+        # Only new or changed people go through fuzzy matching
+        if resolved:
+            resolved_records = {id(record) for record in resolved.values()}
+            personal_data_records = [
+                record for record in personal_data_records if id(record) not in resolved_records
+            ]
+            existing_professors = [
+                existing_prof for existing_prof in existing_professors if existing_prof['id'] not in resolved
+            ]
+        
+        # Index the personal data names once for candidate generation
+        name_index = NameCandidateIndex(
+            [record['personal_data']['full_name_standardized'] for record in personal_data_records],
+            surnames=[record['personal_data']['apellidos'] for record in personal_data_records]
+        )
+        
+        # Score only the indexed candidates (every record when brute_force)
+        existing_names = [existing_prof['full_name'] for existing_prof in existing_professors]
+        candidate_ids = None if brute_force else [
+            name_index.candidates(existing_prof['full_name'], existing_prof.get('apellidos'))
+            for existing_prof in existing_professors
+        ]
+        best_matches = self.db_manager.name_scoring.best_matches(
+            existing_names, name_index.names, self.match_threshold,
+            candidate_ids=candidate_ids, progress_callback=progress_callback
+        )
+        
+        # Now, for each existing professor, take the best match in personal data
+        for existing_prof, (best_id, best_score) in zip(existing_professors, best_matches):
             existing_full_name = existing_prof['full_name']
-            
-            best_match_record = None
-            best_score = 0
-            
-            # Search through all personal data records for the best match
-            for record in personal_data_records:
-                personal_full_name = record['personal_data']['full_name_standardized']
-                similarity = self.calculate_name_similarity(existing_full_name, personal_full_name)
-                
-                if similarity > best_score and similarity >= self.match_threshold:
-                    best_score = similarity
-                    best_match_record = record
+            best_match_record = personal_data_records[best_id] if best_id is not None else None
             
             # If we found a good match, add it to results
             if best_match_record:
@@ -397,7 +453,8 @@ class PersonalDataProcessor:
                     'existing_professor': existing_prof,
                     'position_info': best_match_record['position_info'],
                     'match_confidence': best_score,
-                    'match_type': 'automatic' if best_score >= 0.95 else 'review_needed'
+                    'match_type': 'automatic' if best_score >= 0.95 else 'review_needed',
+                    'match_source': 'fuzzy'
                 }
                 matches.append(match_record)
             '''
@@ -411,18 +468,62 @@ class PersonalDataProcessor:
         #print(f"DEBUG: Found {len(matches)} matches for {len(existing_professors)} existing professors")
         return matches
     
+    def _person_id_value(self, person_id) -> Optional[int]:
+        """Número de persona as an int, None when missing"""
+        try:
+            if person_id is None or pd.isna(person_id) or person_id == '':
+                return None
+            return int(person_id)
+        except (TypeError, ValueError):
+            return None
+    
+    def resolve_from_crosswalk(self, personal_data_records: List[Dict],
+                               existing_professors: List[Dict]) -> Dict[int, Dict]:
+        """
+        Resolve personal data records to professors through the crosswalk
+        
+        A record is resolved by its Número de persona, or by its name key
+        when the crosswalk entry for that name has no person_id or the same
+        one. A name whose crosswalk entry belongs to a different person_id
+        is treated as changed and left for fuzzy matching.
+        
+        Returns:
+            Dictionary profesor_id -> personal data record
+        """
+        crosswalk = self.db_manager.get_personal_data_crosswalk()
+        by_person_id = {entry['person_id']: entry for entry in crosswalk if entry['person_id'] is not None}
+        by_name_key = {entry['name_key']: entry for entry in crosswalk if entry['name_key']}
+        professor_ids = {existing_prof['id'] for existing_prof in existing_professors}
+        
+        resolved = {}
+        for record in personal_data_records:
+            person_id = self._person_id_value(record['personal_data']['person_id'])
+            entry = by_person_id.get(person_id) if person_id is not None else None
+            
+            if entry is None:
+                entry = by_name_key.get(normalize_name(record['personal_data']['full_name_standardized']))
+                if entry is not None and None not in (entry['person_id'], person_id) \
+                        and entry['person_id'] != person_id:
+                    entry = None
+            
+            if entry is not None and entry['profesor_id'] in professor_ids \
+                    and entry['profesor_id'] not in resolved:
+                resolved[entry['profesor_id']] = record
+        
+        return resolved
+    
     def load_personal_data_csv(self, file_path: str) -> pd.DataFrame:
         """
-        Load and validate personal data CSV file
+        Load and validate personal data CSV or XLSX file
         
         Args:
-            file_path: Path to the personal data CSV file
+            file_path: Path to the personal data CSV or XLSX file
             
         Returns:
             DataFrame with personal data
         """
         try:
-            df = pd.read_csv(file_path)
+            df = read_personal_data_file(file_path)
             
             # Validate required columns
             required_columns = [
@@ -504,16 +605,19 @@ class PersonalDataProcessor:
             'updated_professors': []
         }
         
+        crosswalk_entries = []
+        
         for match in approved_matches:
             try:
                 prof_id = match['existing_professor']['id']
                 personal_data = match['personal_data']
                 position_info = match['position_info']
+                person_id = self._person_id_value(personal_data['person_id'])
                 
                 # Update professor with personal data
                 success = self.db_manager.update_professor_personal_data(
                     profesor_id=prof_id,
-                    person_id=int(personal_data['person_id']) if personal_data['person_id'] else None,
+                    person_id=person_id,
                     cargo_original=position_info['cargo_original'],
                     tipo_enhanced=position_info['tipo'],
                     subcategoria=position_info['subcategoria'],
@@ -531,12 +635,23 @@ class PersonalDataProcessor:
                         'dependencia': position_info['dependencia'],
                         'contrato': position_info['contrato']
                     })
+                    crosswalk_entries.append({
+                        'profesor_id': prof_id,
+                        'person_id': person_id,
+                        'name_key': normalize_name(personal_data['full_name_standardized']),
+                        'confidence': match['match_confidence'],
+                        'source_file': personal_data.get('source_file')
+                    })
                 else:
                     results['errors'].append(f"Failed to update professor ID {prof_id}")
                     
             except Exception as e:
                 results['errors'].append(f"Error updating professor: {str(e)}")
         
+        # Remember the approved links so the next file resolves them directly
+        if crosswalk_entries:
+            self.db_manager.save_personal_data_crosswalk(crosswalk_entries)
+        
         return results
 
 # Test functions
@@ -598,12 +713,13 @@ class PersonalDataLinkingEngine:
         self.approved_matches = []
         self.rejected_matches = []
     
-    def load_and_process_personal_data(self, file_path: str) -> Dict:
+    def load_and_process_personal_data(self, file_path: str, progress_callback=None) -> Dict:
         """
         Load personal data file and find matches with existing professors
         
         Args:
             file_path: Path to personal data CSV file
+            progress_callback: Optional callable receiving (scored pairs, total pairs)
             
         Returns:
             Dictionary with processing results
@@ -629,7 +745,9 @@ class PersonalDataLinkingEngine:
             }
             
             # Find matches
-            matches = self.processor.find_matching_professors(df)
+            matches = self.processor.find_matching_professors(
+                df, progress_callback=progress_callback, source_file=os.path.basename(file_path)
+            )
             self.current_matches = matches
             
             # Generate statistics
@@ -639,6 +757,7 @@ class PersonalDataLinkingEngine:
             statistics['file_info'] = result['file_info']
             statistics['existing_professors_count'] = len(self.db_manager.get_all_profesores())
             statistics['professors_without_personal_data'] = len(self.db_manager.get_professors_without_personal_data())
+            statistics['crosswalk_matches'] = sum(1 for m in matches if m.get('match_source') == 'crosswalk')
             
             result.update({
                 'success': True,
@@ -878,11 +997,11 @@ def validate_personal_data_file(file_path: str) -> Dict:
             result['errors'].append("File does not exist")
             return result
         
-        if not file_path.lower().endswith('.csv'):
-            result['warnings'].append("File does not have .csv extension")
+        if not file_path.lower().endswith('.csv') and not is_spreadsheet(file_path):
+            result['warnings'].append("File does not have .csv or .xlsx extension")
         
         # Try to read the file
-        df = pd.read_csv(file_path)
+        df = read_personal_data_file(file_path)
         
         # Check required columns
         required_columns = [
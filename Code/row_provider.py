@@ -0,0 +1,142 @@
+from collections import OrderedDict
+from typing import Callable, List, Optional, Sequence
+
+
+class RowProvider:
+    """
+    Source of the rows shown by a VirtualTreeview.
+
+    The grid only asks for the count and for the window of rows it is about
+    to display, so a provider never has to hold the whole result.
+    """
+
+    def count(self) -> int:
+        """Total number of rows"""
+        raise NotImplementedError
+
+    def rows(self, start: int, stop: int) -> List[tuple]:
+        """Display rows start..stop-1 (formatted, clamped to the count)"""
+        raise NotImplementedError
+
+    def row(self, index: int) -> Optional[tuple]:
+        """Display row index (None when out of range)"""
+        rows = self.rows(index, index + 1)
+        return rows[0] if rows else None
+
+    def invalidate(self):
+        """Forget cached rows and counts (the underlying data changed)"""
+        pass
+
+
+class SequenceRowProvider(RowProvider):
+    """
+    Rows from an in-memory sequence, formatted only when displayed
+
+    Args:
+        items: Source items (already filtered and ordered)
+        formatter: Turns an item into its display row (default: the item itself)
+    """
+
+    def __init__(self, items: Sequence, formatter: Callable = None):
+        self.items = items
+        self.formatter = formatter
+
+    def count(self) -> int:
+        return len(self.items)
+
+    def rows(self, start: int, stop: int) -> List[tuple]:
+        window = self.items[max(start, 0):stop]
+        if self.formatter:
+            return [self.formatter(item) for item in window]
+        return list(window)
+
+    def item(self, index: int):
+        """Source item behind display row index"""
+        return self.items[index]
+
+
+class PagedRowProvider(RowProvider):
+    """
+    Rows fetched from the database in pages, on demand
+
+    Pages are PAGE_ROWS rows long and kept in a small LRU cache. A request
+    also fetches the page on each side of the window, in the same query,
+    so scrolling back and forth around the current position doesn't go to
+    SQLite again.
+
+    Args:
+        fetch: fetch(limit, offset) -> rows, e.g. a get_table_data call
+        count: count() -> total rows for the same query
+        formatter: Turns a fetched row into its display row
+        page_rows: Rows per cached page
+        cache_pages: Pages kept in the cache
+    """
+
+    PAGE_ROWS = 100
+    CACHE_PAGES = 8
+
+    def __init__(self, fetch: Callable[[int, int], Sequence], count: Callable[[], int],
+                 formatter: Callable = None, page_rows: int = PAGE_ROWS,
+                 cache_pages: int = CACHE_PAGES):
+        self.fetch = fetch
+        self.count_rows = count
+        self.formatter = formatter
+        self.page_rows = page_rows
+        self.cache_pages = max(cache_pages, 3)
+        self._count = None
+        self._pages = OrderedDict()
+
+    def count(self) -> int:
+        if self._count is None:
+            self._count = self.count_rows() or 0
+        return self._count
+
+    def invalidate(self):
+        self._count = None
+        self._pages.clear()
+
+    def _load_pages(self, first: int, last: int):
+        """Fetch the missing pages first..last, as one query per missing run"""
+        page = first
+        while page <= last:
+            if page in self._pages:
+                self._pages.move_to_end(page)
+                page += 1
+                continue
+
+            run_end = page
+            while run_end + 1 <= last and run_end + 1 not in self._pages:
+                run_end += 1
+
+            fetched = list(self.fetch((run_end - page + 1) * self.page_rows, page * self.page_rows) or [])
+            for number in range(page, run_end + 1):
+                offset = (number - page) * self.page_rows
+                self._pages[number] = fetched[offset:offset + self.page_rows]
+
+            page = run_end + 1
+
+    def rows(self, start: int, stop: int) -> List[tuple]:
+        total = self.count()
+        start = max(start, 0)
+        stop = min(stop, total)
+        if start >= stop:
+            return []
+
+        first = start // self.page_rows
+        last = (stop - 1) // self.page_rows
+        last_page = (total - 1) // self.page_rows
+        self._load_pages(max(first - 1, 0), min(last + 1, last_page))
+
+        window = []
+        for page in range(first, last + 1):
+            rows = self._pages.get(page, [])
+            page_start = page * self.page_rows
+            window.extend(rows[max(start - page_start, 0):stop - page_start])
+
+        # Evict after reading: a tall window may span more pages than the cache keeps
+        while len(self._pages) > self.cache_pages:
+            self._pages.popitem(last=False)
+
+        if self.formatter:
+            return [self.formatter(row) for row in window]
+        return window
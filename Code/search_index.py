@@ -0,0 +1,224 @@
+import unicodedata
+from collections import defaultdict
+from typing import Callable, Hashable, List, Sequence, Set
+
+from task_runner import get_task_runner
+
+
+def fold_text(text) -> str:
+    """Lowercase without accents: 'MARIÑO' and 'Mariño' both give 'marino'"""
+    decomposed = unicodedata.normalize('NFKD', str(text or '').lower())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+class TextSearchIndex:
+    """
+    In-memory substring index over a list of rows (a cached directory or a
+    query result).
+
+    The folded search fields of every row (see fold_text) are split into
+    trigrams, each mapped to the positions of the rows holding it. A search
+    word intersects the postings of its trigrams and confirms the few
+    candidates left with a substring test; a word shorter than a trigram is
+    tested against the rows still in play. A row matches a search when every
+    word of it is contained in one of the row's fields.
+
+    Args:
+        rows: Rows to search (matches keep this order)
+        fields: fields(row) -> texts the row is found by
+    """
+
+    GRAM = 3
+
+    def __init__(self, rows: Sequence, fields: Callable[[object], Sequence]):
+        self.rows = rows
+        # No search word holds a line break, so none matches across fields
+        self._texts = ['\n'.join(fold_text(text) for text in fields(row) if text) for row in rows]
+        self._postings = defaultdict(set)
+        for position, text in enumerate(self._texts):
+            for gram in {text[start:start + self.GRAM] for start in range(len(text) - self.GRAM + 1)}:
+                self._postings[gram].add(position)
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _find(self, word: str, within: Set[int] = None) -> Set[int]:
+        """Positions (among within, if given) of the rows whose fields contain word"""
+        if len(word) < self.GRAM:
+            candidates = range(len(self._texts)) if within is None else within
+        else:
+            grams = {word[start:start + self.GRAM] for start in range(len(word) - self.GRAM + 1)}
+            postings = [self._postings.get(gram, set()) for gram in grams]
+            if within is not None:
+                postings.append(within)
+            postings.sort(key=len)
+            candidates = postings[0].intersection(*postings[1:])
+        return {position for position in candidates if word in self._texts[position]}
+
+    def match(self, term: str, within: Set[int] = None) -> Set[int]:
+        """
+        Positions of the rows matching every word of term
+
+        Args:
+            term: Search text (case and accent insensitive)
+            within: Only check these positions, e.g. the matches of a shorter
+                    term that this one extends
+        """
+        words = fold_text(term).split()
+        positions = within
+        if not words:
+            return set(range(len(self.rows))) if positions is None else set(positions)
+
+        # Longest words first: they leave the fewest rows to check
+        for word in sorted(set(words), key=len, reverse=True):
+            positions = self._find(word, positions)
+            if not positions:
+                break
+        return positions
+
+    def rows_at(self, positions: Set[int]) -> List:
+        """The rows at positions, in the order of rows"""
+        return [self.rows[position] for position in sorted(positions)]
+
+    def search(self, term: str) -> List:
+        """Rows matching every word of term (see match)"""
+        return self.rows_at(self.match(term))
+
+
+class SearchController:
+    """
+    Search-as-you-type for a dialog's search entry.
+
+    Key events are debounced, so the search runs DELAY_MS after the last
+    one. The rows searched come from load() and are indexed with a
+    TextSearchIndex; they are only loaded again when scope() changes
+    (filters, database contents). A load that queries the database can run
+    on the task runner, which is why it gets the filters through the scope
+    value instead of reading widgets. A load made stale by newer input is
+    cancelled and its result dropped. A term that extends the previous one
+    only re-checks the previous matches.
+
+    Args:
+        widget: Dialog widget whose after() debounces the input
+        term: term() -> current search text
+        load: load(scope) -> rows to search, for the value scope() returned
+        fields: fields(row) -> texts a row is found by
+        show: show(rows) displays the matches (Tk thread)
+        scope: scope() -> hashable state of the filters and data load depends on
+        background: Run load on the task runner (it queries the database)
+        on_error: Called with the exception if load fails
+        delay_ms: Debounce delay
+    """
+
+    DELAY_MS = 300
+
+    def __init__(self, widget, term: Callable[[], str], load: Callable[[Hashable], Sequence],
+                 fields: Callable[[object], Sequence], show: Callable[[List], None],
+                 scope: Callable[[], Hashable] = None, background: bool = False,
+                 on_error: Callable[[Exception], None] = None, delay_ms: int = DELAY_MS):
+        self.widget = widget
+        self.term = term
+        self.load = load
+        self.fields = fields
+        self.show = show
+        self.scope = scope or (lambda: None)
+        self.background = background
+        self.on_error = on_error
+        self.delay_ms = delay_ms
+
+        self._timer = None
+        self._task = None
+        self._task_scope = None
+        self._generation = 0
+        self._scope = None
+        self._index = None
+        self._last_words = None
+        self._last_matches = None
+
+    def schedule(self, event=None):
+        """Search once the input has been idle for delay_ms (bind to <KeyRelease>)"""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+        self._timer = self.widget.after(self.delay_ms, self._debounced)
+
+    def _debounced(self):
+        self._timer = None
+        if self.widget.winfo_exists():
+            self.search_now()
+
+    def search_now(self):
+        """Search right away (search button, filter changes)"""
+        if self._timer is not None:
+            self.widget.after_cancel(self._timer)
+            self._timer = None
+        scope = self.scope()
+        if self._task is not None:
+            if scope == self._task_scope:
+                return  # The pending load shows the matches of the term as it is then
+            self._task.cancel()
+            self._task = None
+
+        self._generation += 1
+        if self._index is not None and scope == self._scope:
+            self._show_matches()
+            return
+
+        if not self.background:
+            try:
+                rows = self.load(scope)
+            except Exception as e:
+                self._failed(e)
+                return
+            self._loaded(self._generation, scope, TextSearchIndex(rows, self.fields))
+            return
+
+        generation = self._generation
+
+        def work(context):
+            rows = self.load(scope)
+            context.check_cancelled()
+            return TextSearchIndex(rows, self.fields)
+
+        self._task_scope = scope
+        self._task = get_task_runner(self.widget).run(
+            work,
+            on_done=lambda index: self._loaded(generation, scope, index),
+            on_error=lambda error: self._failed(error, generation),
+            owner=self.widget
+        )
+
+    def reset(self):
+        """Forget the loaded rows; the next search loads them again"""
+        self._index = None
+        self._last_words = None
+        self._last_matches = None
+
+    def _loaded(self, generation: int, scope: Hashable, index: TextSearchIndex):
+        if generation != self._generation:
+            return  # Newer input started another search
+        self._task = None
+        self._scope = scope
+        self._index = index
+        self._last_words = None
+        self._last_matches = None
+        self._show_matches()
+
+    def _failed(self, error: Exception, generation: int = None):
+        if generation is not None and generation != self._generation:
+            return
+        self._task = None
+        if self.on_error:
+            self.on_error(error)
+        else:
+            print(f"Search failed: {error}")
+
+    def _show_matches(self):
+        term = self.term() or ''
+        words = fold_text(term).strip()
+        if self._last_matches is not None and words.startswith(self._last_words):
+            matches = self._index.match(term, within=self._last_matches)
+        else:
+            matches = self._index.match(term)
+        self._last_words = words
+        self._last_matches = matches
+        self.show(self._index.rows_at(matches))
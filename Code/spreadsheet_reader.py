@@ -0,0 +1,269 @@
+import csv
+import hashlib
+import os
+import re
+import sys
+from datetime import date, datetime, time
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+SPREADSHEET_EXTENSIONS = ('.xlsx', '.xlsm')
+
+# Rows searched for the header line (exports put a title block above it)
+HEADER_SCAN_ROWS = 30
+
+# Parsed sheets kept in the cache; the least recently read are deleted
+MAX_CACHED_SHEETS = 16
+
+
+def user_cache_dir(*parts: str) -> str:
+    """Per-user cache directory of the application (not shared like /tmp)"""
+    if sys.platform == 'win32':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        base = os.path.expanduser(os.path.join('~', 'Library', 'Caches'))
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser(os.path.join('~', '.cache'))
+    return os.path.join(base, 'RECOP', *parts)
+
+
+DEFAULT_CACHE_DIR = user_cache_dir('sheets')
+
+
+def is_spreadsheet(file_path: str) -> bool:
+    """True for the Excel workbooks the importers read directly"""
+    return str(file_path).lower().endswith(SPREADSHEET_EXTENSIONS)
+
+
+def header_key(name) -> str:
+    """
+    Comparison key of a column header: 'Facultad / Unidad', 'Facultad_Unidad'
+    and ' FACULTAD UNIDAD ' all give 'facultad unidad'
+    """
+    return re.sub(r'[\s/_]+', ' ', str(name)).strip().lower()
+
+
+def canonical_columns(columns: Sequence, expected_columns: Sequence[str]) -> List:
+    """
+    Rename the headers that match an expected column (see header_key) to its
+    name; a header already spelled as an expected column is kept
+    """
+    exact = set(expected_columns)
+    expected = {}
+    for column in expected_columns:
+        expected.setdefault(header_key(column), column)
+    return [column if column in exact else expected.get(header_key(column), column) for column in columns]
+
+
+def file_hash(file_path: str) -> str:
+    """SHA-1 of the file contents"""
+    digest = hashlib.sha1()
+    with open(file_path, 'rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def cell_text(value) -> Optional[str]:
+    """
+    A worksheet cell as the text a CSV export would hold (None when empty):
+    whole numbers without decimals and dates without a midnight time
+    """
+    if value is None:
+        return None
+    if isinstance(value, str):
+        return value if value != '' else None
+    if isinstance(value, bool):
+        return str(value)
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, datetime):
+        if value.time() == time(0, 0):
+            return value.date().isoformat()
+        return value.isoformat(sep=' ')
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    return str(value)
+
+
+class SpreadsheetReader:
+    """
+    Read-only worksheet reader for the XLSX exports.
+
+    The workbook is streamed with openpyxl in read-only mode. The sheet and the
+    header row are detected from the columns the importer expects: the sheet
+    whose header row matches the most expected columns wins, and the header
+    row is the best match among the first HEADER_SCAN_ROWS rows. Matching
+    headers are renamed to the expected names (see canonical_columns).
+
+    Parsed sheets are cached on disk keyed by the file hash and the expected
+    columns, so preview, validation and import of the same workbook parse it
+    once. The cache holds the text cells as CSV (data only, nothing is
+    unpickled) in a per-user directory, and keeps the MAX_CACHED_SHEETS most
+    recently read sheets; a cache that can't be read or written is just
+    skipped.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_cached_sheets: int = MAX_CACHED_SHEETS):
+        self.cache_dir = cache_dir
+        self.max_cached_sheets = max_cached_sheets
+        self._last_sheet = None  # ((cache key, typed), frame) of the last sheet read
+
+    # ==================== SHEET DETECTION ====================
+
+    def _header_score(self, row: Sequence, expected_keys: set) -> int:
+        return sum(1 for value in row if value is not None and header_key(value) in expected_keys)
+
+    def _find_header(self, rows: Iterator[Tuple], expected_keys: set) -> Tuple[int, int, Tuple]:
+        """(score, index, values) of the best header row among the first rows"""
+        best = (-1, 0, ())
+        for index, row in enumerate(rows):
+            if index >= HEADER_SCAN_ROWS:
+                break
+            if all(value is None for value in row):
+                continue
+            score = self._header_score(row, expected_keys)
+            if score > best[0]:
+                best = (score, index, row)
+        return best
+
+    def detect_layout(self, workbook, expected_columns: Sequence[str]) -> Tuple[str, int, Tuple]:
+        """
+        Sheet name, header row index and header values for the expected columns
+
+        Raises:
+            ValueError: If the workbook has no rows
+        """
+        expected_keys = {header_key(column) for column in expected_columns}
+        best = None
+        for sheet in workbook.worksheets:
+            score, index, header = self._find_header(sheet.iter_rows(values_only=True), expected_keys)
+            if score >= 0 and (best is None or score > best[0]):
+                best = (score, sheet.title, index, header)
+
+        if best is None:
+            raise ValueError("The workbook has no data")
+        return best[1], best[2], best[3]
+
+    # ==================== READING ====================
+
+    def _cache_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.csv")
+
+    def _load_cached(self, key: str) -> Optional[pd.DataFrame]:
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, newline='', encoding='utf-8') as file:
+                columns = next(csv.reader(file))
+            # Header names may repeat (raw exports repeat the day columns),
+            # which read_csv doesn't allow, so they are set afterwards
+            frame = pd.read_csv(path, header=None, skiprows=1, dtype=str,
+                                keep_default_na=False, na_values=[''], encoding='utf-8')
+            if len(frame.columns) != len(columns):
+                raise ValueError("the header doesn't match the rows")
+            frame.columns = columns
+            os.utime(path)  # Most recently read: evicted last
+            return frame
+        except Exception as e:
+            print(f"Ignoring unreadable sheet cache {path}: {e}")
+            return None
+
+    def _store_cached(self, key: str, frame: pd.DataFrame):
+        path = self._cache_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Written under a temporary name so a reader never sees half a file
+            partial_path = f"{path}.{os.getpid()}.tmp"
+            frame.to_csv(partial_path, index=False, encoding='utf-8')
+            os.replace(partial_path, path)
+            self._evict_cached()
+        except Exception as e:
+            print(f"Could not cache sheet in {path}: {e}")
+
+    def _evict_cached(self):
+        """Delete the least recently read sheets beyond max_cached_sheets"""
+        entries = [entry for entry in os.scandir(self.cache_dir) if entry.is_file() and entry.name.endswith('.csv')]
+        entries.sort(key=lambda entry: entry.stat().st_mtime, reverse=True)
+        for entry in entries[self.max_cached_sheets:]:
+            try:
+                os.remove(entry.path)
+            except OSError:
+                pass
+
+    def parse_sheet(self, file_path: str, expected_columns: Sequence[str]) -> pd.DataFrame:
+        """
+        Parse the detected sheet of a workbook into a text frame, as
+        pd.read_csv(dtype=str) reads a CSV export (no cache)
+        """
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            sheet_name, header_index, header = self.detect_layout(workbook, expected_columns)
+
+            # Columns without a header (totals, helper cells) are dropped
+            positions = [position for position, value in enumerate(header) if cell_text(value) is not None]
+            columns = canonical_columns([cell_text(header[position]) for position in positions], expected_columns)
+
+            # Empty rows are kept, as a CSV keeps its empty lines of commas,
+            # except the formatted-but-empty rows after the data
+            rows = []
+            data_rows = 0
+            sheet = workbook[sheet_name]
+            for row in sheet.iter_rows(min_row=header_index + 2, values_only=True):
+                values = [cell_text(row[position]) if position < len(row) else None for position in positions]
+                rows.append(values)
+                if any(value is not None for value in values):
+                    data_rows = len(rows)
+            del rows[data_rows:]
+        finally:
+            workbook.close()
+
+        return pd.DataFrame(rows, columns=columns, dtype=str)
+
+    def read_sheet(self, file_path: str, expected_columns: Sequence[str], typed: bool = False) -> pd.DataFrame:
+        """
+        Read the sheet of a workbook holding the expected columns
+
+        Args:
+            file_path: Path to the .xlsx file
+            expected_columns: Columns the importer consumes (used for detection)
+            typed: Convert all-numeric columns to numbers, as pd.read_csv infers them
+
+        Returns:
+            DataFrame with a RangeIndex and every cell as text (or numbers if typed)
+        """
+        # The disk cache holds the text cells; typed frames are converted on load
+        signature = '\x1f'.join(expected_columns)
+        key = f"{file_hash(file_path)}_{hashlib.sha1(signature.encode('utf-8')).hexdigest()[:12]}"
+
+        # Callers get a copy-on-write view, so changing it leaves the cached frame as is
+        if self._last_sheet is not None and self._last_sheet[0] == (key, typed):
+            return self._last_sheet[1].copy(deep=False)
+
+        frame = self._load_cached(key)
+        if frame is None:
+            frame = self.parse_sheet(file_path, expected_columns)
+            self._store_cached(key, frame)
+        if typed:
+            frame = self.infer_types(frame)
+
+        self._last_sheet = ((key, typed), frame)
+        return frame.copy(deep=False)
+
+    def infer_types(self, frame: pd.DataFrame) -> pd.DataFrame:
+        """Numeric columns to numbers (columns with any non-numeric text stay text)"""
+        typed = frame.copy()
+        for column in typed.columns:
+            try:
+                typed[column] = pd.to_numeric(typed[column])
+            except (ValueError, TypeError):
+                pass
+        return typed
+
+    def read_header(self, file_path: str, expected_columns: Sequence[str]) -> List[str]:
+        """Column names of the detected sheet"""
+        return self.read_sheet(file_path, expected_columns).columns.tolist()
@@ -0,0 +1,247 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task once the user has cancelled it"""
+    pass
+
+
+class TaskContext:
+    """
+    Handle a background task receives: progress reports, cooperative
+    cancellation and calls that must run on the Tk thread.
+
+    Every report checks for cancellation first, so passing message or
+    progress as a processor's progress_callback is enough to make a long
+    loop stop soon after the user presses Cancelar.
+    """
+
+    def __init__(self, runner: 'TaskRunner', task_id: int):
+        self._runner = runner
+        self.task_id = task_id
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Ask the task to stop (it notices at its next report or check)"""
+        self._cancel_event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Raise TaskCancelled if the task was cancelled"""
+        if self._cancel_event.is_set():
+            raise TaskCancelled()
+
+    def message(self, text: str):
+        """Show a status message (progress_callback for message-only processors)"""
+        self.check_cancelled()
+        self._runner._post(self.task_id, 'message', (text,))
+
+    def progress(self, done: int, total: int, message: str = None):
+        """Show done/total progress (progress_callback for counting processors)"""
+        self.check_cancelled()
+        self._runner._post(self.task_id, 'progress', (done, total, message))
+
+    def call_in_ui(self, func: Callable, *args):
+        """
+        Run func(*args) on the Tk thread (dialogs, confirmations) and return
+        its result; the task waits meanwhile
+        """
+        slot = {'done': threading.Event()}
+        self._runner._post(self.task_id, 'call', (func, args, slot))
+        slot['done'].wait()
+        if 'error' in slot:
+            raise slot['error']
+        return slot['result']
+
+
+class TaskRunner:
+    """
+    Runs long GUI actions on a worker thread and marshals their progress and
+    results back to Tk.
+
+    Work runs in a single worker thread (one job at a time, in order); the
+    database manager gives every thread its own pooled connection. Tasks
+    post events to a queue that the Tk thread drains every POLL_MS with
+    root.after, so widgets are only touched from the Tk thread and the window
+    keeps repainting while a job runs.
+    """
+
+    POLL_MS = 50
+
+    def __init__(self, root, max_workers: int = 1):
+        self.root = root
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='recop-task')
+        self._events = queue.Queue()
+        self._tasks = {}
+        self._next_id = 0
+        self._polling = False
+
+    def run(self, work: Callable, on_done: Callable = None, on_error: Callable = None,
+            on_cancel: Callable = None, on_progress: Callable = None,
+            progress_dialog=None, owner=None) -> TaskContext:
+        """
+        Run work(context) on the worker thread
+
+        Args:
+            work: Callable receiving a TaskContext; its return value is the result
+            on_done: Called on the Tk thread with the result
+            on_error: Called on the Tk thread with the exception (default: re-raised
+                      through Tk's report_callback_exception)
+            on_cancel: Called on the Tk thread if the task was cancelled
+            on_progress: Called on the Tk thread with (done, total, message)
+            progress_dialog: ProgressDialog updated with the task's reports and
+                      closed when it ends; its Cancelar button cancels the task
+            owner: Widget whose callbacks are skipped if it was destroyed meanwhile
+
+        Returns:
+            The task's TaskContext (cancel() stops it)
+        """
+        self._next_id += 1
+        context = TaskContext(self, self._next_id)
+        self._tasks[context.task_id] = {
+            'context': context,
+            'on_done': on_done,
+            'on_error': on_error,
+            'on_cancel': on_cancel,
+            'on_progress': on_progress,
+            'dialog': progress_dialog,
+            'owner': owner,
+        }
+        self._executor.submit(self._execute, context, work)
+
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.POLL_MS, self._poll)
+        return context
+
+    def _post(self, task_id: int, kind: str, payload):
+        self._events.put((task_id, kind, payload))
+
+    def _execute(self, context: TaskContext, work: Callable):
+        """Worker thread: run the task and post how it ended"""
+        try:
+            result = work(context)
+        except TaskCancelled:
+            self._post(context.task_id, 'cancelled', None)
+        except Exception as e:
+            # A processor that swallows TaskCancelled still ends up here as cancelled
+            self._post(context.task_id, 'cancelled' if context.is_cancelled() else 'error', e)
+        else:
+            self._post(context.task_id, 'cancelled' if context.is_cancelled() else 'done', result)
+
+    # ==================== TK THREAD ====================
+
+    def _poll(self):
+        """Drain the event queue on the Tk thread and reschedule while tasks run"""
+        # The Cancelar button of a task's dialog cancels the task
+        for task in self._tasks.values():
+            dialog = task['dialog']
+            if dialog is not None and dialog.is_cancelled():
+                task['context'].cancel()
+
+        while True:
+            try:
+                task_id, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            task = self._tasks.get(task_id)
+            if task is not None:
+                self._handle(task_id, task, kind, payload)
+
+        if self._tasks:
+            self.root.after(self.POLL_MS, self._poll)
+        else:
+            self._polling = False
+
+    def _owner_alive(self, task: dict) -> bool:
+        owner = task['owner']
+        if owner is None:
+            return True
+        try:
+            return bool(owner.winfo_exists())
+        except Exception:
+            return False
+
+    def _handle(self, task_id: int, task: dict, kind: str, payload):
+        dialog = task['dialog']
+
+        if kind == 'call':
+            func, args, slot = payload
+            try:
+                slot['result'] = func(*args)
+            except Exception as e:
+                slot['error'] = e
+            slot['done'].set()
+            return
+
+        if kind in ('message', 'progress'):
+            if task['context'].is_cancelled():
+                return
+            if kind == 'message':
+                done, total, message = None, None, payload[0]
+            else:
+                done, total, message = payload
+            if dialog is not None and not dialog.is_cancelled():
+                if done is None:
+                    dialog.update_message(message)
+                else:
+                    dialog.update_progress(done, total, message)
+            if task['on_progress'] and self._owner_alive(task):
+                task['on_progress'](done, total, message)
+            return
+
+        # The task ended
+        del self._tasks[task_id]
+        if dialog is not None:
+            dialog.close()
+        if not self._owner_alive(task):
+            return
+
+        if kind == 'done':
+            if task['on_done']:
+                task['on_done'](payload)
+        elif kind == 'cancelled':
+            if task['on_cancel']:
+                task['on_cancel']()
+        elif task['on_error']:
+            task['on_error'](payload)
+        else:
+            self.root.report_callback_exception(type(payload), payload, payload.__traceback__)
+
+    def is_busy(self) -> bool:
+        """True while any task is queued or running"""
+        return bool(self._tasks)
+
+    def cancel_all(self):
+        for task in self._tasks.values():
+            task['context'].cancel()
+
+    def shutdown(self):
+        """Cancel pending tasks and stop the worker (called when the window closes)"""
+        self.cancel_all()
+        # A task waiting on call_in_ui would otherwise never wake up
+        while True:
+            try:
+                _, kind, payload = self._events.get_nowait()
+            except queue.Empty:
+                break
+            if kind == 'call':
+                slot = payload[2]
+                slot['error'] = TaskCancelled()
+                slot['done'].set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+def get_task_runner(widget) -> TaskRunner:
+    """The TaskRunner shared by every window of widget's Tk application"""
+    root = widget.nametowidget('.')
+    runner = getattr(root, '_task_runner', None)
+    if runner is None:
+        runner = TaskRunner(root)
+        root._task_runner = runner
+    return runner
@@ -3,7 +3,11 @@ import os
 from tkinter import ttk, messagebox, filedialog
 import sqlite3
 from typing import Callable, Optional, List, Dict
-from database import DatabaseManager
+from database import DatabaseManager, TableCursor
+from name_matching import split_three_part_name
+from task_runner import get_task_runner
+from row_provider import SequenceRowProvider, PagedRowProvider
+from search_index import SearchController
 import sys
 import subprocess
 import json
@@ -344,6 +348,7 @@ class DatabaseViewer:
         self.page_size = 20
         self.total_records = 0
         self.total_pages = 0
+        self.table_cursor = None
         
         self.theme_colors = get_theme_colors()  
         
@@ -383,7 +388,7 @@ class DatabaseViewer:
         
         self.table_var = tk.StringVar()
         self.table_combo = ttk.Combobox(selection_frame, textvariable=self.table_var, 
-                                       values=["Departamento", "Profesor", "ProfesorDepartamento", "Materia", "Seccion", "Sesion", "SeccionProfesor", "SesionProfesor"],
+                                       values=["Departamento", "Profesor", "ProfesorDepartamento", "Materia", "Seccion", "Sesion", "SeccionProfesor", "SesionProfesor", "ProfesorDedicacion"],
                                        state="readonly", width=15)
         self.table_combo.pack(side=tk.LEFT, padx=10)
         self.table_combo.bind('<<ComboboxSelected>>', self.on_table_selected)
@@ -448,27 +453,13 @@ class DatabaseViewer:
         table_frame = tk.Frame(self.viewer_window, bg=self.theme_colors['tree_bg'])
         table_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=5)
         
-        # Create Treeview with scrollbars
-        self.tree = ttk.Treeview(table_frame)
+        # Virtual treeview: only the visible rows are fetched and drawn
+        self.virtual_tree = VirtualTreeview(table_frame, height=20, on_view_change=self.on_view_change)
+        self.virtual_tree.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.virtual_tree.tree
         
         # Bind selection event to enable/disable delete button
-        self.tree.bind('<<TreeviewSelect>>', self.on_item_selected)
-        
-        # Vertical scrollbar
-        v_scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=v_scrollbar.set)
-        
-        # Horizontal scrollbar
-        h_scrollbar = ttk.Scrollbar(table_frame, orient=tk.HORIZONTAL, command=self.tree.xview)
-        self.tree.configure(xscrollcommand=h_scrollbar.set)
-        
-        # Pack scrollbars and tree
-        self.tree.grid(row=0, column=0, sticky='nsew')
-        v_scrollbar.grid(row=0, column=1, sticky='ns')
-        h_scrollbar.grid(row=1, column=0, sticky='ew')
-        
-        table_frame.grid_rowconfigure(0, weight=1)
-        table_frame.grid_columnconfigure(0, weight=1)
+        self.virtual_tree.bind_selection(self.on_item_selected)
         
         # Pagination frame
         pagination_frame = tk.Frame(self.viewer_window)
@@ -504,7 +495,7 @@ class DatabaseViewer:
     
     def on_item_selected(self, event):
         """Handle item selection to enable/disable delete button with proper styling"""
-        selection = self.tree.selection()
+        selection = self.virtual_tree.get_selected_item()
         if selection and self.current_table:
             # Enable delete button only for certain tables
             deletable_tables = ["Departamento", "Profesor", "Materia", "Seccion"]
@@ -520,21 +511,14 @@ class DatabaseViewer:
     
     def delete_selected(self):
         """Delete the selected item"""
-        selection = self.tree.selection()
-        if not selection:
+        values = self.virtual_tree.get_selected_item()
+        if not values:
             messagebox.showwarning("Advertencia", "Por favor seleccione un elemento para eliminar.")
             return
         
         if not self.current_table:
             return
         
-        # Get selected item data
-        item = selection[0]
-        values = self.tree.item(item, 'values')
-        
-        if not values:
-            return
-        
         # Get the primary key value based on table
         primary_key_value = None
         item_description = ""
@@ -615,192 +599,74 @@ class DatabaseViewer:
         self.delete_btn.config(state="disabled")
     
     def load_table_data(self):
-        """Load current table data with pagination"""
+        """Load current table data (rows are fetched as they scroll into view)"""
         if not self.current_table:
             return
         
         search_term = self.search_var.get().strip() if self.search_var.get().strip() else None
-        offset = self.current_page * self.page_size
+        table_name = self.current_table
         
         # Apply filters for professor table
-        if self.current_table == "Profesor":
-            data = self.get_filtered_profesor_data(search_term, offset)
-            total_count = self.get_filtered_profesor_count(search_term)
-        else:
-            # Regular table data for other tables
-            data = self.db_manager.get_table_data(
-                self.current_table, search_term, self.page_size, offset
-            )
-            # FIXED: Pass table_name as first parameter, search_term as second
-            total_count = self.get_total_record_count(self.current_table, search_term)
-            
-        self.total_records = total_count
-        self.total_pages = (self.total_records + self.page_size - 1) // self.page_size
+        tipo_filter = self.get_current_tipo_filter() if table_name == "Profesor" else None
         
-        # Clear existing data
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if data:
-            # Get column names for the table
-            columns = self.get_table_columns(self.current_table)
-            
-            # Configure tree columns
-            self.tree['columns'] = columns
-            self.tree['show'] = 'headings'
-            
-            # Configure column headings and widths
-            for col in columns:
-                self.tree.heading(col, text=col)
-                self.tree.column(col, width=150)
-            
-            # Insert data
-            for i, row in enumerate(data):
-                # UPDATED: Format dedication data for display
-                if self.current_table == "Seccion" and len(row) >= 8:
-                    formatted_row = list(row)
-                    # Format profesor_dedicaciones (last column) for better readability
-                    if formatted_row[7]:  # profesor_dedicaciones column
-                        try:
-                            if isinstance(formatted_row[7], str):
-                                dedicaciones = json.loads(formatted_row[7])
-                            elif isinstance(formatted_row[7], dict):
-                                dedicaciones = formatted_row[7]
-                            else:
-                                dedicaciones = {}
-                            
-                            if dedicaciones:
-                                # Format as "ID1:ded1%, ID2:ded2%"
-                                formatted_ded = ", ".join([f"{pid}:{ded}%" for pid, ded in dedicaciones.items()])
-                                formatted_row[7] = formatted_ded
-                            else:
-                                formatted_row[7] = "Sin dedicaciones"
-                        except Exception as e:
-                            formatted_row[7] = "Error en formato"
-                    
-                    self.tree.insert('', tk.END, values=formatted_row, tags=('evenrow' if i % 2 == 0 else 'oddrow',))
-                else:
-                    self.tree.insert('', tk.END, values=row, tags=('evenrow' if i % 2 == 0 else 'oddrow',))
-            
-            # Apply dark mode colors to treeview
-            configure_treeview_dark_mode(self.tree, self.theme_colors)
+        # The keyset cursor (and its cached count) is kept while the search is the same
+        if self.table_cursor is None or not self.table_cursor.matches(table_name, search_term, tipo_filter):
+            self.table_cursor = TableCursor(self.db_manager, table_name, search_term, tipo_filter)
         
-        # Update UI elements
-        self.update_pagination_controls()
-        self.update_info_labels()
+        provider = PagedRowProvider(
+            self.table_cursor.fetch,
+            self.table_cursor.count,
+            formatter=self.format_seccion_row if table_name == "Seccion" else None
+        )
+        
+        # Columns are only reconfigured when they change (i.e. on a table change)
+        self.virtual_tree.set_columns(self.get_table_columns(table_name))
+        self.virtual_tree.set_provider(provider, self.current_page * self.page_size)
         
         # Disable delete button when table refreshes
         self._disable_delete_button()
-        
     
-    def get_filtered_profesor_data(self, search_term=None, offset=0):
-        """Get filtered professor data with tipo filter"""
-        try:
-            query = "SELECT * FROM Profesor"
-            params = []
-            conditions = []
-            
-            # Apply search filter
-            if search_term:
-                conditions.append("(nombres LIKE ? OR apellidos LIKE ?)")
-                params.extend([f"%{search_term}%", f"%{search_term}%"])
-            
-            # Apply tipo filter
-            tipo_filter = self.get_current_tipo_filter()
-            if tipo_filter:
-                conditions.append("tipo = ?")
-                params.append(tipo_filter)
-            
-            # Add WHERE clause if conditions exist
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            # Add ordering and pagination
-            query += " ORDER BY apellidos, nombres"
-            query += f" LIMIT {self.page_size} OFFSET {offset}"
-            
-            return self.db_manager.execute_query(query, tuple(params))
-            
-        except Exception as e:
-            print(f"Error getting filtered professor data: {e}")
-            return []
-
-    def get_filtered_profesor_count(self, search_term=None):
-        """Get total count of filtered professors"""
-        try:
-            query = "SELECT COUNT(*) FROM Profesor"
-            params = []
-            conditions = []
-            
-            # Apply search filter
-            if search_term:
-                conditions.append("(nombres LIKE ? OR apellidos LIKE ?)")
-                params.extend([f"%{search_term}%", f"%{search_term}%"])
-            
-            # Apply tipo filter
-            tipo_filter = self.get_current_tipo_filter()
-            if tipo_filter:
-                conditions.append("tipo = ?")
-                params.append(tipo_filter)
-            
-            # Add WHERE clause if conditions exist
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-            
-            result = self.db_manager.execute_query(query, tuple(params), fetch_one=True)
-            return result[0] if result else 0
-            
-        except Exception as e:
-            print(f"Error getting filtered professor count: {e}")
-            return 0
-
-
-    def get_total_record_count(self, table_name: str, search_term: str = None) -> int:
-        """Get total record count for current table with optional search"""
-        try:
-            # Special handling for Sesion table
-            if table_name == "Sesion":
-                query = """
-                    SELECT COUNT(*) 
-                    FROM Sesion ses
-                    JOIN Seccion sec ON ses.seccion_NRC = sec.NRC
-                    JOIN Materia m ON sec.materia_codigo = m.codigo
-                """
-                params = []
-                
-                if search_term:
-                    query += """ WHERE (
-                        ses.tipoHorario LIKE ? OR
-                        ses.edificio LIKE ? OR
-                        ses.salon LIKE ? OR
-                        m.codigo LIKE ? OR
-                        m.nombre LIKE ? OR
-                        m.departamento_nombre LIKE ? OR
-                        CAST(ses.seccion_NRC AS TEXT) LIKE ?
-                    )"""
-                    search_param = f"%{search_term}%"
-                    params.extend([search_param] * 7)
+    def format_seccion_row(self, row):
+        """Format dedication data of a Seccion row for display"""
+        if len(row) < 8:
+            return row
+        
+        formatted_row = list(row)
+        # Format profesor_dedicaciones (last column) for better readability
+        if formatted_row[7]:  # profesor_dedicaciones column
+            try:
+                if isinstance(formatted_row[7], str):
+                    dedicaciones = json.loads(formatted_row[7])
+                elif isinstance(formatted_row[7], dict):
+                    dedicaciones = formatted_row[7]
+                else:
+                    dedicaciones = {}
                 
-                result = self.db_manager.execute_query(query, tuple(params), fetch_one=True)
-                return result[0] if result else 0
-            
-            # Original logic for other tables
-            if search_term:
-                columns = self.get_table_columns(table_name)
-                if columns:
-                    search_conditions = []
-                    for col in columns:
-                        search_conditions.append(f"CAST({col} AS TEXT) LIKE ?")
-                    query = f"SELECT COUNT(*) FROM {table_name} WHERE ({' OR '.join(search_conditions)})"
-                    params = [f"%{search_term}%"] * len(columns)
-                    result = self.db_manager.execute_query(query, tuple(params), fetch_one=True)
-                    return result[0] if result else 0
-            
-            result = self.db_manager.execute_query(f"SELECT COUNT(*) FROM {table_name}", fetch_one=True)
-            return result[0] if result else 0
-        except Exception as e:
-            print(f"Error getting record count for {table_name}: {e}")
-            return 0
+                if dedicaciones:
+                    # Format as "ID1:ded1%, ID2:ded2%"
+                    formatted_ded = ", ".join([f"{pid}:{ded}%" for pid, ded in dedicaciones.items()])
+                    formatted_row[7] = formatted_ded
+                else:
+                    formatted_row[7] = "Sin dedicaciones"
+            except Exception as e:
+                formatted_row[7] = "Error en formato"
+        return formatted_row
+    
+    def on_view_change(self):
+        """Track the page of the displayed rows after scrolling or reloading"""
+        if not self.current_table:
+            return
+        
+        self.total_records = self.virtual_tree.total_rows
+        self.total_pages = (self.total_records + self.page_size - 1) // self.page_size
+        if self.total_pages and self.virtual_tree.at_end():
+            self.current_page = self.total_pages - 1
+        else:
+            self.current_page = self.virtual_tree.top // self.page_size
+        
+        # Update UI elements
+        self.update_pagination_controls()
+        self.update_info_labels()
     
     def update_pagination_controls(self):
         """Update pagination button states"""
@@ -816,8 +682,8 @@ class DatabaseViewer:
     
     def update_info_labels(self):
         """Update information labels with filter status"""
-        start_record = self.current_page * self.page_size + 1 if self.total_records > 0 else 0
-        end_record = min((self.current_page + 1) * self.page_size, self.total_records)
+        start_record = self.virtual_tree.top + 1 if self.total_records > 0 else 0
+        end_record = min(self.virtual_tree.top + self.virtual_tree.visible_rows, self.total_records)
         
         # Build info message
         info_text = f"Tabla: {self.current_table} - Total: {self.total_records} registros"
@@ -842,7 +708,7 @@ class DatabaseViewer:
         """Handle page size change"""
         self.page_size = int(self.page_size_var.get())
         self.current_page = 0
-        self.load_table_data()
+        self.show_current_page()
     
     def on_search(self, event=None):
         """Handle search as user types (with delay)"""
@@ -873,25 +739,29 @@ class DatabaseViewer:
     def first_page(self):
         """Go to first page"""
         self.current_page = 0
-        self.load_table_data()
+        self.show_current_page()
     
     def prev_page(self):
         """Go to previous page"""
         if self.current_page > 0:
             self.current_page -= 1
-            self.load_table_data()
+            self.show_current_page()
     
     def next_page(self):
         """Go to next page"""
         if self.current_page < self.total_pages - 1:
             self.current_page += 1
-            self.load_table_data()
+            self.show_current_page()
     
     def last_page(self):
         """Go to last page"""
         if self.total_pages > 0:
             self.current_page = self.total_pages - 1
-            self.load_table_data()
+            self.show_current_page()
+    
+    def show_current_page(self):
+        """Scroll the grid to the first row of the current page"""
+        self.virtual_tree.scroll_to(self.current_page * self.page_size)
             
 
     def close_viewer(self):
@@ -994,6 +864,7 @@ class ProgressDialog:
     def __init__(self, parent, title="Procesando...", message="Por favor espere..."):
         self.parent = parent
         self.cancelled = False
+        self.message = message
         
         # Create dialog
         self.dialog = tk.Toplevel(parent)
@@ -1030,6 +901,12 @@ class ProgressDialog:
         
         apply_dark_mode_to_dialog(self.dialog, self.theme_colors)
         
+        # Keep the other windows from starting work while a task runs
+        try:
+            self.dialog.grab_set()
+        except tk.TclError:
+            pass
+        
     def _center_dialog(self):
         """Center dialog on parent"""
         self.dialog.update_idletasks()
@@ -1042,16 +919,28 @@ class ProgressDialog:
         pass
     
     def _on_cancel(self):
-        """Handle cancel button"""
+        """Handle cancel button (the TaskRunner stops the task and closes the dialog)"""
         self.cancelled = True
-        self.close()
+        self.cancel_btn.config(state="disabled")
+        self.message_label.config(text="Cancelando...")
     
     def update_message(self, message):
         """Update progress message"""
+        self.message = message
         self.message_label.config(text=message)
-        self.dialog.update()
         self.dialog.lift()
     
+    def update_progress(self, done, total, message=None):
+        """Switch to a determinate bar and show done/total progress as a percentage"""
+        if str(self.progress.cget('mode')) != 'determinate':
+            self.progress.stop()
+            self.progress.config(mode='determinate')
+        self.progress.config(maximum=max(total, 1), value=done)
+        if message:
+            self.message = message
+        percent = int(100 * done / total) if total else 0
+        self.message_label.config(text=f"{self.message} ({percent}%)")
+    
     def close(self):
         """Close the dialog with error handling"""
         try:
@@ -1254,16 +1143,7 @@ class SearchProfessorDialog:
         
         try:
             # Search for professors
-            all_profs = self.db_manager.get_all_profesores()
-            
-            # Filter results
-            results = []
-            for prof in all_profs:
-                name_match = not nombres or nombres.lower() in prof['nombres'].lower()
-                lastname_match = not apellidos or apellidos.lower() in prof['apellidos'].lower()
-                
-                if name_match and lastname_match:
-                    results.append(prof)
+            results = self.db_manager.professor_directory.search(nombres, apellidos)
             
             if results:
                 self.show_results(results)
@@ -1468,99 +1348,45 @@ class ProfessorSessionsDialog:
         # Results frame (initially hidden)
         self.results_frame = tk.Frame(main_frame)
         
+        # Search-as-you-type over the cached professor directory
+        self.search_controller = SearchController(
+            self.dialog, self.search_var.get,
+            load=lambda scope: self.get_filtered_professors("", scope[0], scope[1]),
+            fields=lambda prof: (prof['nombres'], prof['apellidos']),
+            show=self.load_professors,
+            scope=lambda: (self.get_current_tipo_filter(), self.get_current_department_filter(),
+                           self.db_manager.connections.change_token()),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
+        )
+        
         # Load all professors initially
         self.load_filters()
-        self.load_professors()
+        self.search_controller.search_now()
 
     
-    # In the ProfessorSessionsDialog class, update the load_professors method:
-    
-    # In the ProfessorSessionsDialog class, update the load_professors method:
-    
-    def load_professors(self, filter_text="", tipo_filter=None, department_filter=None):
-        """Load professors into paginated table with filters"""
+    def load_professors(self, professor_objects):
+        """Load the matching professors (see search_controller) into the paginated table"""
         try:
-            # Get all professors with filtering
-            if tipo_filter or department_filter:
-                professors = self.get_filtered_professors(filter_text, tipo_filter, department_filter)
-            else:
-                # Use existing method for name filtering only
-                if filter_text:
-                    professors = self.db_manager.execute_query(
-                        """SELECT DISTINCT p.id, p.nombres, p.apellidos, p.tipo,
-                                  COUNT(DISTINCT sp.sesion_id) as num_sessions,
-                                  COUNT(DISTINCT scp.seccion_NRC) as num_sections
-                           FROM Profesor p
-                           LEFT JOIN SesionProfesor sp ON p.id = sp.profesor_id
-                           LEFT JOIN SeccionProfesor scp ON p.id = scp.profesor_id
-                           WHERE LOWER(p.nombres) LIKE ? OR LOWER(p.apellidos) LIKE ?
-                           GROUP BY p.id, p.nombres, p.apellidos, p.tipo
-                           ORDER BY p.apellidos, p.nombres""",
-                        (f"%{filter_text.lower()}%", f"%{filter_text.lower()}%")
-                    )
-                else:
-                    professors = self.db_manager.execute_query(
-                        """SELECT DISTINCT p.id, p.nombres, p.apellidos, p.tipo,
-                                  COUNT(DISTINCT sp.sesion_id) as num_sessions,
-                                  COUNT(DISTINCT scp.seccion_NRC) as num_sections
-                           FROM Profesor p
-                           LEFT JOIN SesionProfesor sp ON p.id = sp.profesor_id
-                           LEFT JOIN SeccionProfesor scp ON p.id = scp.profesor_id
-                           GROUP BY p.id, p.nombres, p.apellidos, p.tipo
-                           ORDER BY p.apellidos, p.nombres"""
-                    )
-            
-            # Process results and prepare both table data and professor objects
-            table_data = []
-            professor_objects = []  # Keep the original objects separate
-            
-            for row in professors:
-                profesor_id = row[0]
-                
-                # Get departments for this professor
-                dept_results = self.db_manager.execute_query(
-                    """SELECT DISTINCT departamento_nombre 
-                       FROM ProfesorDepartamento 
-                       WHERE profesor_id = ? 
-                       ORDER BY departamento_nombre""",
-                    (profesor_id,)
-                )
-                
-                departamentos = [dept[0] for dept in dept_results]
-                departamentos_str = ', '.join(departamentos) if departamentos else 'Sin departamento'
-                
-                # Create professor object
-                professor_obj = {
-                    'id': row[0],
-                    'nombres': row[1],
-                    'apellidos': row[2],
-                    'tipo': row[3],
-                    'full_name': f"{row[1]} {row[2]}",
-                    'departamentos': departamentos_str,
-                    'num_sessions': row[4] if row[4] else 0,
-                    'num_sections': row[5] if row[5] else 0
-                }
-                
-                # Create table row data
-                table_row = [
-                    professor_obj['full_name'],
-                    departamentos_str,
-                    professor_obj['num_sessions'],
-                    professor_obj['num_sections']
-                ]
-                
-                table_data.append(table_row)
-                professor_objects.append(professor_obj)
+            directory = self.db_manager.professor_directory
             
             # Store the professor objects, NOT the table data
             self.professors_data = professor_objects
+            self.selected_professor = None
+            self.query_btn.config(state="disabled")
             
-            # Update paginated table with table data
-            self.professor_table.set_data(table_data)
+            # Rows are built from the shared directory entries as they scroll into view
+            self.professor_table.set_provider(SequenceRowProvider(
+                professor_objects,
+                lambda professor_obj: (
+                    professor_obj['full_name'],
+                    professor_obj['departamentos'],
+                    professor_obj['num_sessions'],
+                    professor_obj['num_sections']
+                )
+            ))
             
             # Update results count
-            total_professors = len(self.db_manager.get_all_profesores())
-            self.update_results_count(len(professor_objects), total_professors)
+            self.update_results_count(len(professor_objects), directory.count())
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
@@ -1569,17 +1395,12 @@ class ProfessorSessionsDialog:
     
     def on_professor_select(self, event=None):
         """Handle professor selection from paginated table"""
-        selected_data = self.professor_table.get_selected_item()
-        if selected_data and len(selected_data) >= 1:
-            # The selected_data is a tuple from the table
-            prof_name = selected_data[0]  # First column is the name
-            
-            # Find the corresponding professor object
-            for prof in self.professors_data:
-                if prof['full_name'] == prof_name:
-                    self.selected_professor = prof
-                    self.query_btn.config(state="normal")
-                    return
+        selected_index = self.professor_table.get_selected_index()
+        if selected_index is not None and selected_index < len(self.professors_data):
+            # Table rows map one to one onto the professor objects
+            self.selected_professor = self.professors_data[selected_index]
+            self.query_btn.config(state="normal")
+            return
         
         # If we get here, no professor was found
         self.selected_professor = None
@@ -1587,72 +1408,12 @@ class ProfessorSessionsDialog:
     
     def get_filtered_professors(self, name_filter="", tipo_filter=None, department_filter=None):
         """Get professors with tipo and department filters"""
-        
-        # Base query
-        base_query = """
-            SELECT DISTINCT p.id, p.nombres, p.apellidos, p.tipo,
-                   COUNT(DISTINCT sp.sesion_id) as num_sessions,
-                   COUNT(DISTINCT scp.seccion_NRC) as num_sections
-            FROM Profesor p
-            LEFT JOIN SesionProfesor sp ON p.id = sp.profesor_id
-            LEFT JOIN SeccionProfesor scp ON p.id = scp.profesor_id
-        """
-        
-        # Add department join if filtering by department
-        if department_filter and department_filter != "Todos los departamentos":
-            base_query += """
-                JOIN ProfesorDepartamento pd ON p.id = pd.profesor_id
-            """
-        
-        # WHERE conditions
-        conditions = []
-        params = []
-        
-        # Name filter
-        if name_filter:
-            conditions.append("(LOWER(p.nombres) LIKE ? OR LOWER(p.apellidos) LIKE ?)")
-            params.extend([f"%{name_filter.lower()}%", f"%{name_filter.lower()}%"])
-        
-        # Tipo filter (Planta/Cátedra classification)
-        if tipo_filter and tipo_filter != "Todos los tipos":
-            if tipo_filter == "Planta":
-                conditions.append("(p.tipo != 'CÁTEDRA' OR p.tipo IS NULL)")
-            elif tipo_filter == "Cátedra":
-                conditions.append("p.tipo = 'CÁTEDRA'")
-            else:
-                # Specific tipo selected
-                conditions.append("p.tipo = ?")
-                params.append(tipo_filter)
-        
-        # Department filter
-        if department_filter and department_filter != "Todos los departamentos":
-            conditions.append("pd.departamento_nombre = ?")
-            params.append(department_filter)
-        
-        # Combine query
-        if conditions:
-            base_query += " WHERE " + " AND ".join(conditions)
-        
-        base_query += " GROUP BY p.id, p.nombres, p.apellidos, p.tipo ORDER BY p.apellidos, p.nombres"
-        
-        return self.db_manager.execute_query(base_query, tuple(params))
-    
-    # Update the on_professor_select method:
-    
-    
-    # Update search-related methods:
-    
-    def search_professors(self):
-        """Search professors based on input"""
-        search_text = self.search_var.get().strip()
-        self.load_professors(search_text)
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        return self.db_manager.professor_directory.filter(name_filter, tipo_filter, department_filter)
     
     def clear_search(self):
         """Clear search field and reload all professors"""
         self.search_var.set("")
-        self.load_professors()
+        self.search_controller.search_now()
         self.query_btn.config(state="disabled")
         self.selected_professor = None
 
@@ -1689,17 +1450,13 @@ class ProfessorSessionsDialog:
         self.department_var.set("Todos los departamentos")
         self.tipo_var.set("Todos los tipos")
         self.search_var.set("")
-        self.load_professors()
+        self.search_controller.search_now()
         self.query_btn.config(state="disabled")
         self.selected_professor = None
     
     def search_professors(self):
         """Search professors with filters"""
-        search_text = self.search_var.get().strip()
-        tipo_filter = self.get_current_tipo_filter()
-        department_filter = self.get_current_department_filter()
-        
-        self.load_professors(search_text, tipo_filter, department_filter)
+        self.search_controller.search_now()
         self.query_btn.config(state="disabled")
         self.selected_professor = None
     
@@ -1722,10 +1479,7 @@ class ProfessorSessionsDialog:
     
     def on_search_change(self, event=None):
         """Handle search text change with delay"""
-        if hasattr(self, 'search_timer'):
-            self.dialog.after_cancel(self.search_timer)
-        
-        self.search_timer = self.dialog.after(300, self.search_professors)
+        self.search_controller.schedule()
     
     def query_sessions(self):
         """Query and display professor sessions"""
@@ -2081,28 +1835,28 @@ class ProfessorSectionsDialog:
         # Results frame
         self.results_frame = tk.Frame(main_frame)
         
+        # Search-as-you-type over the cached professor directory
+        self.search_controller = SearchController(
+            self.dialog, self.search_var.get,
+            load=lambda scope: self.db_manager.professor_directory.get_professors(),
+            fields=lambda prof: (prof['full_name'], prof['departamentos']),
+            show=self.load_professors,
+            scope=self.db_manager.connections.change_token,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
+        )
+        
         # Load professors
-        self.load_professors()
+        self.search_controller.search_now()
     
         # Update the load_professors method in ProfessorSessionsDialog:
     
-    def load_professors(self, filter_text=""):
-        """Load professors into paginated table"""
+    def load_professors(self, all_professors):
+        """Load the matching professors (see search_controller) into the paginated table"""
         self.professors_data = []
+        self.selected_professor = None
+        self.query_btn.config(state="disabled")
         
         try:
-            all_professors = self.db_manager.get_all_profesores()
-            
-            # Apply search filter if provided
-            if filter_text:
-                filter_text = filter_text.lower()
-                filtered_professors = []
-                for prof in all_professors:
-                    if (filter_text in prof['full_name'].lower() or 
-                        filter_text in prof['departamentos'].lower()):
-                        filtered_professors.append(prof)
-                all_professors = filtered_professors
-            
             # Prepare data for paginated table
             table_data = []
             for prof in all_professors:
@@ -2142,24 +1896,16 @@ class ProfessorSectionsDialog:
     
     def search_professors(self):
         """Search professors based on input"""
-        search_text = self.search_var.get().strip()
-        self.load_professors(search_text)
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        self.search_controller.search_now()
     
     def clear_search(self):
         """Clear search field and reload all professors"""
         self.search_var.set("")
-        self.load_professors()
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        self.search_controller.search_now()
     
     def on_search_change(self, event=None):
         """Handle search text change with delay"""
-        if hasattr(self, 'search_timer'):
-            self.dialog.after_cancel(self.search_timer)
-        
-        self.search_timer = self.dialog.after(300, self.search_professors)
+        self.search_controller.schedule()
     
     
     
@@ -2594,9 +2340,19 @@ class MateriaSectionsDialog:
         # Results frame
         self.results_frame = tk.Frame(main_frame)
         
+        # Search-as-you-type over the cached materia directory
+        self.search_controller = SearchController(
+            self.dialog, self.search_var.get,
+            load=lambda scope: self.get_department_materias(scope[0]),
+            fields=lambda materia: (materia['codigo'], materia['nombre']),
+            show=self.load_materias,
+            scope=lambda: (self.get_current_department_filter(), self.db_manager.connections.change_token()),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar materias: {str(e)}")
+        )
+        
         # Load data
         self.load_departments()
-        self.load_materias()
+        self.search_controller.search_now()
     
     def load_departments(self):
         """Load departments for filtering"""
@@ -2607,25 +2363,22 @@ class MateriaSectionsDialog:
         except Exception as e:
             print(f"Error loading departments: {e}")
     
-    def load_materias(self, filter_text=""):
-        """Load materias into paginated table"""
+    def get_department_materias(self, dept_filter):
+        """Materias of a department, from the cached directory"""
+        all_materias = self.db_manager.materia_directory.get_materias()
+        
+        # Apply department filter
+        if dept_filter != "Todos los departamentos":
+            all_materias = [m for m in all_materias if m['departamento'] == dept_filter]
+        return all_materias
+    
+    def load_materias(self, all_materias):
+        """Load the matching materias (see search_controller) into the paginated table"""
         self.materias_data = []
+        self.selected_materia = None
+        self.query_btn.config(state="disabled")
         
         try:
-            all_materias = self.db_manager.get_all_materias_with_stats()
-            
-            # Apply department filter
-            dept_filter = self.get_current_department_filter()
-            if dept_filter != "Todos los departamentos":
-                all_materias = [m for m in all_materias if m['departamento'] == dept_filter]
-            
-            # Apply search filter
-            if filter_text:
-                filter_text = filter_text.lower()
-                all_materias = [m for m in all_materias if 
-                            filter_text in m['codigo'].lower() or 
-                            filter_text in m['nombre'].lower()]
-            
             # Prepare data for paginated table
             table_data = []
             for materia in all_materias:
@@ -2641,7 +2394,7 @@ class MateriaSectionsDialog:
             self.materias_data = all_materias
             self.materia_table.set_data(table_data)
             
-            self.update_results_count(len(all_materias), len(self.db_manager.get_all_materias()))
+            self.update_results_count(len(all_materias), self.db_manager.materia_directory.count())
         
         except Exception as e:
             messagebox.showerror("Error", f"Error al cargar materias: {str(e)}")
@@ -2659,9 +2412,7 @@ class MateriaSectionsDialog:
     
     def on_department_filter_change(self, event=None):
         """Handle department filter change"""
-        self.load_materias(self.search_var.get())
-        self.query_btn.config(state="disabled")
-        self.selected_materia = None
+        self.search_controller.search_now()
     
     def clear_department_filter(self):
         """Clear department filter"""
@@ -2671,23 +2422,15 @@ class MateriaSectionsDialog:
     def clear_search(self):
         """Clear search field and reload all materias"""
         self.search_var.set("")
-        self.load_materias()
-        self.query_btn.config(state="disabled")
-        self.selected_materia = None
+        self.search_controller.search_now()
     
     def on_search_change(self, event=None):
         """Handle search text change with delay"""
-        if hasattr(self, 'search_timer'):
-            self.dialog.after_cancel(self.search_timer)
-        
-        self.search_timer = self.dialog.after(300, self.search_materias)
+        self.search_controller.schedule()
     
     def search_materias(self):
         """Search materias based on input"""
-        search_text = self.search_var.get().strip()
-        self.load_materias(search_text)
-        self.query_btn.config(state="disabled")
-        self.selected_materia = None
+        self.search_controller.search_now()
     
     def on_materia_select(self, event=None):
         """Handle materia selection from paginated table"""
@@ -3199,30 +2942,31 @@ class DepartmentProfessorsDialog:
         self.professor_table = PaginatedTreeview(table_container, columns, column_configs, page_size=15)
         self.professor_table.pack(fill=tk.BOTH, expand=True)
         
+        # The department's professors for the tipo and nivel filters are
+        # queried in the background; the name search narrows them in memory
+        self.search_controller = SearchController(
+            step_frame, self.prof_search_var.get,
+            load=lambda scope: self.db_manager.get_profesores_by_departamento_with_filters(
+                dept_name, scope[0], scope[1]
+            ),
+            fields=lambda prof: (prof['nombres'], prof['apellidos']),
+            show=self.load_professors_with_filters,
+            scope=lambda: (self.tipo_var.get() or "Todos los tipos",
+                           self.nivel_var.get() or "Todos los niveles",
+                           self.db_manager.connections.change_token()),
+            background=True,
+            on_error=self.show_professors_error
+        )
+        
         # Load professors with filters
-        self.load_professors_with_filters()
+        self.search_controller.search_now()
         
         # Navigation
         self.setup_step_2_navigation()
     
-    def load_professors_with_filters(self, name_filter=""):
-        """Load professors for selected department with type and level filters"""
-        if not self.selected_department:
-            return
-        
+    def load_professors_with_filters(self, all_professors):
+        """Load the matching professors (see search_controller) into the paginated table"""
         try:
-            # Get current filter values
-            tipo_filter = getattr(self, 'tipo_var', tk.StringVar()).get() or "Todos los tipos"
-            nivel_filter = getattr(self, 'nivel_var', tk.StringVar()).get() or "Todos los niveles"
-            
-            # Use new filtered method
-            all_professors = self.db_manager.get_profesores_by_departamento_with_filters(
-                self.selected_department['nombre'],
-                tipo_filter,
-                nivel_filter,
-                name_filter
-            )
-            
             # Prepare data for paginated table
             table_data = []
             for prof in all_professors:
@@ -3241,8 +2985,12 @@ class DepartmentProfessorsDialog:
             self.update_results_count(len(all_professors))
             
         except Exception as e:
-            messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
-            print(f"Debug - Error loading professors with filters: {e}")
+            self.show_professors_error(e)
+    
+    def show_professors_error(self, e):
+        """Report a failed professor load"""
+        messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
+        print(f"Debug - Error loading professors with filters: {e}")
     
     def update_results_count(self, filtered_count):
         """Update results count display"""
@@ -3259,8 +3007,7 @@ class DepartmentProfessorsDialog:
     
     def on_filter_change(self, event=None):
         """Handle filter changes"""
-        search_text = getattr(self, 'prof_search_var', tk.StringVar()).get().strip()
-        self.load_professors_with_filters(search_text)
+        self.search_controller.search_now()
     
     def clear_filters(self):
         """Clear all filters"""
@@ -3271,25 +3018,21 @@ class DepartmentProfessorsDialog:
         if hasattr(self, 'prof_search_var'):
             self.prof_search_var.set("")
         
-        self.load_professors_with_filters()
+        self.search_controller.search_now()
     
     def search_professors_in_dept(self):
         """Search professors in selected department with filters"""
-        search_text = getattr(self, 'prof_search_var', tk.StringVar()).get().strip()
-        self.load_professors_with_filters(search_text)
+        self.search_controller.search_now()
     
     def clear_prof_search(self):
         """Clear professor search"""
         if hasattr(self, 'prof_search_var'):
             self.prof_search_var.set("")
-        self.load_professors_with_filters()
+        self.search_controller.search_now()
     
     def on_prof_search_change(self, event=None):
         """Handle professor search text change with delay"""
-        if hasattr(self, 'prof_search_timer'):
-            self.dialog.after_cancel(self.prof_search_timer)
-        
-        self.prof_search_timer = self.dialog.after(300, self.search_professors_in_dept)
+        self.search_controller.schedule()
     
     def setup_step_2_navigation(self):
         """Setup navigation for step 2"""
@@ -3493,23 +3236,6 @@ class DepartmentProfessorsDialog:
         # Apply dark mode to the entire window
         apply_dark_mode_to_dialog(results_window, self.theme_colors)
     
-    def on_prof_search_change(self, event=None):
-        """Handle professor search text change with delay"""
-        if hasattr(self, 'prof_search_timer'):
-            self.dialog.after_cancel(self.prof_search_timer)
-        
-        self.prof_search_timer = self.dialog.after(300, self.search_professors_in_dept)
-    
-    def search_professors_in_dept(self):
-        """Search professors in selected department"""
-        search_text = self.prof_search_var.get().strip()
-        self.load_professors(search_text)
-    
-    def clear_prof_search(self):
-        """Clear professor search"""
-        self.prof_search_var.set("")
-        self.load_professors()
-    
     def close_dialog(self):
         """Close the dialog"""
         if self.callback:
@@ -3632,7 +3358,7 @@ class PersonalDataLinkingDialog:
         status_frame.pack(fill=tk.X)
         
         try:
-            total_profs = len(self.db_manager.get_all_profesores())
+            total_profs = self.db_manager.professor_directory.count()
             without_personal = len(self.db_manager.get_professors_without_personal_data())
             with_personal = total_profs - without_personal
             
@@ -3655,7 +3381,8 @@ class PersonalDataLinkingDialog:
         """Select personal data file"""
         file_path = filedialog.askopenfilename(
             title="Seleccionar archivo de datos personales",
-            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            filetypes=[("CSV / Excel files", "*.csv *.xlsx"), ("CSV files", "*.csv"),
+                       ("Excel files", "*.xlsx"), ("All files", "*.*")],
             initialdir=os.path.expanduser("~")
         )
         
@@ -3699,25 +3426,28 @@ class PersonalDataLinkingDialog:
         progress = ProgressDialog(self.dialog, "Procesando datos personales", 
                                 "Cargando archivo y buscando coincidencias...")
         
-        try:
-            # Create linking engine and process file
-            from personal_data_processor import PersonalDataLinkingEngine
-            self.linking_engine = PersonalDataLinkingEngine(self.db_manager)
-            
-            result = self.linking_engine.load_and_process_personal_data(self.selected_file)
-            
-            progress.close()
-            
+        # Create linking engine and process file in the background
+        from personal_data_processor import PersonalDataLinkingEngine
+        self.linking_engine = PersonalDataLinkingEngine(self.db_manager)
+        selected_file = self.selected_file
+        
+        def show_result(result):
             if result['success']:
                 self.process_result = result
                 self.show_step_2()
             else:
                 error_msg = "Errores al procesar:\n" + "\n".join(result['errors'])
                 messagebox.showerror("Error de procesamiento", error_msg)
-                
-        except Exception as e:
-            progress.close()
-            messagebox.showerror("Error", f"Error inesperado: {str(e)}")
+        
+        get_task_runner(self.dialog).run(
+            lambda task: self.linking_engine.load_and_process_personal_data(
+                selected_file, progress_callback=task.progress
+            ),
+            on_done=show_result,
+            on_error=lambda e: messagebox.showerror("Error", f"Error inesperado: {str(e)}"),
+            progress_dialog=progress,
+            owner=self.dialog
+        )
     
     def show_step_2(self):
         """Step 2: Review matches"""
@@ -4231,10 +3961,17 @@ class PersonalDataLinkingDialog:
         """Apply the approved changes"""
         progress = ProgressDialog(self.dialog, "Aplicando cambios", "Actualizando registros de profesores...")
         
+        get_task_runner(self.dialog).run(
+            lambda task: self.linking_engine.apply_approved_matches(),
+            on_done=self.show_apply_result,
+            on_error=lambda e: messagebox.showerror("Error", f"Error al aplicar cambios: {str(e)}"),
+            progress_dialog=progress,
+            owner=self.dialog
+        )
+    
+    def show_apply_result(self, result):
+        """Show the outcome of apply_changes"""
         try:
-            result = self.linking_engine.apply_approved_matches()
-            progress.close()
-            
             # Clear results frame
             for widget in self.results_frame.winfo_children():
                 widget.destroy()
@@ -4288,7 +4025,6 @@ class PersonalDataLinkingDialog:
                 error_label.pack(anchor=tk.W)
                 
         except Exception as e:
-            progress.close()
             messagebox.showerror("Error", f"Error al aplicar cambios: {str(e)}")
     
     def setup_step_1_navigation(self):
@@ -4336,8 +4072,249 @@ class PersonalDataLinkingDialog:
             self.callback()
         self.dialog.destroy()
         
+class VirtualTreeview:
+    """
+    Treeview that displays a window of a RowProvider's rows.
+
+    Only the rows that fit in the widget exist as Treeview items. The items
+    are created once and reused: scrolling rewrites their values instead of
+    deleting and inserting rows, and the scrollbar maps onto the provider's
+    full row count, so tables of any size scroll without being loaded.
+    """
+    
+    WHEEL_ROWS = 3
+    
+    def __init__(self, parent, columns=(), column_configs=None, height=10,
+                 on_view_change: Callable = None):
+        self.parent = parent
+        self.provider = None
+        self.on_view_change = on_view_change
+        self.top = 0
+        self.total_rows = 0
+        self.visible_rows = height
+        self.selected_index = None
+        self._items = []  # Pooled item ids in display order
+        self._shown = 0  # Pooled items currently attached to the tree
+        self._selection_callbacks = []
+        self._column_signature = None
+        
+        self.container = tk.Frame(parent)
+        
+        self.tree = ttk.Treeview(self.container, columns=columns, show='headings',
+                                 height=height, selectmode='browse')
+        self.set_columns(columns, column_configs)
+        
+        # The vertical scrollbar drives the window, not the Treeview
+        self.v_scrollbar = ttk.Scrollbar(self.container, orient=tk.VERTICAL, command=self.yview)
+        self.h_scrollbar = ttk.Scrollbar(self.container, orient=tk.HORIZONTAL, command=self.tree.xview)
+        self.tree.configure(xscrollcommand=self.h_scrollbar.set)
+        
+        self.tree.grid(row=0, column=0, sticky='nsew')
+        self.v_scrollbar.grid(row=0, column=1, sticky='ns')
+        self.h_scrollbar.grid(row=1, column=0, sticky='ew')
+        self.container.grid_rowconfigure(0, weight=1)
+        self.container.grid_columnconfigure(0, weight=1)
+        
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<Configure>', self._on_resize)
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', self._on_mousewheel)
+        self.tree.bind('<Button-5>', self._on_mousewheel)
+        self.tree.bind('<Up>', lambda event: self._move_selection(-1))
+        self.tree.bind('<Down>', lambda event: self._move_selection(1))
+        self.tree.bind('<Prior>', lambda event: self._move_selection(-self.visible_rows))
+        self.tree.bind('<Next>', lambda event: self._move_selection(self.visible_rows))
+        self.tree.bind('<Home>', lambda event: self._move_selection(-self.total_rows))
+        self.tree.bind('<End>', lambda event: self._move_selection(self.total_rows))
+        
+        configure_treeview_dark_mode(self.tree, get_theme_colors())
+        self._ensure_items(height)
+    
+    def pack(self, **kwargs):
+        """Pack the container"""
+        self.container.pack(**kwargs)
+    
+    def set_columns(self, columns, column_configs=None):
+        """Set the displayed columns (only reconfigures the tree when they change)"""
+        columns = tuple(columns)
+        signature = (columns, repr(column_configs))
+        if signature == self._column_signature:
+            return
+        self._column_signature = signature
+        
+        self.tree['columns'] = columns
+        for col in columns:
+            config = (column_configs or {}).get(col, {'text': col, 'width': 150})
+            self.tree.heading(col, text=config['text'])
+            self.tree.column(col, width=config['width'], minwidth=50)
+    
+    def set_provider(self, provider, top=0):
+        """Show a new row source, from row top"""
+        had_selection = self.selected_index is not None
+        self.provider = provider
+        self.top = top
+        self.selected_index = None
+        self.refresh()
+        
+        if had_selection:
+            self._notify_selection()
+    
+    def refresh(self):
+        """Re-read the count and redraw the current window"""
+        self.total_rows = self.provider.count() if self.provider else 0
+        if self.selected_index is not None and self.selected_index >= self.total_rows:
+            self.selected_index = None
+        self._render()
+    
+    # ==================== WINDOW ====================
+    
+    def _ensure_items(self, count):
+        # New items start detached; _render attaches the ones it fills
+        while len(self._items) < count:
+            item = self.tree.insert('', tk.END)
+            self.tree.detach(item)
+            self._items.append(item)
+    
+    def _render(self):
+        """Write the window's rows into the pooled items"""
+        self.top = max(0, min(self.top, self.total_rows - self.visible_rows))
+        rows = self.provider.rows(self.top, self.top + self.visible_rows) if self.provider else []
+        
+        for position, item in enumerate(self._items):
+            if position < len(rows):
+                index = self.top + position
+                self.tree.item(item, values=rows[position],
+                               tags=('evenrow' if index % 2 == 0 else 'oddrow',))
+                if position >= self._shown:
+                    self.tree.move(item, '', position)
+            elif position < self._shown:
+                self.tree.detach(item)
+        self._shown = len(rows)
+        
+        # Keep the highlight on the selected row, wherever it moved
+        selected_position = None
+        if self.selected_index is not None and 0 <= self.selected_index - self.top < self._shown:
+            selected_position = self.selected_index - self.top
+        current = self.tree.selection()
+        if selected_position is None:
+            if current:
+                self.tree.selection_remove(current)
+        elif current != (self._items[selected_position],):
+            self.tree.selection_set(self._items[selected_position])
+        
+        if self.total_rows > 0:
+            self.v_scrollbar.set(self.top / self.total_rows,
+                                 min(self.top + self.visible_rows, self.total_rows) / self.total_rows)
+        else:
+            self.v_scrollbar.set(0, 1)
+        
+        if self.on_view_change:
+            self.on_view_change()
+    
+    def scroll_to(self, index):
+        """Make row index the first displayed row (as far as the end allows)"""
+        self.top = max(0, int(index))
+        self._render()
+    
+    def scroll_rows(self, count):
+        self.scroll_to(self.top + count)
+    
+    def at_end(self) -> bool:
+        """True when the last row is displayed"""
+        return self.top + self.visible_rows >= self.total_rows
+    
+    def yview(self, *args):
+        """Scrollbar command: 'moveto fraction' or 'scroll n units|pages'"""
+        if not args:
+            return
+        if args[0] == 'moveto':
+            self.scroll_to(round(float(args[1]) * self.total_rows))
+        elif args[0] == 'scroll':
+            step = self.visible_rows if args[2] == 'pages' else 1
+            self.scroll_rows(int(args[1]) * step)
+    
+    def _on_mousewheel(self, event):
+        up = event.num == 4 or getattr(event, 'delta', 0) > 0
+        self.scroll_rows(-self.WHEEL_ROWS if up else self.WHEEL_ROWS)
+        return "break"
+    
+    def _on_resize(self, event=None):
+        """Grow or shrink the window to the rows that fit in the widget"""
+        bbox = self.tree.bbox(self._items[0]) if self._shown else None
+        if bbox:
+            heading_height, row_height = bbox[1], bbox[3]
+        else:
+            row_height = int(ttk.Style(self.tree).lookup('Treeview', 'rowheight') or 20)
+            heading_height = row_height + 5
+        
+        visible_rows = max(1, (self.tree.winfo_height() - heading_height) // max(row_height, 1))
+        if visible_rows != self.visible_rows:
+            self.visible_rows = visible_rows
+            self._ensure_items(visible_rows)
+            self._render()
+    
+    # ==================== SELECTION ====================
+    
+    def _on_select(self, event=None):
+        selection = self.tree.selection()
+        if selection:
+            index = self.top + self._items.index(selection[0])
+        elif self.selected_index is not None and 0 <= self.selected_index - self.top < self._shown:
+            index = None  # The user cleared a visible selection
+        else:
+            return  # The selected row scrolled out of the window
+        
+        # Re-highlighting a row that moved while scrolling is not a new selection
+        if index == self.selected_index:
+            return
+        self.selected_index = index
+        self._notify_selection(event)
+    
+    def _notify_selection(self, event=None):
+        for callback in self._selection_callbacks:
+            callback(event)
+    
+    def _move_selection(self, count):
+        """Keyboard navigation over the whole result, scrolling as needed"""
+        if self.total_rows == 0:
+            return "break"
+        
+        start = self.selected_index if self.selected_index is not None else self.top - 1
+        index = max(0, min(start + count, self.total_rows - 1))
+        if index < self.top:
+            self.top = index
+        elif index >= self.top + self.visible_rows:
+            self.top = index - self.visible_rows + 1
+        
+        self.selected_index = index
+        self._render()
+        self.tree.focus(self._items[index - self.top])
+        self._notify_selection()
+        return "break"
+    
+    def get_selected_index(self):
+        """Index of the selected row in the provider (None if nothing is selected)"""
+        return self.selected_index
+    
+    def get_selected_item(self):
+        """Row data of the selected row, even if it scrolled out of view"""
+        if self.selected_index is None or not self.provider:
+            return None
+        return self.provider.row(self.selected_index)
+    
+    def bind_selection(self, callback):
+        """Call callback(event) when the selected row changes"""
+        self._selection_callbacks.append(callback)
+        
+
 class PaginatedTreeview:
-    """Reusable paginated treeview component"""
+    """
+    Reusable paginated treeview component
+    
+    Rows come from a RowProvider and are displayed by a VirtualTreeview, so
+    only the rows in view are formatted and written to the tree. The page
+    buttons jump through the result a page at a time.
+    """
     
     def __init__(self, parent, columns, column_configs, page_size=20):
         self.parent = parent
@@ -4347,14 +4324,10 @@ class PaginatedTreeview:
         self.current_page = 0
         self.total_records = 0
         self.total_pages = 0
-        self.all_data = []  # Store all data
-        self.filtered_data = []  # Store filtered data
-        self.search_term = ""
+        self.provider = None
         
         self.setup_ui()
     
-        # Update the setup_ui method in PaginatedTreeview class in ui_components.py:
-    
     def setup_ui(self):
         """Setup the paginated treeview UI - UPDATED: No internal search functionality"""
         # Main container
@@ -4371,20 +4344,11 @@ class PaginatedTreeview:
         table_frame = tk.Frame(self.container)
         table_frame.pack(fill=tk.BOTH, expand=True)
         
-        # Create Treeview
-        self.tree = ttk.Treeview(table_frame, columns=self.columns, show='headings', height=10)
-        
-        # Configure columns
-        for col, config in self.column_configs.items():
-            self.tree.heading(col, text=config['text'])
-            self.tree.column(col, width=config['width'], minwidth=50)
-        
-        # Scrollbar
-        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
-        self.tree.configure(yscrollcommand=scrollbar.set)
-        
-        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        # Virtual treeview with its own scrollbars
+        self.virtual_tree = VirtualTreeview(table_frame, self.columns, self.column_configs, height=10,
+                                    on_view_change=self.on_view_change)
+        self.virtual_tree.pack(fill=tk.BOTH, expand=True)
+        self.tree = self.virtual_tree.tree
         
         # Pagination frame
         pagination_frame = tk.Frame(self.container)
@@ -4420,39 +4384,26 @@ class PaginatedTreeview:
     
     def set_data(self, data):
         """Set the data for the paginated view"""
-        self.all_data = data[:]
-        self.filtered_data = self.all_data[:] 
-        self.total_records = len(self.all_data)
-        self.total_pages = (self.total_records + self.page_size - 1) // self.page_size
+        self.set_provider(SequenceRowProvider(list(data)))
+    
+    def set_provider(self, provider):
+        """Show the rows of a RowProvider (fetched as they scroll into view)"""
+        self.provider = provider
         self.current_page = 0
-        self.update_display()
-        
+        self.virtual_tree.set_provider(provider)
     
     def update_display(self):
-        """Update the treeview display with current page data"""
-        # Clear existing items
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-        
-        if not self.filtered_data:
-            self.update_pagination_controls()
-            self.update_info_labels()
-            return
-        
-        # Calculate page range
-        start_idx = self.current_page * self.page_size
-        end_idx = min(start_idx + self.page_size, len(self.filtered_data))
-        
-        # Add current page data
-        page_data = self.filtered_data[start_idx:end_idx]
-        
-        for i, row_data in enumerate(page_data):
-            tags = ('evenrow' if i % 2 == 0 else 'oddrow',)
-            self.tree.insert('', tk.END, values=row_data, tags=tags)
-        
-        # Apply dark mode styling
-        colors = get_theme_colors()
-        configure_treeview_dark_mode(self.tree, colors)
+        """Scroll the treeview to the current page"""
+        self.virtual_tree.scroll_to(self.current_page * self.page_size)
+    
+    def on_view_change(self):
+        """Track the page of the displayed rows after scrolling or a new provider"""
+        self.total_records = self.virtual_tree.total_rows
+        self.total_pages = (self.total_records + self.page_size - 1) // self.page_size
+        if self.total_pages and self.virtual_tree.at_end():
+            self.current_page = self.total_pages - 1
+        else:
+            self.current_page = self.virtual_tree.top // self.page_size
         
         self.update_pagination_controls()
         self.update_info_labels()
@@ -4475,24 +4426,18 @@ class PaginatedTreeview:
             self.results_info_label.config(text="No hay resultados")
             return
         
-        start_record = self.current_page * self.page_size + 1
-        end_record = min((self.current_page + 1) * self.page_size, self.total_records)
+        start_record = self.virtual_tree.top + 1
+        end_record = min(self.virtual_tree.top + self.virtual_tree.visible_rows, self.total_records)
         
-        if len(self.filtered_data) < len(self.all_data):
-            self.results_info_label.config(
-                text=f"Mostrando {start_record}-{end_record} de {self.total_records} resultados filtrados (de {len(self.all_data)} totales)"
-            )
-        else:
-            self.results_info_label.config(
-                text=f"Mostrando {start_record}-{end_record} de {self.total_records} resultados"
-            )
+        self.results_info_label.config(
+            text=f"Mostrando {start_record}-{end_record} de {self.total_records} resultados"
+        )
     
     def on_page_size_change(self, event=None):
         """Handle page size change"""
         try:
             new_size = int(self.page_size_var.get())
             self.page_size = new_size
-            self.total_pages = (self.total_records + self.page_size - 1) // self.page_size
             self.current_page = 0
             self.update_display()
         except ValueError:
@@ -4527,15 +4472,15 @@ class PaginatedTreeview:
     
     def get_selected_item(self):
         """Get currently selected item data"""
-        selection = self.tree.selection()
-        if selection:
-            item = selection[0]
-            return self.tree.item(item, 'values')
-        return None
+        return self.virtual_tree.get_selected_item()
+    
+    def get_selected_index(self):
+        """Index of the selected row in the data (None if nothing is selected)"""
+        return self.virtual_tree.get_selected_index()
     
     def bind_selection(self, callback):
         """Bind selection event"""
-        self.tree.bind('<<TreeviewSelect>>', callback)
+        self.virtual_tree.bind_selection(callback)
         
 
 class ProfessorMateriasDialog:
@@ -4656,9 +4601,19 @@ class ProfessorMateriasDialog:
         # Results frame
         self.results_frame = tk.Frame(main_frame)
         
+        # Search-as-you-type over the cached professor directory
+        self.search_controller = SearchController(
+            self.dialog, self.search_var.get,
+            load=lambda scope: self.get_department_professors(scope[0]),
+            fields=lambda prof: (prof['full_name'], prof['departamentos']),
+            show=self.load_professors,
+            scope=lambda: (self.get_current_department_filter(), self.db_manager.connections.change_token()),
+            on_error=lambda e: messagebox.showerror("Error", f"Error al cargar profesores: {str(e)}")
+        )
+        
         # Load data
         self.load_departments()
-        self.load_professors()
+        self.search_controller.search_now()
     
     def load_departments(self):
         """Load departments for filtering"""
@@ -4669,34 +4624,28 @@ class ProfessorMateriasDialog:
         except Exception as e:
             print(f"Error loading departments: {e}")
     
-    def load_professors(self, filter_text=""):
-        """Load professors into paginated table with department filtering"""
+    def get_department_professors(self, dept_filter):
+        """Professors of a department, from the cached directory"""
+        all_professors = self.db_manager.professor_directory.get_professors()
+        
+        # Apply department filter
+        if dept_filter != "Todos los departamentos":
+            filtered_professors = []
+            for prof in all_professors:
+                # Check if the professor belongs to the selected department
+                prof_departments = prof['departamentos'].split(', ')
+                if dept_filter in prof_departments:
+                    filtered_professors.append(prof)
+            all_professors = filtered_professors
+        return all_professors
+    
+    def load_professors(self, all_professors):
+        """Load the matching professors (see search_controller) into the paginated table"""
         self.professors_data = []
+        self.selected_professor = None
+        self.query_btn.config(state="disabled")
         
         try:
-            all_professors = self.db_manager.get_all_profesores_with_materia_stats()
-            
-            # Apply department filter
-            dept_filter = self.get_current_department_filter()
-            if dept_filter != "Todos los departamentos":
-                filtered_professors = []
-                for prof in all_professors:
-                    # Check if the professor belongs to the selected department
-                    prof_departments = prof['departamentos'].split(', ')
-                    if dept_filter in prof_departments:
-                        filtered_professors.append(prof)
-                all_professors = filtered_professors
-            
-            # Apply search filter if provided
-            if filter_text:
-                filter_text = filter_text.lower()
-                filtered_professors = []
-                for prof in all_professors:
-                    if (filter_text in prof['full_name'].lower() or 
-                        filter_text in prof['departamentos'].lower()):
-                        filtered_professors.append(prof)
-                all_professors = filtered_professors
-            
             # Prepare data for paginated table
             table_data = []
             for prof in all_professors:
@@ -4720,9 +4669,7 @@ class ProfessorMateriasDialog:
     
     def on_department_filter_change(self, event=None):
         """Handle department filter change"""
-        self.load_professors(self.search_var.get())
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        self.search_controller.search_now()
     
     def clear_department_filter(self):
         """Clear department filter"""
@@ -4747,24 +4694,16 @@ class ProfessorMateriasDialog:
     
     def search_professors(self):
         """Search professors based on input"""
-        search_text = self.search_var.get().strip()
-        self.load_professors(search_text)
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        self.search_controller.search_now()
     
     def clear_search(self):
         """Clear search field and reload all professors"""
         self.search_var.set("")
-        self.load_professors()
-        self.query_btn.config(state="disabled")
-        self.selected_professor = None
+        self.search_controller.search_now()
     
     def on_search_change(self, event=None):
         """Handle search text change with delay"""
-        if hasattr(self, 'search_timer'):
-            self.dialog.after_cancel(self.search_timer)
-        
-        self.search_timer = self.dialog.after(300, self.search_professors)
+        self.search_controller.schedule()
     
     def query_materias(self):
         """Query and display professor materias"""
@@ -5074,7 +5013,9 @@ class DedicationDataLinkingDialog:
             "• profesor: Nombre completo del profesor\n"
             "• dedicacion: Porcentaje de dedicación (0-200%)\n"
             "• periodo: Período académico\n\n"
-            "Ejemplo: 39342,DURAN AMOROCHO XAVIER HERNANDO,45,202510"
+            "Ejemplo: 39342,DURAN AMOROCHO XAVIER HERNANDO,45,202510\n\n"
+            "También puede seleccionar directamente la exportación de cartelera con\n"
+            "columnas PROFESOR_FRANJA (no es necesario el programa auxiliar de dedicación)."
         )
         
         ttk.Label(instructions_frame, text=instructions_text, 
@@ -5106,7 +5047,9 @@ class DedicationDataLinkingDialog:
         file_path = filedialog.askopenfilename(
             title="Seleccionar archivo de dedicaciones",
             filetypes=[
+                ("CSV / Excel files", "*.csv *.xlsx"),
                 ("CSV files", "*.csv"),
+                ("Excel files", "*.xlsx"),
                 ("All files", "*.*")
             ],
             initialdir=os.path.expanduser("~")
@@ -5148,6 +5091,8 @@ class DedicationDataLinkingDialog:
                 info = validation_result['file_info']
                 self.validation_text.insert(tk.END, f"Información del archivo:\n")
                 self.validation_text.insert(tk.END, f"• Total de filas: {info['total_rows']}\n")
+                if 'engineering_rows' in info:
+                    self.validation_text.insert(tk.END, f"• Filas de Ingeniería: {info['engineering_rows']}\n")
                 self.validation_text.insert(tk.END, f"• Columnas: {', '.join(info['columns'])}\n")
                 self.validation_text.insert(tk.END, f"• Tamaño: {info['file_size_mb']} MB\n\n")
             
@@ -5203,24 +5148,33 @@ class DedicationDataLinkingDialog:
             progress = ProgressDialog(self.parent, "Procesando dedicaciones", 
                                      "Analizando archivo y buscando coincidencias...")
             
-            # Process file
-            self.processing_result = self.dedication_processor.process_dedication_csv(self.file_path)
-            progress.close()
-            
-            if not self.processing_result['success']:
-                error_msg = "Errores durante el procesamiento:\n" + "\n".join(self.processing_result['errors'])
-                messagebox.showerror("Error de Procesamiento", error_msg)
-                return
-            
-            # Move to step 2
-            self.current_step = 1
-            self.show_step_2()
+            # Process file in the background
+            file_path = self.file_path
+            get_task_runner(self.dialog).run(
+                lambda task: self.dedication_processor.process_dedication_csv(
+                    file_path, progress_callback=task.progress
+                ),
+                on_done=self.show_processing_result,
+                on_error=lambda e: messagebox.showerror("Error", f"Error al procesar archivo: {str(e)}"),
+                progress_dialog=progress,
+                owner=self.dialog
+            )
             
         except Exception as e:
-            if 'progress' in locals():
-                progress.close()
             messagebox.showerror("Error", f"Error al procesar archivo: {str(e)}")
     
+    def show_processing_result(self, result):
+        """Move to step 2 once process_file has matched the file"""
+        self.processing_result = result
+        if not self.processing_result['success']:
+            error_msg = "Errores durante el procesamiento:\n" + "\n".join(self.processing_result['errors'])
+            messagebox.showerror("Error de Procesamiento", error_msg)
+            return
+        
+        # Move to step 2
+        self.current_step = 1
+        self.show_step_2()
+    
     def show_step_2(self):
         """Step 2: Review matches and approve/reject"""
         # Clear content frame
@@ -5549,17 +5503,24 @@ class DedicationDataLinkingDialog:
         if not self.approved_matches:
             return
         
+        # Disable apply button
+        self.apply_changes_btn.config(state="disabled")
+        
+        # Show progress
+        self.results_text.insert(tk.END, "Aplicando actualizaciones de dedicación...\n\n")
+        
+        # Apply changes using the processor in the background
+        approved_matches = self.approved_matches
+        get_task_runner(self.dialog).run(
+            lambda task: self.dedication_processor.apply_dedication_matches(approved_matches),
+            on_done=self.show_apply_results,
+            on_error=self.show_apply_error,
+            owner=self.dialog
+        )
+    
+    def show_apply_results(self, results):
+        """Display the outcome of apply_changes"""
         try:
-            # Disable apply button
-            self.apply_changes_btn.config(state="disabled")
-            
-            # Show progress
-            self.results_text.insert(tk.END, "Aplicando actualizaciones de dedicación...\n\n")
-            self.results_text.update()
-            
-            # Apply changes using the processor
-            results = self.dedication_processor.apply_dedication_matches(self.approved_matches)
-            
             # Display results
             if results['updated'] > 0:
                 self.results_text.insert(tk.END, f"✅ ACTUALIZACIÓN EXITOSA\n\n")
@@ -5600,11 +5561,16 @@ class DedicationDataLinkingDialog:
             self.results_text.insert(tk.END, f"Proceso completado.\n")
             
         except Exception as e:
-            self.results_text.insert(tk.END, f"❌ ERROR: {str(e)}\n")
-            messagebox.showerror("Error", f"Error al aplicar cambios: {str(e)}")
+            self.show_apply_error(e)
         finally:
             self.apply_changes_btn.config(state="normal")
     
+    def show_apply_error(self, e):
+        """Report an error raised while applying or displaying the changes"""
+        self.results_text.insert(tk.END, f"❌ ERROR: {str(e)}\n")
+        messagebox.showerror("Error", f"Error al aplicar cambios: {str(e)}")
+        self.apply_changes_btn.config(state="normal")
+    
     def setup_step_3_navigation(self):
         """Setup navigation for step 3"""
         for widget in self.btn_frame.winfo_children():
@@ -5856,4 +5822,167 @@ class DedicationViewerDialog:
     
     def close_dialog(self):
         """Close the dialog"""
-        self.dialog.destroy()
\ No newline at end of file
+        self.dialog.destroy()
+
+
+class NameReviewDialog:
+    """Batch review of three-part professor names split by default during imports"""
+    
+    CHOICE_LABELS = {1: 'Nombres compuestos', 2: 'Apellidos compuestos'}
+    
+    def __init__(self, parent, db_manager: DatabaseManager, callback: Callable = None):
+        self.parent = parent
+        self.db_manager = db_manager
+        self.callback = callback
+        self.choices = {}
+        
+        # Create dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Revisión de Nombres Ambiguos")
+        self.dialog.geometry("1000x650")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        
+        self.theme_colors = get_theme_colors()
+        self.style = setup_ttk_styles(self.dialog)
+        
+        self.setup_ui()
+        apply_dark_mode_to_dialog(self.dialog, self.theme_colors)
+        self.load_reviews()
+    
+    def setup_ui(self):
+        """Setup the main UI"""
+        main_frame = ttk.Frame(self.dialog, padding="20")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        # Title
+        title_frame = ttk.Frame(main_frame)
+        title_frame.pack(fill=tk.X, pady=(0, 10))
+        
+        ttk.Label(title_frame, text="Revisión de Nombres Ambiguos",
+                 font=("Arial", 16, "bold")).pack(side=tk.LEFT)
+        
+        ttk.Button(title_frame, text="✕ Cerrar", command=self.close_dialog,
+                  style="Red.TButton").pack(side=tk.RIGHT)
+        
+        ttk.Label(
+            main_frame,
+            text=("Estos nombres de tres partes se dividieron con la opción por defecto "
+                  "(un nombre y dos apellidos) durante la importación.\n"
+                  "Seleccione filas y elija la división correcta (doble clic alterna la opción). "
+                  "Al aplicar, los profesores se actualizan en bloque."),
+            wraplength=900, justify=tk.LEFT
+        ).pack(fill=tk.X, pady=(0, 10))
+        
+        # Pending names table
+        table_frame = ttk.Frame(main_frame)
+        table_frame.pack(fill=tk.BOTH, expand=True)
+        
+        columns = ('Nombre', 'Nombres', 'Apellidos', 'Opción')
+        self.tree = ttk.Treeview(table_frame, columns=columns, show='headings',
+                                 height=20, selectmode='extended')
+        
+        self.tree.heading('Nombre', text='Nombre Completo')
+        self.tree.heading('Nombres', text='Nombres')
+        self.tree.heading('Apellidos', text='Apellidos')
+        self.tree.heading('Opción', text='División')
+        
+        self.tree.column('Nombre', width=300)
+        self.tree.column('Nombres', width=200)
+        self.tree.column('Apellidos', width=200)
+        self.tree.column('Opción', width=160)
+        
+        scrollbar = ttk.Scrollbar(table_frame, orient=tk.VERTICAL, command=self.tree.yview)
+        self.tree.configure(yscrollcommand=scrollbar.set)
+        
+        self.tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        configure_treeview_dark_mode(self.tree, self.theme_colors)
+        
+        self.tree.bind('<Double-1>', self.toggle_choice)
+        
+        # Actions
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(fill=tk.X, pady=(10, 0))
+        
+        ttk.Button(button_frame, text="Nombres compuestos (2 + 1)",
+                  command=lambda: self.set_selected_choice(1),
+                  style="Blue.TButton").pack(side=tk.LEFT, padx=(0, 10))
+        ttk.Button(button_frame, text="Apellidos compuestos (1 + 2)",
+                  command=lambda: self.set_selected_choice(2),
+                  style="Teal.TButton").pack(side=tk.LEFT, padx=(0, 10))
+        
+        ttk.Button(button_frame, text="✓ Aplicar Revisión", command=self.apply_reviews,
+                  style="Green.TButton").pack(side=tk.RIGHT)
+        
+        self.summary_var = tk.StringVar()
+        ttk.Label(main_frame, textvariable=self.summary_var).pack(fill=tk.X, pady=(10, 0))
+    
+    def load_reviews(self):
+        """Load pending names into the table"""
+        self.tree.delete(*self.tree.get_children())
+        self.choices = {}
+        
+        for review in self.db_manager.get_pending_name_reviews():
+            self.choices[review['full_name']] = review['applied_choice']
+            self.tree.insert('', tk.END, iid=review['full_name'],
+                             values=self.row_values(review['full_name']))
+        
+        self.update_summary()
+    
+    def row_values(self, full_name: str) -> tuple:
+        """Table values of a name with its current choice"""
+        choice = self.choices[full_name]
+        nombres, apellidos = split_three_part_name(full_name.split(), choice)
+        return (full_name, nombres, apellidos, self.CHOICE_LABELS[choice])
+    
+    def set_selected_choice(self, choice: int):
+        """Set the split of every selected name"""
+        for full_name in self.tree.selection():
+            self.choices[full_name] = choice
+            self.tree.item(full_name, values=self.row_values(full_name))
+        self.update_summary()
+    
+    def toggle_choice(self, event=None):
+        """Switch the split of the double-clicked name"""
+        full_name = self.tree.identify_row(event.y) if event else self.tree.focus()
+        if full_name:
+            self.choices[full_name] = 1 if self.choices[full_name] == 2 else 2
+            self.tree.item(full_name, values=self.row_values(full_name))
+            self.update_summary()
+    
+    def update_summary(self):
+        """Show how many names are pending and how many change split"""
+        compuestos = sum(1 for choice in self.choices.values() if choice == 1)
+        self.summary_var.set(
+            f"Nombres pendientes: {len(self.choices)}  •  "
+            f"Con nombres compuestos: {compuestos}"
+        )
+    
+    def apply_reviews(self):
+        """Apply every choice in one transaction and mark the names reviewed"""
+        if not self.choices:
+            messagebox.showinfo("Sin pendientes", "No hay nombres pendientes de revisión.", parent=self.dialog)
+            return
+        
+        if not messagebox.askyesno(
+            "Confirmar revisión",
+            f"¿Aplicar la división elegida a {len(self.choices)} nombres?\n\n"
+            "Los profesores con una división distinta se actualizarán.",
+            parent=self.dialog
+        ):
+            return
+        
+        if self.db_manager.apply_name_reviews(self.choices):
+            messagebox.showinfo("Revisión aplicada",
+                                f"Se revisaron {len(self.choices)} nombres.", parent=self.dialog)
+            if self.callback:
+                self.callback()
+            self.load_reviews()
+        else:
+            messagebox.showerror("Error", "No se pudo aplicar la revisión. No se realizaron cambios.",
+                                 parent=self.dialog)
+    
+    def close_dialog(self):
+        """Close the dialog"""
+        self.dialog.destroy()
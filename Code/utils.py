@@ -1,10 +1,12 @@
 import re
 import json
+import zipfile
 import pandas as pd
 from datetime import datetime, time
 from typing import Any, List, Dict, Optional, Union, Tuple
 import tkinter as tk
 from tkinter import messagebox
+from spreadsheet_reader import is_spreadsheet
 
 class ValidationError(Exception):
     """Custom exception for validation errors"""
@@ -694,15 +696,17 @@ class FileHelpers:
     @staticmethod
     def validate_csv_file(file_path: str) -> bool:
         """
-        Check if file is a valid CSV
+        Check if file is a valid CSV (or an XLSX workbook)
         
         Args:
             file_path: Path to file
             
         Returns:
-            bool: True if valid CSV file
+            bool: True if valid CSV or XLSX file
         """
         try:
+            if is_spreadsheet(file_path):
+                return zipfile.is_zipfile(file_path)
             df = pd.read_csv(file_path, nrows=1)
             return True
         except Exception: